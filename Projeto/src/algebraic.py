@@ -0,0 +1,215 @@
+from parser import Node
+from astutils import make_int, make_bool, is_int, is_bool, is_pure, same_expr, COMPARISON_OPS
+
+# Comparação equivalente à negação de cada operador relacional
+INVERTED_COMPARISON = {
+    '=': '<>', '<>': '=',
+    '<': '>=', '>=': '<',
+    '>': '<=', '<=': '>',
+}
+
+
+class AlgebraicSimplifier:
+    """
+    Simplificação algébrica e redução de força sobre expressões.
+    Cada regra da tabela recebe um nó (BinaryOp/UnaryOp) cujos filhos já foram
+    simplificados e devolve o nó reescrito, ou None se não se aplicar.
+    Regras que descartam um operando só disparam se este não tiver chamadas,
+    para não perder efeitos colaterais.
+    """
+    def __init__(self):
+        self.fired = {} # Nome da regra -> número de vezes que foi aplicada
+
+        # Tabela de regras: (nome, operador, função de reescrita)
+        self.rules = [
+            ('c + x -> x + c',           '+',   self._constant_to_right),
+            ('c * x -> x * c',           '*',   self._constant_to_right),
+            ('x + 0 -> x',               '+',   self._add_zero),
+            ('x - 0 -> x',               '-',   self._sub_zero),
+            ('x - x -> 0',               '-',   self._sub_self),
+            ('x + (-y) -> x - y',        '+',   self._add_negated),
+            ('x - (-y) -> x + y',        '-',   self._sub_negated),
+            ('(x + c1) + c2 -> x + c',   '+',   self._reassociate_additive),
+            ('(x + c1) - c2 -> x + c',   '-',   self._reassociate_additive),
+            ('x * 1 -> x',               '*',   self._mul_one),
+            ('x * 0 -> 0',               '*',   self._mul_zero),
+            ('(x * c1) * c2 -> x * c',   '*',   self._reassociate_mul),
+            ('x * 2 -> x + x',           '*',   self._mul_two),
+            ('x div 1 -> x',             'DIV', self._div_one),
+            ('x mod 1 -> 0',             'MOD', self._mod_one),
+            ('x and true -> x',          'AND', self._and_true),
+            ('x and false -> false',     'AND', self._and_false),
+            ('x or false -> x',          'OR',  self._or_false),
+            ('x or true -> true',        'OR',  self._or_true),
+            ('x and x -> x',             'AND', self._idempotent),
+            ('x or x -> x',              'OR',  self._idempotent),
+            ('-(-x) -> x',               'MINUS', self._double_minus),
+            ('not not b -> b',           'NOT', self._double_not),
+            ('not (a < b) -> a >= b',    'NOT', self._not_comparison),
+        ]
+
+    @property
+    def count(self):
+        return sum(self.fired.values())
+
+    def simplify(self, node):
+        """Aplica a primeira regra que disparar. Devolve o próprio nó se nenhuma se aplicar."""
+        if node.type not in ('BinaryOp', 'UnaryOp'):
+            return node
+        for name, op, rule in self.rules:
+            if op != node.leaf:
+                continue
+            result = rule(node)
+            if result is not None:
+                self.fired[name] = self.fired.get(name, 0) + 1
+                return result
+        return node
+
+    # Auxiliares
+    def _operands(self, node):
+        return node.children[0], node.children[1]
+
+    def _binary(self, op, left, right, lineno):
+        return Node('BinaryOp', [left, right], op, lineno=lineno)
+
+    # Regras Aditivas
+    def _constant_to_right(self, node):
+        # Canónico: constante à direita (permite a reassociação seguinte)
+        left, right = self._operands(node)
+        if is_int(left) and not is_int(right):
+            return self._binary(node.leaf, right, left, node.lineno)
+        return None
+
+    def _add_zero(self, node):
+        left, right = self._operands(node)
+        if is_int(right, 0): return left
+        if is_int(left, 0): return right
+        return None
+
+    def _sub_zero(self, node):
+        left, right = self._operands(node)
+        if is_int(right, 0): return left
+        return None
+
+    def _sub_self(self, node):
+        left, right = self._operands(node)
+        if is_pure(left) and same_expr(left, right):
+            return make_int(0, node.lineno)
+        return None
+
+    def _add_negated(self, node):
+        left, right = self._operands(node)
+        if right.type == 'UnaryOp' and right.leaf == 'MINUS':
+            return self._binary('-', left, right.children[0], node.lineno)
+        return None
+
+    def _sub_negated(self, node):
+        left, right = self._operands(node)
+        if right.type == 'UnaryOp' and right.leaf == 'MINUS':
+            return self._binary('+', left, right.children[0], node.lineno)
+        return None
+
+    def _reassociate_additive(self, node):
+        # (x ± c1) ± c2  ->  x + (±c1 ± c2)
+        left, right = self._operands(node)
+        if not is_int(right): return None
+        if left.type != 'BinaryOp' or left.leaf not in ('+', '-'): return None
+        inner_x, inner_c = left.children
+        if not is_int(inner_c): return None
+
+        c1 = inner_c.leaf if left.leaf == '+' else -inner_c.leaf
+        c2 = right.leaf if node.leaf == '+' else -right.leaf
+        total = c1 + c2
+        if total == 0:
+            return inner_x
+        if total < 0:
+            return self._binary('-', inner_x, make_int(-total, node.lineno), node.lineno)
+        return self._binary('+', inner_x, make_int(total, node.lineno), node.lineno)
+
+    # Regras Multiplicativas
+    def _mul_one(self, node):
+        left, right = self._operands(node)
+        if is_int(right, 1): return left
+        if is_int(left, 1): return right
+        return None
+
+    def _mul_zero(self, node):
+        left, right = self._operands(node)
+        if is_int(right, 0) and is_pure(left): return make_int(0, node.lineno)
+        if is_int(left, 0) and is_pure(right): return make_int(0, node.lineno)
+        return None
+
+    def _reassociate_mul(self, node):
+        left, right = self._operands(node)
+        if not is_int(right): return None
+        if left.type != 'BinaryOp' or left.leaf != '*' or not is_int(left.children[1]):
+            return None
+        total = left.children[1].leaf * right.leaf
+        return self._binary('*', left.children[0], make_int(total, node.lineno), node.lineno)
+
+    def _mul_two(self, node):
+        # Redução de força: só para variáveis simples (duplicar é gratuito)
+        left, right = self._operands(node)
+        if is_int(right, 2) and left.type == 'VariableAccess':
+            return self._binary('+', left, Node('VariableAccess', [], left.leaf, lineno=left.lineno), node.lineno)
+        return None
+
+    def _div_one(self, node):
+        left, right = self._operands(node)
+        if is_int(right, 1): return left
+        return None
+
+    def _mod_one(self, node):
+        left, right = self._operands(node)
+        if is_int(right, 1) and is_pure(left): return make_int(0, node.lineno)
+        return None
+
+    # Regras Lógicas
+    def _and_true(self, node):
+        left, right = self._operands(node)
+        if is_bool(right, True): return left
+        if is_bool(left, True): return right
+        return None
+
+    def _and_false(self, node):
+        left, right = self._operands(node)
+        if is_bool(right, False) and is_pure(left): return make_bool(False, node.lineno)
+        if is_bool(left, False) and is_pure(right): return make_bool(False, node.lineno)
+        return None
+
+    def _or_false(self, node):
+        left, right = self._operands(node)
+        if is_bool(right, False): return left
+        if is_bool(left, False): return right
+        return None
+
+    def _or_true(self, node):
+        left, right = self._operands(node)
+        if is_bool(right, True) and is_pure(left): return make_bool(True, node.lineno)
+        if is_bool(left, True) and is_pure(right): return make_bool(True, node.lineno)
+        return None
+
+    def _idempotent(self, node):
+        left, right = self._operands(node)
+        if is_pure(left) and same_expr(left, right): return left
+        return None
+
+    # Regras Unárias
+    def _double_minus(self, node):
+        child = node.children[0]
+        if child.type == 'UnaryOp' and child.leaf == 'MINUS':
+            return child.children[0]
+        return None
+
+    def _double_not(self, node):
+        child = node.children[0]
+        if child.type == 'UnaryOp' and child.leaf == 'NOT':
+            return child.children[0]
+        return None
+
+    def _not_comparison(self, node):
+        # NOT(a < b) custa uma instrução a mais do que a >= b
+        child = node.children[0]
+        if child.type == 'BinaryOp' and child.leaf in COMPARISON_OPS:
+            return Node('BinaryOp', child.children, INVERTED_COMPARISON[child.leaf], lineno=child.lineno)
+        return None
@@ -0,0 +1,289 @@
+"""
+Funções auxiliares partilhadas pelas passagens de otimização sobre a AST.
+"""
+from parser import Node
+
+# Operadores cujo resultado é booleano / inteiro
+COMPARISON_OPS = ('=', '<>', '<', '>', '<=', '>=')
+ARITHMETIC_OPS = ('+', '-', '*', 'DIV', 'MOD')
+LOGICAL_OPS = ('AND', 'OR')
+
+# Funções pré-definidas que não têm efeitos colaterais
+BUILTIN_FUNCTIONS = ('length',)
+
+
+# Construção de Nós
+def make_int(value, lineno=None):
+    return Node('IntegerConstant', [], value, lineno=lineno)
+
+def make_bool(value, lineno=None):
+    return Node('BooleanConstant', [], 'true' if value else 'false', lineno=lineno)
+
+def is_int(node, value=None):
+    """Verifica se o nó é uma constante inteira (opcionalmente com um valor específico)."""
+    if node is None or node.type != 'IntegerConstant':
+        return False
+    return value is None or node.leaf == value
+
+def is_bool(node, value=None):
+    """Verifica se o nó é uma constante booleana (opcionalmente com um valor específico)."""
+    if node is None or node.type != 'BooleanConstant':
+        return False
+    return value is None or bool_value(node) == value
+
+def bool_value(node):
+    return str(node.leaf).lower() == 'true'
+
+
+# Avaliação de Operadores (partilhada pela dobragem de constantes)
+def eval_binary(op, v1, v2):
+    """
+    Calcula o resultado de uma operação binária entre valores Python.
+    Devolve None se a operação não puder ser resolvida estaticamente.
+    """
+    try:
+        if op == '+': return v1 + v2
+        if op == '-': return v1 - v2
+        if op == '*': return v1 * v2
+        if op == 'DIV': return v1 // v2 # Divisão inteira
+        if op == 'MOD': return v1 % v2
+        if op == '=': return v1 == v2
+        if op == '<>': return v1 != v2
+        if op == '<': return v1 < v2
+        if op == '>': return v1 > v2
+        if op == '<=': return v1 <= v2
+        if op == '>=': return v1 >= v2
+        if op == 'AND': return v1 and v2
+        if op == 'OR': return v1 or v2
+    except ZeroDivisionError:
+        return None
+    return None
+
+def constant_value(node):
+    """Valor Python de uma constante inteira/booleana (None se não for constante)."""
+    if is_int(node): return node.leaf
+    if is_bool(node): return bool_value(node)
+    return None
+
+def make_constant(value, lineno=None):
+    """Cria o nó literal adequado ao tipo do valor Python."""
+    if isinstance(value, bool): return make_bool(value, lineno)
+    return make_int(value, lineno)
+
+
+# Inspeção da AST
+def walk(node):
+    """Percorre a sub-árvore em pré-ordem."""
+    if not isinstance(node, Node):
+        return
+    yield node
+    for child in node.children:
+        yield from walk(child)
+
+def has_calls(node):
+    """Verifica se a sub-árvore contém chamadas (possíveis efeitos colaterais)."""
+    for n in walk(node):
+        if n.type == 'ProcedureCall':
+            return True
+        if n.type == 'FunctionCall' and n.leaf not in BUILTIN_FUNCTIONS:
+            return True
+    return False
+
+def is_pure(node):
+    """Expressão sem chamadas: pode ser duplicada, removida ou reordenada."""
+    return not has_calls(node)
+
+def same_expr(a, b):
+    """Igualdade estrutural entre duas expressões."""
+    if not isinstance(a, Node) or not isinstance(b, Node):
+        return a == b
+    if a.type != b.type or a.leaf != b.leaf or len(a.children) != len(b.children):
+        return False
+    return all(same_expr(x, y) for x, y in zip(a.children, b.children))
+
+def reference_args(node):
+    """Variáveis (ou arrays) passadas a parâmetros 'var' nas chamadas da sub-árvore."""
+    return {n.leaf for n in walk(node) if n.type == 'VarArgument'}
+
+def assigned_vars(node):
+    """Nomes de todas as variáveis (ou arrays) escritas dentro da sub-árvore."""
+    names = reference_args(node) # A chamada pode escrever através do endereço
+    for n in walk(node):
+        if n.type == 'AssignmentStatement':
+            names.add(n.children[0].leaf)
+        elif n.type == 'ForStatement':
+            names.add(n.children[0].leaf)
+        elif n.type == 'ReadStatement':
+            for var in n.children:
+                names.add(var.leaf)
+    return names
+
+def used_vars(node):
+    """Nomes de todas as variáveis (ou arrays) referenciadas dentro da sub-árvore."""
+    return {n.leaf for n in walk(node) if n.type in ('VariableAccess', 'ArrayAccess', 'VarArgument')}
+
+
+# Instrução CASE ([Seletor, CaseBranch..., CaseElse opcional])
+def case_bodies(node):
+    """Instruções alternativas de um CaseStatement (a de cada ramo e a do ELSE, se existir)."""
+    return [branch.children[-1] for branch in node.children[1:]]
+
+def case_has_else(node):
+    return node.children[-1].type == 'CaseElse'
+
+def case_label_value(node):
+    """Valor ordinal de uma constante de CASE (um carácter vale o seu código), ou None."""
+    if node.type == 'StringConstant':
+        return ord(node.leaf) if len(node.leaf) == 1 else None
+    value = constant_value(node)
+    return None if value is None else int(value)
+
+def case_intervals(branch):
+    """Intervalos (lo, hi) cobertos pelos rótulos de um CaseBranch."""
+    intervals = []
+    for label in branch.children[0].children:
+        lo, hi = label.children if label.type == 'CaseRange' else (label, label)
+        intervals.append((case_label_value(lo), case_label_value(hi)))
+    return intervals
+
+def case_select(node, value):
+    """Instrução que o CASE executa quando o seletor vale 'value' (None se nenhuma)."""
+    for branch in node.children[1:]:
+        if branch.type == 'CaseElse':
+            return branch.children[0]
+        if any(lo <= value <= hi for lo, hi in case_intervals(branch)):
+            return branch.children[1]
+    return None
+
+
+# Escopos
+def type_info(type_node):
+    """Representação interna de um tipo (a mesma usada pelo analisador semântico)."""
+    if type_node.type == 'BasicType': return type_node.leaf
+    if type_node.type == 'ArrayType':
+        return {'kind': 'array', 'range': type_node.leaf, 'elem_type': type_info(type_node.children[0])}
+    if type_node.type == 'PointerType':
+        # Só criado pelo otimizador: endereço de um elemento de array
+        return {'kind': 'pointer', 'elem_type': type_info(type_node.children[0])}
+    return 'unknown'
+
+def is_scalar(var_type):
+    return var_type in ('integer', 'boolean')
+
+def declared_ids(decls_node):
+    """Gera pares (nó ID, nó de tipo) para cada variável de um nó Declarations."""
+    for decl in decls_node.children:
+        if decl.type != 'Declaration':
+            continue
+        id_list, type_node = decl.children
+        ids = id_list.children if id_list.type == 'IDList' else [id_list]
+        for id_node in ids:
+            yield id_node, type_node
+
+
+class Scope:
+    """
+    Um escopo do programa: o corpo principal (variáveis globais) ou um subprograma
+    (parâmetros, variáveis locais e variável de retorno).
+    """
+    def __init__(self, name, node, block, parent=None):
+        self.name = name
+        self.node = node # Program, FunctionDeclaration ou ProcedureDeclaration
+        self.block = block
+        self.parent = parent
+        self.variables = {} # Nome -> tipo (apenas deste escopo)
+        self.type_nodes = {} # Nome -> nó de tipo da AST (para declarar cópias)
+        self.params = []
+        self.references = set() # Parâmetros 'var' (a memória é de quem chama)
+
+        if node.type in ('FunctionDeclaration', 'ProcedureDeclaration'):
+            for param in node.children[0].children:
+                id_list = param.children[0]
+                ids = id_list.children if id_list.type == 'IDList' else [id_list]
+                for id_node in ids:
+                    self.params.append(id_node.leaf)
+                    if param.leaf == 'var':
+                        self.references.add(id_node.leaf)
+                    self.variables[id_node.leaf] = type_info(param.children[1])
+                    self.type_nodes[id_node.leaf] = param.children[1]
+            if node.type == 'FunctionDeclaration':
+                # O nome da função funciona como variável de retorno
+                self.variables[name] = type_info(node.children[1])
+                self.type_nodes[name] = node.children[1]
+
+        for id_node, type_node in declared_ids(self.declarations):
+            self.variables[id_node.leaf] = type_info(type_node)
+            self.type_nodes[id_node.leaf] = type_node
+
+    @property
+    def declarations(self):
+        return self.block.children[1]
+
+    @property
+    def body(self):
+        return self.block.children[2]
+
+    @property
+    def is_global(self):
+        return self.parent is None
+
+    def declare(self, name, type_node):
+        """Acrescenta uma variável (temporária do compilador) às declarações do escopo."""
+        id_list = Node('IDList', [Node('ID', [], name)])
+        self.declarations.children.append(Node('Declaration', [id_list, type_node]))
+        self.variables[name] = type_info(type_node)
+        self.type_nodes[name] = type_node
+
+    def is_local(self, name):
+        """
+        Verdadeiro se o nome pertence a este escopo: não é uma global vista de
+        fora nem um parâmetro 'var' (cuja memória pode ser de uma global).
+        """
+        return not self.is_global and name in self.variables and name not in self.references
+
+    def aliases(self, names):
+        """
+        Os nomes dados e os que podem partilhar a mesma memória. Um parâmetro
+        'var' pode apontar para uma global ou para o mesmo que outro parâmetro
+        'var', por isso escrever num deles (ou numa global) pode mudar todos.
+        """
+        names = set(names)
+        if self.references and any(not self.is_local(name) for name in names):
+            names |= self.references
+            names |= {name for name in self.parent.variables if name not in self.variables}
+        return names
+
+    def call_clobbered(self, globals_written):
+        """Variáveis visíveis no escopo que uma chamada pode alterar (ver ProgramInfo.globals_written)."""
+        return self.aliases(name for name in globals_written if not self.is_local(name))
+
+    def lookup(self, name):
+        if name in self.variables:
+            return self.variables[name]
+        if self.parent:
+            return self.parent.lookup(name)
+        return None
+
+
+class ProgramInfo:
+    """Escopos do programa extraídos diretamente da AST (globais e subprogramas)."""
+    def __init__(self, ast):
+        block = ast.children[0]
+        self.main = Scope('$main', ast, block)
+        self.subprograms = {}
+        for sub in block.children[0].children:
+            self.subprograms[sub.leaf] = Scope(sub.leaf, sub, sub.children[2], parent=self.main)
+
+    def scopes(self):
+        """Todos os escopos com corpo executável (principal primeiro)."""
+        return [self.main] + list(self.subprograms.values())
+
+    def globals_written(self):
+        """
+        Globais que alguma chamada pode alterar (escritas dentro dos subprogramas).
+        As escritas através de parâmetros 'var' contam em quem chama, no argumento.
+        """
+        names = set()
+        for sub in self.subprograms.values():
+            names |= {name for name in assigned_vars(sub.body) if name not in sub.variables}
+        return names
@@ -0,0 +1,114 @@
+import json
+from astutils import ProgramInfo, walk, BUILTIN_FUNCTIONS
+
+
+class CallGraph:
+    """
+    Grafo de chamadas do programa inteiro, com raiz no corpo principal ('$main').
+    Os nós são os subprogramas declarados; as arestas ligam cada corpo aos
+    subprogramas que chama (FunctionCall/ProcedureCall), pela ordem em que
+    aparecem. Funções predefinidas (length) não entram no grafo.
+    """
+    ROOT = '$main'
+
+    def __init__(self, ast):
+        self.info = ProgramInfo(ast)
+        # Pascal não distingue maiúsculas: o nome em minúsculas leva ao nome declarado
+        self._names = {name.lower(): name for name in self.info.subprograms}
+        self.edges = {}
+        for scope in self.info.scopes():
+            self.edges[scope.name] = self._calls_in(scope.body)
+
+    def _calls_in(self, body):
+        callees = []
+        for n in walk(body):
+            if n.type in ('FunctionCall', 'ProcedureCall'):
+                name = self.resolve(n.leaf)
+                if name and name not in callees:
+                    callees.append(name)
+        return callees
+
+    def resolve(self, name):
+        """Nome declarado do subprograma chamado (None para predefinidas/desconhecidas)."""
+        if name.lower() in BUILTIN_FUNCTIONS:
+            return None
+        return self._names.get(name.lower())
+
+    # Consultas
+    def callees(self, name):
+        return list(self.edges.get(name, []))
+
+    def callers(self, name):
+        return [caller for caller, callees in self.edges.items() if name in callees]
+
+    def reachable(self, root=ROOT):
+        """Subprogramas alcançáveis a partir de 'root' (sem incluir a própria raiz)."""
+        seen = set()
+        stack = list(self.edges.get(root, []))
+        while stack:
+            name = stack.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+            stack.extend(self.edges.get(name, []))
+        return seen
+
+    def unreachable(self):
+        """Subprogramas declarados que nunca podem ser chamados a partir do principal."""
+        live = self.reachable()
+        return [name for name in self.info.subprograms if name not in live]
+
+    def is_recursive(self, name):
+        """Verdadeiro se o subprograma se pode chamar a si próprio (direta ou indiretamente)."""
+        return name in self.reachable(name)
+
+    # Exportação
+    def to_dot(self):
+        lines = ['digraph callgraph {', '    rankdir=LR;', f'    "{self.ROOT}" [shape=box];']
+        dead = set(self.unreachable())
+        for name in self.info.subprograms:
+            style = ' [style=dashed, color=gray]' if name in dead else ''
+            lines.append(f'    "{name}"{style};')
+        for caller, callees in self.edges.items():
+            for callee in callees:
+                lines.append(f'    "{caller}" -> "{callee}";')
+        lines.append('}')
+        return '\n'.join(lines) + '\n'
+
+    def to_json(self):
+        data = {
+            'root': self.ROOT,
+            'nodes': [
+                {
+                    'name': name,
+                    'kind': 'function' if scope.node.type == 'FunctionDeclaration' else 'procedure',
+                    'recursive': self.is_recursive(name),
+                }
+                for name, scope in self.info.subprograms.items()
+            ],
+            'edges': [
+                {'from': caller, 'to': callee}
+                for caller, callees in self.edges.items() for callee in callees
+            ],
+            'unreachable': self.unreachable(),
+        }
+        return json.dumps(data, indent=2, ensure_ascii=False) + '\n'
+
+    def dump(self, path):
+        """Grava o grafo em JSON (extensão .json) ou DOT (qualquer outra)."""
+        content = self.to_json() if path.lower().endswith('.json') else self.to_dot()
+        with open(path, 'w') as f:
+            f.write(content)
+
+
+def remove_unreachable(ast):
+    """
+    Elimina da AST os subprogramas inalcançáveis a partir do programa principal.
+    Devolve a lista dos nomes removidos.
+    """
+    graph = CallGraph(ast)
+    dead = set(graph.unreachable())
+    if dead:
+        decls = ast.children[0].children[0]
+        decls.children = [sub for sub in decls.children if sub.leaf not in dead]
+    return [name for name in graph.info.subprograms if name in dead]
@@ -1,22 +1,66 @@
+from parser import Node
+from astutils import (type_info, is_int, is_bool, bool_value, is_pure, same_expr, walk,
+                      case_bodies, case_has_else, case_intervals)
+from algebraic import INVERTED_COMPARISON
+from ranges import RangeAnalysis
+from ir import ControlFlowGraph, IRError
+
+# Operadores em que a ordem dos operandos não altera o resultado
+COMMUTATIVE_OPS = ('+', '*', 'AND', 'OR')
+# Tamanho máximo (nós da AST) da condição de um WHILE para a duplicar como guarda à entrada
+MAX_GUARD_SIZE = 12
+# CASE: valores mínimos e densidade mínima (valores / amplitude) para usar uma tabela de saltos
+MIN_JUMP_TABLE = 5
+MIN_TABLE_DENSITY = 0.5
+# Amplitude máxima de uma tabela (cada entrada ocupa um slot global e é preenchida no arranque)
+MAX_JUMP_TABLE = 256
+# Na árvore de decisão de um CASE, intervalos testados um a um em vez de divididos ao meio
+MAX_LINEAR_TESTS = 3
+# Arrays com mais elementos do que isto ficam num bloco do heap (ALLOC): o slot guarda só o endereço
+DEFAULT_HEAP_THRESHOLD = 1024
+
+
 class CodeGenerator:
     """
     Módulo final do compilador: Traduz a AST para instruções da VM (EWVM).
     Responsabilidades:
     1. Gerir alocação de endereços (Globais vs Locais).
-    2. Traduzir controlo de fluxo (If/While) para Saltos e Labels.
+    2. Traduzir controlo de fluxo (If/Case/While) para Saltos e Labels.
     3. Gerar instruções de pilha (PUSH, STORE, OP).
+    4. Agrupar o resultado em blocos básicos (ControlFlowGraph), verificá-lo e emiti-lo.
     """
-    def __init__(self, symbol_table):
+    def __init__(self, symbol_table, bounds_check=False, heap_threshold=DEFAULT_HEAP_THRESHOLD):
         self.symbol_table = symbol_table
+        self.bounds_check = bounds_check # Emitir CHECK nos acessos a arrays não provados seguros
+        self.heap_threshold = heap_threshold
+        self.heap_arrays = [] # Arrays do escopo atual alocados no heap (libertados à saída do subprograma)
+        self.heap_allocated = 0
+        self.checks_emitted = 0
+        self.checks_elided = 0
         self.code = []
         self.label_counter = 0
         self.variable_offsets = {} # Mapa: Nome -> Endereço (Offset)
+        self.variable_types = {} # Mapa: Nome -> Tipo (escopo atual)
+        self.global_offsets = {} # Offsets das globais (visíveis dentro dos subprogramas)
+        self.global_types = {}
+        self.references = set() # Parâmetros 'var' do subprograma atual (o slot guarda um endereço)
+        self.in_subprogram = False
+        self.for_depth = 0 # Nível de FORs aninhados com limite guardado num slot escondido
         self.current_offset = 0 # Próximo endereço livre no escopo atual
         self.procedure_starts = {} # Mapa: Nome Função -> Label de Início (ex: "soma" -> "L5")
+        self.case_tables = {} # id(CaseStatement) -> (offset, menor valor, amplitude, etiquetas dos ramos, etiqueta por omissão)
+        self.frame_shift = 0 # Posições que o FP subiu ao entrar num ramo de CASE com tabela
+        self.ir = None # Grafo de fluxo de controlo do último programa gerado
 
     def generate(self, ast):
+        if self.bounds_check:
+            RangeAnalysis().run(ast) # Marca os acessos com índice provado dentro dos limites
         self.visit(ast)
-        return self.code
+        self.ir = ControlFlowGraph.build(self.code)
+        errors = self.ir.verify()
+        if errors:
+            raise IRError("Código gerado inválido:\n" + "\n".join(errors))
+        return self.ir.emit()
 
     def emit(self, instruction):
         self.code.append(instruction)
@@ -40,19 +84,64 @@ class CodeGenerator:
 
     # Helpers de Contexto e Memória
     def _is_local(self):
+        """Deteta se estamos a gerar código para dentro de uma função ou procedimento."""
+        return self.in_subprogram
+
+    def _resolve(self, name):
         """
-        Deteta se estamos a gerar código para dentro de uma função.
-        Lógica: Se a variável especial '$return' existe no mapa de offsets, 
-        é porque estamos no escopo de uma função.
+        Devolve (is_stack, offset) de uma variável.
+        Dentro de um subprograma procura primeiro nos locais/parâmetros (FP);
+        o que não for local é uma global (GP).
         """
-        return '$return' in self.variable_offsets
-
-    def _emit_var_addr(self, offset):
+        if self._is_local() and name in self.variable_offsets:
+            return True, self.variable_offsets[name] - self.frame_shift
+        return False, self.global_offsets.get(name, self.variable_offsets.get(name))
+
+    def _type_of(self, name):
+        """Tipo de uma variável visível no escopo atual (locais escondem globais)."""
+        if name in self.variable_types:
+            return self.variable_types[name]
+        if name in self.global_types:
+            return self.global_types[name]
+        info = self.symbol_table.lookup(name)
+        return info.get('type') if info else None
+
+    def _is_reference(self, name):
+        """Parâmetro 'var': o slot guarda o endereço da variável de quem chama."""
+        return self._is_local() and name in self.references
+
+    def _is_heap_array(self, name):
+        var_type = self._type_of(name)
+        if not isinstance(var_type, dict) or var_type.get('kind') != 'array' or self._is_reference(name):
+            return False
+        r_min, r_max = var_type['range']
+        return r_max - r_min + 1 > self.heap_threshold
+
+    def _holds_address(self, name):
+        """O slot da variável guarda o endereço dos dados (parâmetro 'var' ou array no heap)."""
+        return self._is_reference(name) or self._is_heap_array(name)
+
+    def _emit_load(self, name):
+        is_stack, offset = self._resolve(name)
+        self.emit(f"PUSHL {offset}" if is_stack else f"PUSHG {offset}")
+        if self._is_reference(name):
+            self.emit("LOAD 0")
+
+    def _emit_store(self, name):
+        is_stack, offset = self._resolve(name)
+        self.emit(f"STOREL {offset}" if is_stack else f"STOREG {offset}")
+
+    def _emit_var_addr(self, name):
         """
         Gera instruções para colocar o endereço de memória de uma variável na pilha.
         Usa FP (Frame Pointer) para locais/params e GP (Global Pointer) para globais.
+        Um parâmetro 'var' ou um array no heap já contém o endereço: basta lê-lo.
         """
-        if offset < 0 or self._is_local():
+        is_stack, offset = self._resolve(name)
+        if self._holds_address(name):
+            self.emit(f"PUSHL {offset}" if is_stack else f"PUSHG {offset}")
+            return
+        if is_stack:
             self.emit("PUSHFP") 
         else:
             self.emit("PUSHGP")
@@ -75,6 +164,9 @@ class CodeGenerator:
         # 4. Executar o corpo principal (Main).
         
         self.visit(node.children[1]) # Processa Declarações Globais (aloca espaço)
+        self._reserve_limit_slots(node.children[2])
+        if not self._is_local():
+            self._reserve_case_tables(node)
         
         lbl_main = self.create_label()
         self.emit(f"JUMP {lbl_main}")
@@ -85,7 +177,11 @@ class CodeGenerator:
         self.visit(node.children[2]) # Gera código do corpo principal
 
     def generate_Declarations(self, node):
-        """Calcula espaço total necessário para variáveis e reserva na pilha (PUSHN)."""
+        """
+        Calcula espaço total necessário para variáveis e reserva na pilha (PUSHN).
+        Os arrays grandes ocupam um só slot, que recebe o endereço de um bloco
+        do heap (ALLOC) logo a seguir.
+        """
         total_space = 0
         if node.children:
             decls = node.children if isinstance(node.children, list) else []
@@ -96,16 +192,70 @@ class CodeGenerator:
         if total_space > 0:
             self.emit(f"PUSHN {total_space}")
 
+        for name, size in self.heap_arrays:
+            self.emit(f"ALLOC {size}")
+            self._emit_store(name)
+            self.heap_allocated += 1
+
+    def _limit_slots_needed(self, node):
+        """Profundidade máxima de FORs aninhados cujo limite não é constante."""
+        inner = max((self._limit_slots_needed(child) for child in node.children if hasattr(child, 'children')),
+                    default=0)
+        if node.type == 'ForStatement' and not is_int(node.children[2]):
+            return inner + 1
+        return inner
+
+    def _reserve_limit_slots(self, body):
+        """Reserva um slot escondido por nível de aninhamento para o limite dos FOR."""
+        depth = self._limit_slots_needed(body)
+        for level in range(depth):
+            self.variable_offsets[f'$limit{level}'] = self.current_offset
+            self.current_offset += 1
+        if depth > 0:
+            self.emit(f"PUSHN {depth}")
+
+    def _reserve_case_tables(self, block):
+        """
+        Reserva nas globais a tabela de endereços de cada CASE denso do programa
+        (também os dos subprogramas) e preenche-a à entrada (PUSHA + STOREG).
+        """
+        tables = []
+        for n in walk(block):
+            if n.type == 'CaseStatement':
+                items = self._case_items(n)
+                if self._use_jump_table(items):
+                    tables.append((n, items))
+        if not tables:
+            return
+        self.emit(f"PUSHN {sum(items[-1][1] - items[0][0] + 1 for _, items in tables)}")
+        for n, items in tables:
+            low = items[0][0]
+            span = items[-1][1] - low + 1
+            labels = [self.create_label() for _ in n.children[1:]]
+            lbl_default = labels[-1] if case_has_else(n) else self.create_label()
+            entries = [lbl_default] * span
+            for lo, hi, index in items:
+                for value in range(lo, hi + 1):
+                    entries[value - low] = labels[index]
+            for k, label in enumerate(entries):
+                self.emit(f"PUSHA {label}")
+                self.emit(f"STOREG {self.current_offset + k}")
+            self.case_tables[id(n)] = (self.current_offset, low, span, labels, lbl_default)
+            self.current_offset += span
+
     def process_declaration(self, node):
         """Regista offsets das variáveis e calcula tamanho (suporta arrays)."""
         id_list = node.children[0]
         type_node = node.children[1]
         
-        # Calcula tamanho do tipo (1 para simples, N para arrays)
+        # Calcula tamanho do tipo (1 para simples, N para arrays; 1 para o endereço de um array no heap)
         size = 1 
+        heap_size = None
         if type_node.type == 'ArrayType':
              r_min, r_max = type_node.leaf
              size = (r_max - r_min) + 1
+             if size > self.heap_threshold:
+                 heap_size, size = size, 1
 
         ids = id_list.children if id_list.type == 'IDList' else [id_list]
         
@@ -113,7 +263,10 @@ class CodeGenerator:
         for id_node in ids:
             var_name = id_node.leaf
             self.variable_offsets[var_name] = self.current_offset
+            self.variable_types[var_name] = type_info(type_node)
             self.current_offset += size
+            if heap_size:
+                self.heap_arrays.append((var_name, heap_size))
             
         return size * len(ids) # Retorna espaço total usado nesta declaração
 
@@ -139,14 +292,25 @@ class CodeGenerator:
         self.emit(f"{lbl}:")
 
         # Context Switch
-        # Salva offsets do escopo anterior (global ou pai)
+        # Salva offsets do escopo anterior (global); as globais continuam visíveis
         old_offset = self.current_offset
-        old_vars = self.variable_offsets.copy()
-        self.variable_offsets = {} 
-
-        # Mapear PARÂMETROS (Offsets Negativos)
-        # Na pilha: [Arg1, Arg2, ... , FP, PC]
-        # O último argumento empilhado está logo antes do FP, ou seja, offset -1 (dependendo da VM)
+        old_vars = self.variable_offsets
+        old_types = self.variable_types
+        old_references = self.references
+        old_heap = self.heap_arrays
+        self.global_offsets = old_vars
+        self.global_types = old_types
+        self.variable_offsets = {}
+        self.variable_types = {}
+        self.references = set()
+        self.heap_arrays = []
+        self.in_subprogram = True
+
+        # Convenção de chamada:
+        #   chamador: [resultado (só funções)] Arg1 .. ArgN PUSHA CALL, depois POP N
+        #   subprograma: os locais ocupam FP+0.. e são retirados (POP) antes do RETURN
+        # Na pilha, durante a chamada: [Resultado, Arg1, ..., ArgN | locais...]
+        # Um argumento 'var' é o endereço da variável (ou do elemento) de quem chama
         flat_params = []
         if params.children:
              for param in params.children:
@@ -154,6 +318,9 @@ class CodeGenerator:
                  ids = id_list.children if id_list.type == 'IDList' else [id_list]
                  for id_node in ids:
                      flat_params.append(id_node.leaf)
+                     self.variable_types[id_node.leaf] = type_info(param.children[1])
+                     if param.leaf == 'var':
+                         self.references.add(id_node.leaf)
         
         p_offset = -1
         # Percorre reverso para mapear corretamente (ArgN em -1, ArgN-1 em -2...)
@@ -161,27 +328,33 @@ class CodeGenerator:
             self.variable_offsets[param_name] = p_offset
             p_offset -= 1
 
-        # Variáveis LOCAIS (Offsets Positivos)
-        self.current_offset = 0 
         if is_function:
-            # Variável mágica para o valor de retorno (offset 0)
-            self.variable_offsets['$return'] = self.current_offset
-            self.variable_offsets[name] = self.current_offset 
-            self.current_offset += 1
-            self.emit("PUSHI 0") # Inicializa retorno com 0
+            # O valor de retorno é escrito diretamente no slot reservado pelo chamador (antes do Arg1)
+            self.variable_offsets['$return'] = p_offset
+            self.variable_offsets[name] = p_offset
+            self.variable_types[name] = type_info(node.children[1])
 
-        self.visit(body) # Gera o código do corpo da função
+        # Variáveis LOCAIS (Offsets Positivos)
+        self.current_offset = 0
 
-        # Epílogo
-        if is_function:
-            # Coloca o valor de retorno no topo da pilha antes de sair
-            self.emit(f"PUSHL {self.variable_offsets['$return']}")
+        self.visit(body) # Gera o código do corpo da função
 
+        # Epílogo: as instruções deixam a pilha como estava, por isso só restam os locais
+        # (antes de os retirar, devolvem-se ao heap os blocos dos arrays locais)
+        for array, _ in self.heap_arrays:
+            self._emit_load(array)
+            self.emit("FREE")
+        if self.current_offset > 0:
+            self.emit(f"POP {self.current_offset}")
         self.emit("RETURN")
         
         # Restaura contexto anterior
         self.current_offset = old_offset
         self.variable_offsets = old_vars
+        self.variable_types = old_types
+        self.references = old_references
+        self.heap_arrays = old_heap
+        self.in_subprogram = False
 
     # Estruturas de Controlo
     def generate_CompoundStatement(self, node):
@@ -190,61 +363,263 @@ class CodeGenerator:
 
     def generate_IfStatement(self, node):
         lbl_else = self.create_label()
-        lbl_end = self.create_label()
-        
-        self.visit(node.children[0]) # Gera código da condição
-        self.emit(f"JZ {lbl_else}")  # Se 0 (falso), salta para o Else
-        
+        self._branch_false(node.children[0], lbl_else) # Se falso, salta para o Else (ou para o fim)
         self.visit(node.children[1]) # Bloco Then
-        self.emit(f"JUMP {lbl_end}") # Salta por cima do Else
-        
-        self.emit(f"{lbl_else}:")
+
         if len(node.children) > 2:
+            lbl_end = self.create_label()
+            self.emit(f"JUMP {lbl_end}") # Salta por cima do Else
+            self.emit(f"{lbl_else}:")
             self.visit(node.children[2]) # Bloco Else
-            
+            self.emit(f"{lbl_end}:")
+        else:
+            self.emit(f"{lbl_else}:")
+
+    # CASE
+    def _case_items(self, node):
+        """Intervalos dos rótulos (lo, hi, índice do ramo), ordenados."""
+        items = []
+        for index, branch in enumerate(node.children[1:]):
+            if branch.type == 'CaseBranch':
+                items += [(lo, hi, index) for lo, hi in case_intervals(branch)]
+        return sorted(items)
+
+    def _use_jump_table(self, items):
+        """Tabela de saltos só para rótulos suficientes e densos (senão, pesquisa binária)."""
+        if not items:
+            return False
+        values = sum(hi - lo + 1 for lo, hi, _ in items)
+        span = items[-1][1] - items[0][0] + 1
+        return values >= MIN_JUMP_TABLE and span <= MAX_JUMP_TABLE and values >= MIN_TABLE_DENSITY * span
+
+    def generate_CaseStatement(self, node):
+        table = self.case_tables.get(id(node))
+        if table:
+            self._case_jump_table(node, *table)
+        else:
+            self._case_decision_tree(node)
+
+    def _case_jump_table(self, node, offset, low, span, labels, lbl_default):
+        """
+        Despacho em O(1) pela tabela de endereços. A EWVM não tem JUMP para um
+        endereço calculado: o único salto indireto é o CALL, por isso o
+        endereço lido da tabela (LOADN) é chamado e cada ramo termina em
+        RETURN. O CALL coloca o FP no topo da pilha, que ali só tem os locais
+        do subprograma: dentro dos ramos os locais e parâmetros ficam
+        'current_offset' posições abaixo (frame_shift).
+        """
+        lbl_out = self.create_label()
+        lbl_end = self.create_label()
+        self.emit("PUSHGP")
+        self.visit(node.children[0])
+        # Índice na tabela: seletor - menor valor + offset da tabela
+        if offset != low:
+            self.emit(f"PUSHI {abs(offset - low)}")
+            self.emit("ADD" if offset > low else "SUB")
+        for bound, op in ((offset, 'SUPEQ'), (offset + span - 1, 'INFEQ')):
+            self.emit("DUP 1")
+            self.emit(f"PUSHI {bound}")
+            self.emit(op)
+            self.emit(f"JZ {lbl_out}")
+        self.emit("LOADN")
+        self.emit("CALL")
+        self.emit(f"JUMP {lbl_end}")
+
+        # Fora da tabela: ELSE (se existir)
+        self.emit(f"{lbl_out}:")
+        self.emit("POP 2")
+        if case_has_else(node):
+            self.emit(f"PUSHA {lbl_default}")
+            self.emit("CALL")
+        self.emit(f"JUMP {lbl_end}")
+
+        old_shift = self.frame_shift
+        self.frame_shift = self.current_offset
+        for label, body in zip(labels, case_bodies(node)):
+            self.emit(f"{label}:")
+            self.visit(body)
+            self.emit("RETURN")
+        if not case_has_else(node):
+            self.emit(f"{lbl_default}:")
+            self.emit("RETURN")
+        self.frame_shift = old_shift
+        self.emit(f"{lbl_end}:")
+
+    def _case_decision_tree(self, node):
+        """
+        Despacho em O(log n): pesquisa binária sobre os intervalos ordenados
+        dos rótulos. O seletor fica na pilha durante os testes (DUP) e é
+        retirado antes de saltar para o ramo.
+        """
+        bodies = case_bodies(node)
+        labels = [self.create_label() for _ in bodies]
+        lbl_end = self.create_label()
+        lbl_default = labels[-1] if case_has_else(node) else lbl_end
+
+        self.visit(node.children[0])
+        self._emit_case_search(self._case_items(node), labels, lbl_default, None, None)
+        for i, (label, body) in enumerate(zip(labels, bodies)):
+            self.emit(f"{label}:")
+            self.visit(body)
+            if i < len(bodies) - 1:
+                self.emit(f"JUMP {lbl_end}")
         self.emit(f"{lbl_end}:")
 
+    def _emit_case_search(self, items, labels, lbl_default, low, high):
+        """Árvore de decisão sobre 'items'; low/high são os limites já conhecidos do seletor (ou None)."""
+        if len(items) <= MAX_LINEAR_TESTS:
+            for lo, hi, index in items:
+                lbl_next = self.create_label()
+                self._emit_interval_test(lo, hi, low, high, lbl_next)
+                self.emit("POP 1")
+                self.emit(f"JUMP {labels[index]}")
+                self.emit(f"{lbl_next}:")
+            self.emit("POP 1")
+            self.emit(f"JUMP {lbl_default}")
+            return
+
+        mid = len(items) // 2
+        pivot = items[mid][0]
+        lbl_high = self.create_label()
+        self.emit("DUP 1")
+        self.emit(f"PUSHI {pivot}")
+        self.emit("INF")
+        self.emit(f"JZ {lbl_high}") # seletor >= pivot: metade de cima
+        self._emit_case_search(items[:mid], labels, lbl_default, low, pivot - 1)
+        self.emit(f"{lbl_high}:")
+        self._emit_case_search(items[mid:], labels, lbl_default, pivot, high)
+
+    def _emit_interval_test(self, lo, hi, low, high, target):
+        """Salta para 'target' se o seletor (no topo, que fica na pilha) não estiver em [lo, hi]."""
+        if lo == hi and (low, high) != (lo, hi):
+            self.emit("DUP 1")
+            self.emit(f"PUSHI {lo}")
+            self.emit("EQUAL")
+            self.emit(f"JZ {target}")
+            return
+        if low is None or lo > low:
+            self.emit("DUP 1")
+            self.emit(f"PUSHI {lo}")
+            self.emit("SUPEQ")
+            self.emit(f"JZ {target}")
+        if high is None or hi < high:
+            self.emit("DUP 1")
+            self.emit(f"PUSHI {hi}")
+            self.emit("INFEQ")
+            self.emit(f"JZ {target}")
+
     def generate_WhileStatement(self, node):
-        lbl_start = self.create_label()
+        """
+        Ciclo rodado: o teste fica no fim do corpo e salta para trás enquanto
+        for verdadeiro (um só salto condicional por iteração). À entrada, uma
+        condição pequena é duplicada como guarda; uma grande não se duplica e
+        a entrada salta diretamente para o teste.
+        """
+        cond = node.children[0]
+        lbl_body = self.create_label()
         lbl_end = self.create_label()
-        
-        self.emit(f"{lbl_start}:")
-        self.visit(node.children[0]) # Condição
-        self.emit(f"JZ {lbl_end}")   # Se falso, sai do loop
-        
+        guarded = sum(1 for _ in walk(cond)) <= MAX_GUARD_SIZE
+
+        if guarded:
+            self._branch_false(cond, lbl_end) # Guarda: não entra se já for falsa
+        else:
+            lbl_test = self.create_label()
+            self.emit(f"JUMP {lbl_test}")
+
+        self.emit(f"{lbl_body}:")
         self.visit(node.children[1]) # Corpo
-        self.emit(f"JUMP {lbl_start}") # Volta ao início
-        
+        if not guarded:
+            self.emit(f"{lbl_test}:")
+        self._branch_true(cond, lbl_body) # Volta ao corpo enquanto for verdadeira
         self.emit(f"{lbl_end}:")
 
+    # Condições em Curto-Circuito
+    # A EWVM só tem JZ: 'saltar se falso' é direto, 'saltar se verdadeiro' inverte a condição.
+    def _branch_false(self, cond, target):
+        """Salta para 'target' se a condição for falsa; se for verdadeira, continua."""
+        if cond.type == 'BinaryOp' and cond.leaf == 'AND':
+            self._branch_false(cond.children[0], target)
+            self._branch_false(cond.children[1], target)
+        elif cond.type == 'BinaryOp' and cond.leaf == 'OR':
+            lbl_true = self.create_label()
+            self._branch_true(cond.children[0], lbl_true)
+            self._branch_false(cond.children[1], target)
+            self.emit(f"{lbl_true}:")
+        elif cond.type == 'UnaryOp' and cond.leaf == 'NOT':
+            self._branch_true(cond.children[0], target)
+        elif is_bool(cond):
+            if not bool_value(cond):
+                self.emit(f"JUMP {target}")
+        else:
+            self.visit(cond)
+            self.emit(f"JZ {target}")
+
+    def _branch_true(self, cond, target):
+        """Salta para 'target' se a condição for verdadeira; se for falsa, continua."""
+        if cond.type == 'BinaryOp' and cond.leaf == 'OR':
+            self._branch_true(cond.children[0], target)
+            self._branch_true(cond.children[1], target)
+        elif cond.type == 'BinaryOp' and cond.leaf == 'AND':
+            lbl_false = self.create_label()
+            self._branch_false(cond.children[0], lbl_false)
+            self._branch_true(cond.children[1], target)
+            self.emit(f"{lbl_false}:")
+        elif cond.type == 'UnaryOp' and cond.leaf == 'NOT':
+            self._branch_false(cond.children[0], target)
+        elif is_bool(cond):
+            if bool_value(cond):
+                self.emit(f"JUMP {target}")
+        elif cond.type == 'BinaryOp' and cond.leaf in INVERTED_COMPARISON:
+            # a < b verdadeiro <=> a >= b é 0
+            self.visit(Node('BinaryOp', cond.children, INVERTED_COMPARISON[cond.leaf], lineno=cond.lineno))
+            self.emit(f"JZ {target}")
+        else:
+            self.visit(cond)
+            self.emit("NOT")
+            self.emit(f"JZ {target}")
+
     def generate_ForStatement(self, node):
         # Inicialização
         var_node = node.children[0]
         name = var_node.leaf
-        offset = self.variable_offsets.get(name)
         direction = node.leaf # 'to' ou 'downto'
+        start, limit = node.children[1], node.children[2]
         
         # Determina se é variável local ou global
-        is_stack = self._is_local() or offset < 0
+        is_stack, offset = self._resolve(name)
         instr_store = f"STOREL {offset}" if is_stack else f"STOREG {offset}"
         instr_push = f"PUSHL {offset}" if is_stack else f"PUSHG {offset}"
 
-        self.visit(node.children[1]) # Valor inicial
+        self.visit(start) # Valor inicial
+
+        # O limite é avaliado uma única vez, antes da atribuição (semântica Pascal).
+        # Constante: comparação imediata; caso contrário fica num slot escondido.
+        limit_slot = None
+        if is_int(limit):
+            instr_limit = f"PUSHI {limit.leaf}"
+        else:
+            limit_slot = f"$limit{self.for_depth}"
+            self.for_depth += 1
+            self.visit(limit)
+            self._emit_store(limit_slot)
+            slot_stack, slot_offset = self._resolve(limit_slot)
+            instr_limit = f"PUSHL {slot_offset}" if slot_stack else f"PUSHG {slot_offset}"
         self.emit(instr_store)
 
-        # Teste e Corpo
-        lbl_loop = self.create_label()
+        lbl_body = self.create_label()
         lbl_end = self.create_label()
 
-        self.emit(f"{lbl_loop}:")
-        self.emit(instr_push)        # Carrega variável de controlo
-        self.visit(node.children[2]) # Carrega limite
-        
-        # Comparação (<= para to, >= para downto)
-        if direction == 'to': self.emit("INFEQ")
-        else: self.emit("SUPEQ")
-        self.emit(f"JZ {lbl_end}") # Se condição falhar, sai
-
+        # Pré-teste (dispensado quando se sabe que o ciclo executa pelo menos uma vez)
+        runs_once = is_int(start) and is_int(limit) and \
+            (start.leaf <= limit.leaf if direction == 'to' else start.leaf >= limit.leaf)
+        if not runs_once:
+            self.emit(instr_push)
+            self.emit(instr_limit)
+            if direction == 'to': self.emit("INFEQ")
+            else: self.emit("SUPEQ")
+            self.emit(f"JZ {lbl_end}")
+
+        self.emit(f"{lbl_body}:")
         self.visit(node.children[3]) # Executa corpo
 
         # Atualização (Passo)
@@ -253,109 +628,242 @@ class CodeGenerator:
         if direction == 'to': self.emit("ADD")
         else: self.emit("SUB")
         self.emit(instr_store)
-        
-        self.emit(f"JUMP {lbl_loop}")
+
+        # Teste no fim: volta ao corpo enquanto não ultrapassar o limite
+        # (um só compare-and-branch por iteração, sem JUMP para trás)
+        self.emit(instr_push)
+        self.emit(instr_limit)
+        if direction == 'to': self.emit("SUP")
+        else: self.emit("INF")
+        self.emit(f"JZ {lbl_body}")
         self.emit(f"{lbl_end}:")
 
+        if limit_slot:
+            self.for_depth -= 1
+
     # Acessos (Arrays e Strings)
     def generate_ArrayAccess(self, node):
         name = node.leaf
-        info = self.symbol_table.lookup(name)
         
         # Caso Especial: Strings (Usa CHARAT em vez de LOAD)
-        if info and info.get('type') == 'string':
-            offset = self.variable_offsets.get(name)
-            if self._is_local() or offset < 0:
-                self.emit(f"PUSHL {offset}")
-            else:
-                self.emit(f"PUSHG {offset}")
+        if self._type_of(name) == 'string':
+            self._emit_load(name)
             
             # Índice (ajuste 1-based do Pascal)
-            self.visit(node.children[0])
-            self.emit("PUSHI 1")
-            self.emit("SUB")
+            self._emit_index(node.children[0], 1)
             
             self.emit("CHARAT") 
             return
 
+        # Índice constante: o elemento é lido como uma variável simples
+        element = self._const_element(node)
+        if element:
+            self._count_elided()
+            is_stack, offset = element
+            self.emit(f"PUSHL {offset}" if is_stack else f"PUSHG {offset}")
+            return
+
         # Arrays Normais: Calcula endereço e carrega valor
         self._calc_array_addr(node)
         self.emit("LOAD 0") 
 
+    def _const_element(self, node):
+        """(is_stack, offset) de a[k] com k constante dentro dos limites, senão None."""
+        index = node.children[0]
+        var_type = self._type_of(node.leaf)
+        if not is_int(index) or not isinstance(var_type, dict):
+            return None
+        r_min, r_max = var_type['range']
+        is_stack, offset = self._resolve(node.leaf)
+        if offset is None or not (r_min <= index.leaf <= r_max):
+            return None
+        if (self.variable_offsets[node.leaf] if is_stack else offset) < 0 or self._holds_address(node.leaf):
+            return None # Parâmetro ou array no heap
+        return is_stack, offset + (index.leaf - r_min)
+
     def _calc_array_addr(self, node):
         """Calcula o endereço de memória absoluto de um elemento do array."""
         name = node.leaf
-        offset = self.variable_offsets.get(name)
-        self._emit_var_addr(offset) # Coloca endereço base na pilha
-        
-        self.visit(node.children[0]) # Coloca índice na pilha
+        var_type = self._type_of(name)
+        r_min = var_type['range'][0] if isinstance(var_type, dict) else 0
+        index = node.children[0]
+        if node.type in ('ArrayAccess', 'VarArgument') and self.bounds_check:
+            if not getattr(node, 'safe_index', False):
+                # Índice não provado: CHECK antes do ajuste (não retira o índice da pilha)
+                self._emit_var_addr(name)
+                self.visit(index)
+                self.emit(f"CHECK {r_min}, {var_type['range'][1]}")
+                if r_min != 0:
+                    self.emit(f"PUSHI {r_min}")
+                    self.emit("SUB")
+                self.emit("PADD")
+                self.checks_emitted += 1
+                return
+            self._count_elided()
+        if is_int(index) and not self._holds_address(name):
+            # Índice constante: o deslocamento do elemento junta-se ao da variável
+            is_stack, offset = self._resolve(name)
+            self.emit("PUSHFP" if is_stack else "PUSHGP")
+            self.emit(f"PUSHI {offset + index.leaf - r_min}")
+            self.emit("PADD")
+            return
+
+        self._emit_var_addr(name) # Coloca endereço base na pilha
         
-        # Ajuste do limite inferior (ex: array[10..20], índice 10 vira offset 0)
-        info = self.symbol_table.lookup(name)
-        if info and isinstance(info.get('type'), dict):
-             r_min = info['type']['range'][0]
-             if r_min != 0:
-                 self.emit(f"PUSHI {r_min}")
-                 self.emit("SUB")
+        # Índice com ajuste do limite inferior (ex: array[10..20], índice 10 vira offset 0)
+        self._emit_index(index, r_min)
         
         self.emit("PADD") # Endereço Final = Base + (Índice - LimiteInferior)
 
+    def _emit_index(self, index, lower):
+        """
+        Coloca 'index - lower' na pilha. Uma constante somada ao índice (a[i + 1])
+        junta-se ao ajuste do limite inferior numa só operação (ou nenhuma).
+        """
+        adjust = -lower
+        if is_int(index):
+            self.emit(f"PUSHI {index.leaf + adjust}")
+            return
+        if index.type == 'BinaryOp' and index.leaf in ('+', '-') and is_int(index.children[1]):
+            adjust += index.children[1].leaf if index.leaf == '+' else -index.children[1].leaf
+            index = index.children[0]
+        elif index.type == 'BinaryOp' and index.leaf == '+' and is_int(index.children[0]):
+            adjust += index.children[0].leaf
+            index = index.children[1]
+        self.visit(index)
+        if adjust > 0:
+            self.emit(f"PUSHI {adjust}")
+            self.emit("ADD")
+        elif adjust < 0:
+            self.emit(f"PUSHI {-adjust}")
+            self.emit("SUB")
+
+    def generate_IndexCheck(self, node):
+        """Índice de uma dimensão de um array multidimensional (antes de multiplicar pelo passo)."""
+        self.visit(node.children[0])
+        if not self.bounds_check:
+            return
+        if getattr(node, 'safe_index', False):
+            self.checks_elided += 1
+            return
+        lo, hi = node.leaf
+        self.emit(f"CHECK {lo}, {hi}")
+        self.checks_emitted += 1
+
+    def generate_ElementAddress(self, node):
+        """Endereço de um elemento (inicialização dos ponteiros de indução)."""
+        self._calc_array_addr(node)
+
+    def _count_elided(self):
+        if self.bounds_check:
+            self.checks_elided += 1
+
+    def generate_PointerAccess(self, node):
+        """Leitura do elemento apontado por uma temporária '$ptrN'."""
+        self._count_elided() # Só se criam ponteiros para acessos provados seguros
+        self._emit_load(node.leaf)
+        self.emit("LOAD 0")
+
+    def _emit_element_addr(self, node):
+        """Endereço do alvo de uma escrita indireta (a[i], ponteiro de indução ou parâmetro 'var')."""
+        if node.type == 'PointerAccess':
+            self._count_elided()
+            self._emit_load(node.leaf)
+        elif node.type == 'VariableAccess':
+            self._emit_var_addr(node.leaf)
+        else:
+            self._calc_array_addr(node)
+
+    def _is_indirect(self, node):
+        """A escrita passa por um endereço na pilha (STORE 0) em vez de STOREL/STOREG."""
+        return node.type in ('ArrayAccess', 'PointerAccess') or self._is_reference(node.leaf)
+
     # Operações e Atribuições
     def generate_AssignmentStatement(self, node):
         var_node = node.children[0]
         expr = node.children[1]
 
-        if var_node.type == 'ArrayAccess':
-            # Atribuição a Array: array[i] := expr
-            self._calc_array_addr(var_node) # Calcula destino
+        element = self._const_element(var_node) if var_node.type == 'ArrayAccess' else None
+        other = self._read_modify_write(var_node, expr) if self._is_indirect(var_node) else None
+        if element:
+            # Atribuição a a[k] com k constante: STORE direto no slot do elemento
+            self._count_elided()
+            self.visit(expr)
+            is_stack, offset = element
+            self.emit(f"STOREL {offset}" if is_stack else f"STOREG {offset}")
+        elif other is not None:
+            # a[i] := a[i] op e: o endereço é calculado uma vez e reutilizado (DUP)
+            self._emit_element_addr(var_node)
+            self.emit("DUP 1")
+            self.emit("LOAD 0")
+            self.visit(other)
+            self._emit_operator(expr.leaf)
+            self.emit("STORE 0")
+        elif self._is_indirect(var_node):
+            # Atribuição a Array (ou através de um parâmetro 'var'): array[i] := expr
+            self._emit_element_addr(var_node) # Calcula destino
             self.visit(expr)                # Calcula valor
             self.emit("STORE 0")            # Guarda valor no endereço
         else:
             # Atribuição Simples: var := expr
             self.visit(expr)
-            name = var_node.leaf
-            off = self.variable_offsets.get(name)
-            if self._is_local() or off < 0:
-                self.emit(f"STOREL {off}")
-            else:
-                self.emit(f"STOREG {off}")
+            self._emit_store(var_node.leaf)
+
+    def _read_modify_write(self, target, expr):
+        """
+        Se expr é 'a[i] op e' (ou 'e op a[i]' com op comutativo e 'e' sem chamadas),
+        devolve o operando 'e'; senão None. O índice não pode ter chamadas, já que
+        passa a ser avaliado uma só vez.
+        """
+        if expr.type != 'BinaryOp' or self._type_of(target.leaf) == 'string' or not is_pure(target):
+            return None
+        left, right = expr.children
+        if same_expr(left, target) and right.type != 'StringConstant':
+            return right
+        if expr.leaf in COMMUTATIVE_OPS and same_expr(right, target) and is_pure(left):
+            return left
+        return None
+
+    def generate_ExpressionStatement(self, node):
+        # Avalia a expressão apenas pelos efeitos colaterais (chamadas) e descarta o valor
+        self.visit(node.children[0])
+        self.emit("POP 1")
 
     def generate_ReadStatement(self, node):
         for var in node.children:
-            if var.type == 'ArrayAccess':
-                self._calc_array_addr(var) # Prepara endereço se for array
+            if self._is_indirect(var):
+                self._emit_element_addr(var) # Prepara endereço se for array
             
             self.emit("READ") # Lê input do utilizador
             
             # Converte para inteiro se necessário (simplificação)
             var_name = var.leaf
-            info = self.symbol_table.lookup(var_name)
+            t = self._type_of(var_name)
             is_int = True
-            if info:
-                t = info['type']
-                if isinstance(t, dict) and t.get('kind') == 'array':
+            if t:
+                if isinstance(t, dict) and t.get('kind') in ('array', 'pointer'):
                     if t.get('elem_type') != 'integer': is_int = False
                 elif t == 'string': is_int = False
             
             if is_int: self.emit("ATOI") # ASCII to Integer
 
-            if var.type == 'ArrayAccess':
+            if self._is_indirect(var):
                 self.emit("STORE 0")
             else:
-                off = self.variable_offsets.get(var_name)
-                if self._is_local() or off < 0:
-                    self.emit(f"STOREL {off}")
-                else:
-                    self.emit(f"STOREG {off}")
+                self._emit_store(var_name)
 
     def generate_VariableAccess(self, node):
         name = node.leaf
-        offset = self.variable_offsets.get(name)
+        is_stack, offset = self._resolve(name)
         if offset is not None:
-            if self._is_local() or offset < 0:
-                self.emit(f"PUSHL {offset}")
-            else:
-                self.emit(f"PUSHG {offset}")
+            self._emit_load(name)
+
+    def generate_VarArgument(self, node):
+        """Argumento de um parâmetro 'var': empilha o endereço (um array inteiro passa só a base)."""
+        if node.children:
+            self._calc_array_addr(node)
+        else:
+            self._emit_var_addr(node.leaf)
 
     def generate_WriteStatement(self, node):
         for expr in node.children:
@@ -372,16 +880,25 @@ class CodeGenerator:
             self.emit("STRLEN")
             return
 
-        # Avalia argumentos e coloca na pilha
-        if node.children:
-            for arg in node.children[0].children:
-                self.visit(arg)
-        
-        # Salta para a função
         lbl = self.procedure_starts.get(name)
         if lbl:
-            self.emit(f"PUSHA {lbl}")
-            self.emit("CALL")
+            self.emit("PUSHI 0") # Slot do resultado (fica na pilha depois da chamada)
+            self._emit_call(node, lbl)
+
+    def generate_ProcedureCall(self, node):
+        lbl = self.procedure_starts.get(node.leaf)
+        if lbl:
+            self._emit_call(node, lbl)
+
+    def _emit_call(self, node, lbl):
+        """Empilha os argumentos, chama e retira-os de novo (a limpeza é do chamador)."""
+        args = node.children[0].children if node.children else []
+        for arg in args:
+            self.visit(arg)
+        self.emit(f"PUSHA {lbl}")
+        self.emit("CALL")
+        if args:
+            self.emit(f"POP {len(args)}")
 
     def generate_BinaryOp(self, node):
         left = node.children[0]
@@ -399,13 +916,37 @@ class CodeGenerator:
                     self.emit("NOT")
                 return
 
+        if node.leaf in ('AND', 'OR'):
+            # Valor booleano sempre em curto-circuito (como nas condições e no
+            # avaliador em compilação): o operando da direita pode estar
+            # protegido pelo esquerdo, ex.: (d <> 0) and (x div d > 1)
+            lbl_false = self.create_label()
+            lbl_end = self.create_label()
+            self._branch_false(node, lbl_false)
+            self.emit("PUSHI 1")
+            self.emit(f"JUMP {lbl_end}")
+            self.emit(f"{lbl_false}:")
+            self.emit("PUSHI 0")
+            self.emit(f"{lbl_end}:")
+            return
+
         self.visit(left)
         self.visit(right)
+        if node.leaf == '+' and left.type == 'VariableAccess' and self._is_pointer(left.leaf):
+            self.emit("PADD") # Avanço de um ponteiro de indução
+            return
+        self._emit_operator(node.leaf)
+
+    def _is_pointer(self, name):
+        var_type = self._type_of(name)
+        return isinstance(var_type, dict) and var_type.get('kind') == 'pointer'
+
+    def _emit_operator(self, op):
         ops = {'+':'ADD', '-':'SUB', '*':'MUL', 'DIV':'DIV', 'MOD':'MOD', 
                '=':'EQUAL', '<':'INF', '>':'SUP', '<=': 'INFEQ', '>=':'SUPEQ', 
                'AND':'AND', 'OR':'OR'}
-        if node.leaf in ops: self.emit(ops[node.leaf])
-        elif node.leaf == '<>': 
+        if op in ops: self.emit(ops[op])
+        elif op == '<>': 
             self.emit("EQUAL")
             self.emit("NOT")
 
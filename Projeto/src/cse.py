@@ -0,0 +1,224 @@
+from parser import Node
+from astutils import (ProgramInfo, walk, has_calls, assigned_vars, reference_args, is_scalar, same_expr, case_bodies,
+                      COMPARISON_OPS, LOGICAL_OPS, BUILTIN_FUNCTIONS)
+
+
+class Expression:
+    """Uma expressão disponível: as suas ocorrências e a temporária que a guarda."""
+    def __init__(self, node, reads, seq):
+        self.node = node
+        self.reads = reads # Variáveis/arrays de que o valor depende
+        self.seq = seq # Ordem da primeira avaliação (pós-ordem: subexpressões primeiro)
+        self.sites = [] # (nó pai, índice do filho)
+        self.anchor = None # Instrução antes da qual se calcula a temporária
+
+
+class CommonSubexpressionEliminator:
+    """
+    Eliminação de subexpressões comuns (CSE) sobre a AST estruturada.
+    Percorre cada corpo pela ordem de execução mantendo as expressões puras
+    já avaliadas (aritmética, comparações e leituras de arrays). Uma expressão
+    repetida sem nenhuma escrita nos seus operandos pelo meio passa a ser
+    calculada uma vez para uma temporária '$cseN', antes da instrução onde
+    aparece primeiro. As expressões disponíveis antes de um IF/ciclo continuam
+    disponíveis lá dentro (se o ciclo não alterar os operandos); atribuições,
+    READ e chamadas invalidam as que dependem do que escrevem (e, havendo
+    parâmetros 'var', do que pode partilhar memória com isso).
+    Só se aplica quando compensa: custo * (usos - 1) > usos + 1 instruções.
+    """
+    def __init__(self):
+        self.count = 0 # Expressões calculadas uma só vez
+        self.uses_removed = 0 # Reavaliações evitadas
+
+    def run(self, ast):
+        """Executa a passagem sobre todo o programa. Devolve True se algo mudou."""
+        before = self.count
+        info = ProgramInfo(ast)
+        self.call_writes = info.globals_written()
+        for scope in info.scopes():
+            self.scope = scope
+            self.clobbered = scope.call_clobbered(self.call_writes)
+            self.entries = []
+            self.seq = 0
+            self.temps = 0
+            self.block(scope.body, {})
+            self._materialize()
+        return self.count != before
+
+    # Custos (instruções EWVM aproximadas)
+    def _cost(self, node):
+        if node.type == 'ArrayAccess':
+            index = node.children[0]
+            if index.type == 'IntegerConstant' and self.scope.lookup(node.leaf) != 'string':
+                return 1
+            return 6 + self._cost(index)
+        if node.type == 'FunctionCall':
+            return 1 + sum(self._cost(arg) for arg in node.children[0].children) if node.children else 1
+        return 1 + sum(self._cost(child) for child in node.children if isinstance(child, Node))
+
+    # Candidatos
+    def _result_type(self, node):
+        """Tipo da temporária (None se a expressão não puder ser guardada numa)."""
+        for n in walk(node):
+            if n.type == 'StringConstant' and not (node.type == 'BinaryOp' and node.leaf in COMPARISON_OPS):
+                return None
+            if n.type == 'VariableAccess' and not is_scalar(self.scope.lookup(n.leaf)):
+                if not self._inside_string_op(node, n):
+                    return None
+        if node.type == 'BinaryOp':
+            return 'boolean' if node.leaf in COMPARISON_OPS + LOGICAL_OPS else 'integer'
+        if node.type == 'UnaryOp':
+            return 'boolean' if node.leaf == 'NOT' else 'integer'
+        if node.type == 'ArrayAccess':
+            var_type = self.scope.lookup(node.leaf)
+            if var_type == 'string':
+                return 'integer' # Código do carácter (CHARAT)
+            if isinstance(var_type, dict) and is_scalar(var_type['elem_type']):
+                return var_type['elem_type']
+            return None
+        if node.type == 'FunctionCall':
+            return 'integer' # length
+        return None
+
+    def _inside_string_op(self, root, var):
+        """Uma string só pode aparecer como argumento de length()."""
+        for n in walk(root):
+            if n.type == 'FunctionCall' and n.children and var in n.children[0].children:
+                return True
+        return False
+
+    def _is_candidate(self, node):
+        if node.type == 'FunctionCall':
+            return node.leaf.lower() in BUILTIN_FUNCTIONS
+        if node.type == 'UnaryOp':
+            return node.children[0].type not in ('IntegerConstant', 'BooleanConstant', 'VariableAccess')
+        return node.type in ('BinaryOp', 'ArrayAccess')
+
+    def _reads(self, node):
+        return {n.leaf for n in walk(node) if n.type in ('VariableAccess', 'ArrayAccess')}
+
+    # Registo das Ocorrências
+    def collect(self, parent, index, avail, anchor):
+        """Regista as subexpressões avaliadas em parent.children[index] (de cima para baixo)."""
+        node = parent.children[index]
+        if not isinstance(node, Node):
+            return
+        if self._is_candidate(node) and not has_calls(node):
+            key = self._find(avail, node)
+            if key is not None:
+                avail[key].sites.append((parent, index))
+                return # As subexpressões já estão cobertas pela ocorrência anterior
+        # Só o operando esquerdo de AND/OR é sempre avaliado (avaliação em curto-circuito)
+        children = range(len(node.children))
+        if node.type == 'BinaryOp' and node.leaf in LOGICAL_OPS:
+            children = [0]
+        for i in children:
+            self.collect(node, i, avail, anchor)
+        if self._is_candidate(node) and not has_calls(node) and self._result_type(node):
+            self.seq += 1
+            entry = Expression(node, self._reads(node), self.seq)
+            entry.sites.append((parent, index))
+            entry.anchor = anchor
+            self.entries.append(entry)
+            avail[len(self.entries) - 1] = entry
+
+    def _find(self, avail, node):
+        for key, entry in avail.items():
+            if same_expr(entry.node, node):
+                return key
+        return None
+
+    def _kill(self, avail, names):
+        names = self.scope.aliases(names)
+        for key in [key for key, entry in avail.items() if entry.reads & names]:
+            del avail[key]
+
+    def _kill_calls(self, avail, node):
+        self._kill(avail, self.clobbered | reference_args(node))
+
+    # Percurso das Instruções
+    def block(self, node, avail):
+        """Processa uma instrução com as expressões disponíveis 'avail' (atualizado no fim)."""
+        if node is None:
+            return
+        if node.type == 'CompoundStatement':
+            for child in node.children:
+                self.block(child, avail)
+            return
+
+        calls = has_calls(node) or node.type == 'ProcedureCall'
+        if node.type == 'AssignmentStatement':
+            if not calls:
+                target = node.children[0]
+                if target.type == 'ArrayAccess':
+                    self.collect(target, 0, avail, node)
+                self.collect(node, 1, avail, node)
+            self._kill(avail, {node.children[0].leaf})
+        elif node.type == 'WriteStatement':
+            if not calls:
+                for i in range(len(node.children)):
+                    self.collect(node, i, avail, node)
+        elif node.type == 'ReadStatement':
+            self._kill(avail, {var.leaf for var in node.children})
+        elif node.type == 'IfStatement':
+            if not has_calls(node.children[0]):
+                self.collect(node, 0, avail, node)
+            for branch in node.children[1:]:
+                self.block(branch, dict(avail))
+            self._kill(avail, assigned_vars(node))
+        elif node.type == 'CaseStatement':
+            if not has_calls(node.children[0]):
+                self.collect(node, 0, avail, node)
+            for body in case_bodies(node):
+                self.block(body, dict(avail))
+            self._kill(avail, assigned_vars(node))
+        elif node.type in ('WhileStatement', 'ForStatement'):
+            if node.type == 'ForStatement' and not (has_calls(node.children[1]) or has_calls(node.children[2])):
+                self.collect(node, 1, avail, node)
+                self.collect(node, 2, avail, node)
+            self._kill(avail, assigned_vars(node))
+            if has_calls(node):
+                self._kill_calls(avail, node)
+            self.block(node.children[-1], dict(avail))
+        if calls:
+            self._kill_calls(avail, node)
+
+    # Criação das Temporárias
+    def _materialize(self):
+        chosen = []
+        for entry in self.entries:
+            uses = len(entry.sites)
+            if uses >= 2 and self._cost(entry.node) * (uses - 1) > uses + 1:
+                chosen.append(entry)
+
+        # Inserção antes da instrução âncora, subexpressões primeiro
+        inserts = {}
+        for entry in sorted(chosen, key=lambda e: e.seq):
+            temp = self._new_temp(entry)
+            lineno = entry.node.lineno
+            for parent, index in entry.sites:
+                parent.children[index] = Node('VariableAccess', [], temp, lineno=lineno)
+            assign = Node('AssignmentStatement', [Node('VariableAccess', [], temp, lineno=lineno), entry.node],
+                          lineno=lineno)
+            inserts.setdefault(id(entry.anchor), []).append(assign)
+            self.count += 1
+            self.uses_removed += len(entry.sites) - 1
+        if inserts:
+            self.scope.block.children[2] = self._insert(self.scope.body, inserts)
+
+    def _new_temp(self, entry):
+        while True:
+            self.temps += 1
+            temp = f'$cse{self.temps}'
+            if temp not in self.scope.variables:
+                break
+        self.scope.declare(temp, Node('BasicType', [], self._result_type(entry.node)))
+        return temp
+
+    def _insert(self, node, inserts):
+        for i, child in enumerate(node.children):
+            if isinstance(child, Node) and child.type not in ('VariableAccess', 'ArrayAccess'):
+                node.children[i] = self._insert(child, inserts)
+        if id(node) in inserts:
+            return Node('CompoundStatement', inserts[id(node)] + [node], lineno=node.lineno)
+        return node
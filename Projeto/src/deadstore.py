@@ -0,0 +1,170 @@
+from parser import Node
+from astutils import ProgramInfo, walk, has_calls, case_has_else
+from liveness import Liveness
+
+
+class DeadStoreEliminator:
+    """
+    Eliminação de armazenamentos mortos (baseada em liveness) e remoção de
+    variáveis que deixaram de ser usadas.
+    Ao retirar as variáveis das declarações, os offsets atribuídos pelo
+    CodeGenerator ficam compactados e o PUSHN de cada escopo encolhe.
+    Atribuições mortas cujo lado direito tem chamadas mantêm as chamadas
+    (passam a ExpressionStatement, que avalia e descarta o valor).
+    """
+    def __init__(self):
+        self.stores_removed = 0 # Atribuições eliminadas
+        self.slots_removed = 0 # Posições de memória libertadas nas declarações
+
+    def run(self, ast):
+        """Executa a passagem sobre todo o programa. Devolve True se algo mudou."""
+        before = (self.stores_removed, self.slots_removed)
+        info = ProgramInfo(ast)
+
+        for scope in info.scopes():
+            self.liveness = Liveness(scope, info)
+            self.unread_arrays = self._unread_arrays(scope, info)
+            body, _ = self.process(scope.body, self.liveness.exit_live())
+            scope.block.children[2] = body
+
+        for scope in info.scopes():
+            self._remove_unused(scope, self._referenced(scope, info))
+
+        return (self.stores_removed, self.slots_removed) != before
+
+    # Variáveis Referenciadas
+    def _names_in(self, node):
+        names = set()
+        for n in walk(node):
+            if n.type in ('VariableAccess', 'ArrayAccess', 'VarArgument'):
+                names.add(n.leaf)
+        return names
+
+    def _referenced(self, scope, info):
+        """Nomes usados pelo escopo (as globais contam também os usos nos subprogramas)."""
+        names = self._names_in(scope.body)
+        if scope.is_global:
+            for sub in info.subprograms.values():
+                names |= {n for n in self._names_in(sub.body) if n not in sub.variables}
+        return names
+
+    def _unread_arrays(self, scope, info):
+        """Arrays do escopo que nunca são lidos: todas as escritas neles são mortas."""
+        # Um array 'var' é de quem chama: as escritas nele ficam sempre
+        arrays = {name for name, t in scope.variables.items() if isinstance(t, dict) and name not in scope.references}
+        if not arrays:
+            return set()
+
+        bodies = [scope.body]
+        if scope.is_global:
+            bodies += [sub.body for sub in info.subprograms.values()]
+
+        # Destinos de escritas (a[i] := ..., read(a[i])) não contam como leituras
+        targets = set()
+        for body in bodies:
+            for n in walk(body):
+                if n.type == 'AssignmentStatement':
+                    targets.add(id(n.children[0]))
+                elif n.type == 'ReadStatement':
+                    targets.update(id(var) for var in n.children)
+
+        read = set()
+        for body in bodies:
+            for n in walk(body):
+                if n.type in ('VariableAccess', 'ArrayAccess', 'VarArgument') and id(n) not in targets:
+                    read.add(n.leaf)
+        return arrays - read
+
+    # Transformação para trás
+    def _discard(self, parts, lineno):
+        """Mantém apenas as partes com chamadas de uma atribuição morta."""
+        kept = [Node('ExpressionStatement', [p], lineno=lineno) for p in parts if has_calls(p)]
+        if not kept:
+            return Node('Empty', [], lineno=lineno)
+        if len(kept) == 1:
+            return kept[0]
+        return Node('CompoundStatement', kept, lineno=lineno)
+
+    def process(self, node, live_out):
+        """Devolve (nó transformado, conjunto vivo à entrada)."""
+        if node is None:
+            return node, set(live_out)
+        method = getattr(self, f'_process_{node.type}', None)
+        if method:
+            return method(node, set(live_out))
+        return node, self.liveness.live_in(node, live_out)
+
+    def _process_CompoundStatement(self, node, live):
+        children = []
+        for child in reversed(node.children):
+            child, live = self.process(child, live)
+            if child.type != 'Empty':
+                children.append(child)
+        node.children = list(reversed(children))
+        return node, live
+
+    def _process_AssignmentStatement(self, node, live):
+        target, expr = node.children
+        dead_scalar = target.type == 'VariableAccess' and target.leaf in self.liveness.tracked \
+            and target.leaf not in live
+        dead_array = target.type == 'ArrayAccess' and target.leaf in self.unread_arrays
+
+        if dead_scalar or dead_array:
+            self.stores_removed += 1
+            parts = ([target.children[0]] if dead_array else []) + [expr]
+            replacement = self._discard(parts, node.lineno)
+            return replacement, self.liveness.live_in(replacement, live)
+        return node, self.liveness.live_in(node, live)
+
+    def _process_IfStatement(self, node, live):
+        node.children[1], then_live = self.process(node.children[1], live)
+        if len(node.children) > 2:
+            node.children[2], else_live = self.process(node.children[2], live)
+        else:
+            else_live = live
+        return node, then_live | else_live | self.liveness.uses(node.children[0])
+
+    def _process_CaseStatement(self, node, live):
+        live_in = set() if case_has_else(node) else set(live)
+        for branch in node.children[1:]:
+            branch.children[-1], body_live = self.process(branch.children[-1], live)
+            live_in |= body_live
+        return node, live_in | self.liveness.uses(node.children[0])
+
+    def _process_WhileStatement(self, node, live):
+        head = self.liveness.loop_head(node, live)
+        node.children[1], _ = self.process(node.children[1], self.liveness.body_live_out(node, head))
+        return node, head
+
+    def _process_ForStatement(self, node, live):
+        head = self.liveness.loop_head(node, live)
+        node.children[3], _ = self.process(node.children[3], self.liveness.body_live_out(node, head))
+        var = node.children[0].leaf
+        return node, (head - {var}) | self.liveness.uses(node.children[1]) | self.liveness.uses(node.children[2])
+
+    # Declarações
+    def _remove_unused(self, scope, referenced):
+        decls = scope.declarations
+        kept_decls = []
+        for decl in decls.children:
+            if decl.type != 'Declaration':
+                kept_decls.append(decl)
+                continue
+            id_list, type_node = decl.children
+            size = self._size(type_node)
+            kept_ids = []
+            for id_node in id_list.children:
+                if id_node.leaf in referenced:
+                    kept_ids.append(id_node)
+                else:
+                    self.slots_removed += size
+            id_list.children = kept_ids
+            if kept_ids:
+                kept_decls.append(decl)
+        decls.children = kept_decls
+
+    def _size(self, type_node):
+        if type_node.type == 'ArrayType':
+            r_min, r_max = type_node.leaf
+            return (r_max - r_min) + 1
+        return 1
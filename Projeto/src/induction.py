@@ -0,0 +1,314 @@
+import copy
+from parser import Node
+from astutils import ProgramInfo, walk, has_calls, assigned_vars, used_vars, reference_args, make_int
+
+# Custo (instruções) de avançar uma temporária no fim de cada iteração: PUSH, PUSHI, ADD/PADD, STORE
+ADVANCE_COST = 4
+
+
+def linear_form(expr, var):
+    """
+    Decompõe uma expressão em k * var + c (k e c constantes).
+    Devolve (k, c) ou None se a expressão não for linear em 'var'.
+    """
+    if expr.type == 'VariableAccess':
+        return (1, 0) if expr.leaf == var else None
+    if expr.type == 'IntegerConstant':
+        return (0, expr.leaf)
+    if expr.type == 'IndexCheck':
+        return linear_form(expr.children[0], var) # A verificação não altera o valor
+    if expr.type == 'UnaryOp' and expr.leaf == 'MINUS':
+        inner = linear_form(expr.children[0], var)
+        return (-inner[0], -inner[1]) if inner else None
+    if expr.type == 'BinaryOp' and expr.leaf in ('+', '-', '*'):
+        left = linear_form(expr.children[0], var)
+        right = linear_form(expr.children[1], var)
+        if not left or not right:
+            return None
+        if expr.leaf == '+':
+            return (left[0] + right[0], left[1] + right[1])
+        if expr.leaf == '-':
+            return (left[0] - right[0], left[1] - right[1])
+        if left[0] == 0:
+            return (left[1] * right[0], left[1] * right[1])
+        if right[0] == 0:
+            return (right[1] * left[0], right[1] * left[1])
+    return None
+
+def sum_terms(expr):
+    """Parcelas de uma soma (a + b + c -> [a, b, c])."""
+    if expr.type == 'BinaryOp' and expr.leaf == '+':
+        return sum_terms(expr.children[0]) + sum_terms(expr.children[1])
+    return [expr]
+
+def expr_key(expr):
+    """Chave estrutural (sem números de linha) para agrupar expressões iguais."""
+    return (expr.type, expr.leaf, tuple(expr_key(child) for child in expr.children))
+
+
+class InductionVariableReducer:
+    """
+    Redução de força de variáveis de indução derivadas.
+    Num ciclo FOR (ou WHILE com uma única atribuição 'i := i + c' no corpo),
+    os acessos a[k*i + c] recalculam o endereço em cada iteração (base,
+    índice, subtração do limite inferior e PADD). Cada par (array, k*i + c)
+    passa a ter um ponteiro '$ptrN', inicializado antes do ciclo com o
+    endereço do primeiro elemento (ElementAddress) e avançado k*passo
+    posições por iteração; os acessos tornam-se PointerAccess (PUSH + LOAD).
+    Nas strings o CHARAT precisa da string e de um índice, por isso o que se
+    mantém é o deslocamento já ajustado à base 0 ('$offN').
+    Só se cria uma temporária quando a poupança por iteração ultrapassa o
+    custo do avanço (ADVANCE_COST). Os ciclos interiores são tratados
+    primeiro: a inicialização dos seus ponteiros pode ser reduzida pelo
+    ciclo exterior (ex.: a[i*10 + j]). As parcelas do índice que o ciclo não
+    altera (como o i*s de um m[i, j] linearizado, no ciclo de j) juntam-se à
+    inicialização do ponteiro.
+    Com 'safe_only' (verificação de limites ativa) só se trocam por ponteiros
+    os acessos que a RangeAnalysis provou estarem dentro dos limites (todas as
+    dimensões, num array multidimensional), já que um ponteiro não tem índice
+    para verificar.
+    """
+    def __init__(self, safe_only=False):
+        self.safe_only = safe_only
+        self.count = 0 # Temporárias de indução criadas
+        self.loops = 0 # Ciclos reduzidos
+
+    def run(self, ast):
+        """Executa a passagem sobre todo o programa. Devolve True se algo mudou."""
+        before = self.count
+        info = ProgramInfo(ast)
+        self.call_writes = info.globals_written()
+        for scope in info.scopes():
+            self.scope = scope
+            self.clobbered = scope.call_clobbered(self.call_writes)
+            self.temps = 0
+            scope.block.children[2] = self.statement(scope.body)
+        return self.count != before
+
+    # Percurso (ciclos interiores primeiro)
+    def statement(self, node):
+        if node is None:
+            return node
+        for i, child in enumerate(node.children):
+            if isinstance(child, Node):
+                node.children[i] = self.statement(child)
+        if node.type == 'ForStatement':
+            return self.reduce_for(node)
+        if node.type == 'WhileStatement':
+            return self.reduce_while(node)
+        return node
+
+    def _writes(self, node, var):
+        """Número de instruções que escrevem 'var' (None se uma chamada ou um 'var' também a pode alterar)."""
+        if has_calls(node) and var in self.clobbered:
+            return None
+        if var in reference_args(node) or (self.scope.aliases({var}) - {var}) & assigned_vars(node):
+            return None
+        total = 0
+        for n in walk(node):
+            if n.type in ('AssignmentStatement', 'ForStatement') and n.children[0].leaf == var:
+                total += 1
+            elif n.type == 'ReadStatement':
+                total += sum(1 for target in n.children if target.leaf == var)
+        return total
+
+    def reduce_for(self, node):
+        var_node, start, limit, body = node.children
+        var = var_node.leaf
+        if self._writes(body, var) != 0 or has_calls(start):
+            return node
+        step = 1 if node.leaf == 'to' else -1
+
+        groups = self._groups(var, [(node, 3)], node)
+        inits, advances = self._materialize(groups, var, step, start)
+        if not inits:
+            return node
+        body = node.children[3]
+        stmts = body.children if body.type == 'CompoundStatement' else [body]
+        node.children[3] = Node('CompoundStatement', stmts + advances, lineno=body.lineno)
+        return Node('CompoundStatement', inits + [node], lineno=node.lineno)
+
+    def reduce_while(self, node):
+        body = node.children[1]
+        if body.type != 'CompoundStatement':
+            return node
+        inits = []
+        for stmt in list(body.children):
+            increment = self._increment(stmt)
+            if increment is None:
+                continue
+            var, amount = increment
+            if self._writes(node, var) != 1:
+                continue
+            groups = self._groups(var, [(node, 0), (node, 1)], node)
+            new_inits, advances = self._materialize(groups, var, amount, None)
+            if new_inits:
+                inits += new_inits
+                position = body.children.index(stmt) + 1
+                body.children[position:position] = advances
+        if not inits:
+            return node
+        return Node('CompoundStatement', inits + [node], lineno=node.lineno)
+
+    def _increment(self, stmt):
+        """(variável, c) se a instrução é 'v := v + c' (ou 'v := v - c'), senão None."""
+        if stmt.type != 'AssignmentStatement' or stmt.children[0].type != 'VariableAccess':
+            return None
+        var = stmt.children[0].leaf
+        if self.scope.lookup(var) != 'integer':
+            return None
+        form = linear_form(stmt.children[1], var)
+        if form is None or form[0] != 1 or form[1] == 0:
+            return None
+        return var, form[1]
+
+    # Acessos Candidatos
+    def _groups(self, var, roots, loop):
+        """
+        Agrupa os acessos indexados por e + k*var + c, com 'e' fixo no ciclo (ou
+        ausente): (nome, tipo, k, c, e) -> [(pai, índice)].
+        """
+        groups = {}
+        written = self.scope.aliases(assigned_vars(loop))
+        if has_calls(loop):
+            written |= self.clobbered
+
+        def visit(parent, index):
+            node = parent.children[index]
+            if not isinstance(node, Node):
+                return
+            if node.type in ('ArrayAccess', 'ElementAddress'):
+                form = self._index_form(node.children[0], var, written)
+                if form and form[0] != 0 and self._indexable(node):
+                    groups.setdefault((node.leaf, node.type) + form, []).append((parent, index))
+                    return
+            for i in range(len(node.children)):
+                visit(node, i)
+
+        for parent, index in roots:
+            visit(parent, index)
+        return groups
+
+    def _index_form(self, index, var, written):
+        """(k, c, chave das parcelas fixas ou None) se o índice é 'fixas + k*var + c', senão None."""
+        form = linear_form(index, var)
+        if form:
+            return form + (None,)
+        fixed, rest = [], []
+        for term in sum_terms(index):
+            names = used_vars(term)
+            if var not in names and not has_calls(term) and not (names & written):
+                fixed.append(term)
+            else:
+                rest.append(term)
+        if not fixed or not rest:
+            return None
+        form = rest[0]
+        for term in rest[1:]:
+            form = Node('BinaryOp', [form, term], '+')
+        form = linear_form(form, var)
+        if form is None:
+            return None
+        return form + (tuple(sorted(expr_key(term) for term in fixed)),)
+
+    def _indexable(self, node):
+        var_type = self.scope.lookup(node.leaf)
+        if var_type == 'string':
+            return node.type == 'ArrayAccess'
+        return isinstance(var_type, dict) and var_type.get('kind') == 'array'
+
+    def _address_cost(self, name, k, c, fixed):
+        """Instruções para calcular o endereço de name[e + k*i + c] sem ponteiro."""
+        var_type = self.scope.lookup(name)
+        lower = 1 if var_type == 'string' else var_type['range'][0]
+        index_cost = 1 if k == 1 else 3
+        if fixed:
+            index_cost += 2 * len(fixed) # Cada parcela fixa custa pelo menos um PUSH e um ADD
+        adjust_cost = 2 if c != lower else 0
+        if var_type == 'string':
+            return index_cost + adjust_cost # Só o índice; a string e o CHARAT ficam
+        return 3 + index_cost + adjust_cost + 1 # Base + índice + ajuste + PADD
+
+    # Criação das Temporárias
+    def _materialize(self, groups, var, step, start):
+        """
+        Cria as temporárias rentáveis. Devolve (inicializações antes do ciclo,
+        avanços a executar depois de cada atualização da variável de indução).
+        """
+        inits, advances = [], []
+        for (name, kind, k, c, fixed), sites in groups.items():
+            saving = (self._address_cost(name, k, c, fixed) - 1) * len(sites)
+            if saving <= ADVANCE_COST or not self._checked_safe(name, kind, sites):
+                continue
+            parent, index = sites[0]
+            lineno = parent.children[index].lineno
+            first_index = copy.deepcopy(parent.children[index].children[0])
+            if start is not None:
+                first_index = self._substitute(first_index, var, start)
+
+            is_string = self.scope.lookup(name) == 'string'
+            temp = self._new_temp(name, is_string)
+            if is_string:
+                # $off = índice - 1; o acesso fica s[$off + 1] e o +1 anula o ajuste do CHARAT
+                init_value = Node('BinaryOp', [first_index, make_int(1, lineno)], '-', lineno=lineno)
+                for parent, index in sites:
+                    parent.children[index].children[0] = Node(
+                        'BinaryOp', [Node('VariableAccess', [], temp, lineno=lineno), make_int(1, lineno)], '+',
+                        lineno=lineno)
+            else:
+                init_value = Node('ElementAddress', [first_index], name, lineno=lineno)
+                for parent, index in sites:
+                    if kind == 'ElementAddress':
+                        parent.children[index] = Node('VariableAccess', [], temp, lineno=lineno)
+                    else:
+                        parent.children[index] = Node('PointerAccess', [], temp, lineno=lineno)
+
+            inits.append(self._assign(temp, init_value, lineno))
+            advance = Node('BinaryOp', [Node('VariableAccess', [], temp, lineno=lineno), make_int(k * step, lineno)],
+                           '+', lineno=lineno)
+            advances.append(self._assign(temp, advance, lineno))
+            self.count += 1
+        if inits:
+            self.loops += 1
+        return inits, advances
+
+    def _checked_safe(self, name, kind, sites):
+        if not self.safe_only or kind != 'ArrayAccess' or self.scope.lookup(name) == 'string':
+            return True
+        return all(self._proven(parent.children[index]) for parent, index in sites)
+
+    def _proven(self, node):
+        """O acesso e cada dimensão do índice (IndexCheck) dispensam verificação."""
+        return getattr(node, 'safe_index', False) and \
+            all(getattr(n, 'safe_index', False) for n in walk(node.children[0]) if n.type == 'IndexCheck')
+
+    def _assign(self, temp, value, lineno):
+        return Node('AssignmentStatement', [Node('VariableAccess', [], temp, lineno=lineno), value], lineno=lineno)
+
+    def _substitute(self, node, var, replacement):
+        if node.type == 'VariableAccess' and node.leaf == var:
+            return copy.deepcopy(replacement)
+        for i, child in enumerate(node.children):
+            if isinstance(child, Node):
+                node.children[i] = self._substitute(child, var, replacement)
+        return node
+
+    def _new_temp(self, name, is_string):
+        while True:
+            self.temps += 1
+            temp = f'$off{self.temps}' if is_string else f'$ptr{self.temps}'
+            if temp not in self.scope.variables:
+                break
+        if is_string:
+            type_node = Node('BasicType', [], 'integer')
+        else:
+            array_type = self._array_type_node(name)
+            type_node = Node('PointerType', [array_type.children[0]])
+        self.scope.declare(temp, type_node)
+        return temp
+
+    def _array_type_node(self, name):
+        scope = self.scope
+        while name not in scope.type_nodes:
+            scope = scope.parent
+        return scope.type_nodes[name]
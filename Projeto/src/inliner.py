@@ -0,0 +1,274 @@
+import copy
+from parser import Node
+from astutils import walk, has_calls, used_vars, is_scalar, LOGICAL_OPS, BUILTIN_FUNCTIONS
+from callgraph import CallGraph
+from purity import PurityAnalysis
+from liveness import Liveness
+
+# Tamanho máximo (em nós da AST) do corpo de um subprograma para ser expandido
+DEFAULT_INLINE_BUDGET = 30
+
+
+class Inliner:
+    """
+    Expansão em linha (inlining) de funções e procedimentos pequenos e não
+    recursivos. Cada expansão copia o corpo do subprograma para o local da
+    chamada, renomeando parâmetros, locais e variável de retorno para
+    variáveis novas ('$nome_var_N') declaradas no escopo de quem chama. Os
+    argumentos passam a atribuições normais, ficando sujeitos à propagação
+    de constantes e à dobragem. Um parâmetro 'var' não precisa de cópia: é
+    renomeado para a variável passada como argumento.
+
+    Uma chamada de função dentro de uma expressão é avaliada antes da
+    instrução (e substituída pela variável de retorno), por isso só se
+    expande quando essa antecipação não muda a ordem observável dos efeitos.
+    """
+    def __init__(self, budget=DEFAULT_INLINE_BUDGET):
+        self.budget = budget
+        self.count = 0 # Chamadas expandidas
+        self.inlined = {} # Nome do subprograma -> número de expansões
+        self._fresh = 0
+
+    def run(self, ast):
+        """Executa a passagem sobre todo o programa. Devolve True se algo mudou."""
+        if self.budget <= 0:
+            return False
+        before = self.count
+        graph = CallGraph(ast)
+        self.info = graph.info
+        self.graph = graph
+        self.purity = PurityAnalysis(graph)
+        self.candidates = {name: scope for name, scope in self.info.subprograms.items()
+                           if self._is_candidate(scope)}
+        if not self.candidates:
+            return False
+
+        for scope in self.info.scopes():
+            self.scope = scope
+            self.new_vars = [] # (nome, nó de tipo) a declarar neste escopo
+            scope.block.children[2] = self.statement(scope.body)
+            for name, type_node in self.new_vars:
+                scope.declare(name, type_node)
+        return self.count != before
+
+    # Seleção de Candidatos
+    def _size(self, node):
+        return sum(1 for _ in walk(node))
+
+    def _is_candidate(self, scope):
+        if self.graph.is_recursive(scope.name):
+            return False
+        if self._size(scope.body) > self.budget:
+            return False
+        # Apenas escalares (e strings passadas por valor): arrays não se copiam,
+        # mas podem chegar por referência
+        for name, var_type in scope.variables.items():
+            if isinstance(var_type, dict) and name not in scope.references:
+                return False
+            if name not in scope.params and not is_scalar(var_type):
+                return False
+        return True
+
+    def _can_inline_into(self, callee):
+        """As globais usadas pelo subprograma não podem estar escondidas por locais de quem chama."""
+        if self.scope.is_global:
+            return True
+        free = used_vars(callee.body) - set(callee.variables)
+        return not (free & set(self.scope.variables))
+
+    def _callee(self, call):
+        if call.leaf.lower() in BUILTIN_FUNCTIONS:
+            return None
+        name = self.graph.resolve(call.leaf)
+        if name is None or name == self.scope.name:
+            return None
+        callee = self.candidates.get(name)
+        if callee is None or not self._can_inline_into(callee):
+            return None
+        # Um elemento de array passado por referência não tem nome para o qual renomear
+        args = call.children[0].children if call.children else []
+        if any(arg.type == 'VarArgument' and arg.children for arg in args):
+            return None
+        return callee
+
+    # Expansão
+    def _new_var(self, callee, name, type_node):
+        self._fresh += 1
+        fresh = f"${callee.name}_{name}_{self._fresh}"
+        self.new_vars.append((fresh, copy.deepcopy(type_node)))
+        return fresh
+
+    def expand(self, call, callee):
+        """
+        Gera as instruções que substituem a chamada.
+        Devolve (lista de instruções, nome da variável de retorno ou None).
+        """
+        self.count += 1
+        self.inlined[callee.name] = self.inlined.get(callee.name, 0) + 1
+        lineno = call.lineno
+        args = call.children[0].children if call.children else []
+        renames = {param: arg.leaf for param, arg in zip(callee.params, args) if param in callee.references}
+        for name in callee.variables:
+            if name not in callee.references:
+                renames[name] = self._new_var(callee, name, callee.type_nodes[name])
+
+        stmts = []
+        for param, arg in zip(callee.params, args):
+            if param in callee.references:
+                continue
+            target = Node('VariableAccess', [], renames[param], lineno=lineno)
+            stmts.append(Node('AssignmentStatement', [target, arg], lineno=lineno))
+
+        # Locais (e retorno) lidos antes de escritos começam a zero, como no PUSHN da frame
+        liveness = Liveness(callee)
+        live_entry = liveness.live_in(callee.body, liveness.exit_live())
+        for name in callee.variables:
+            if name in callee.params or name not in live_entry:
+                continue
+            zero = Node('BooleanConstant', [], 'false', lineno=lineno) if callee.variables[name] == 'boolean' \
+                else Node('IntegerConstant', [], 0, lineno=lineno)
+            target = Node('VariableAccess', [], renames[name], lineno=lineno)
+            stmts.append(Node('AssignmentStatement', [target, zero], lineno=lineno))
+
+        body = copy.deepcopy(callee.body)
+        for n in walk(body):
+            if n.type in ('VariableAccess', 'ArrayAccess', 'VarArgument') and n.leaf in renames:
+                n.leaf = renames[n.leaf]
+        stmts.append(body)
+
+        result = renames.get(callee.name) if callee.node.type == 'FunctionDeclaration' else None
+        return stmts, result
+
+    # Antecipação das chamadas de função
+    def hoist(self, expr, prelude, state):
+        """
+        Percorre a expressão pela ordem de avaliação e expande as chamadas que
+        podem ser antecipadas para 'prelude'. 'state' regista o que já foi
+        avaliado na instrução: 'empty' (nada) e 'pure' (nada com efeitos).
+        """
+        if expr is None:
+            return expr
+        if expr.type == 'FunctionCall':
+            snapshot = dict(state)
+            if expr.children:
+                args = expr.children[0].children
+                for i, arg in enumerate(args):
+                    args[i] = self.hoist(arg, prelude, state)
+            callee = self._callee(expr)
+            if callee and callee.node.type == 'FunctionDeclaration':
+                movable = snapshot['empty'] or (
+                    snapshot['pure'] and self.purity.is_pure(callee.name) and not has_calls(expr.children[0] if expr.children else None))
+                if movable:
+                    stmts, result = self.expand(expr, callee)
+                    prelude.extend(stmts)
+                    return Node('VariableAccess', [], result, lineno=expr.lineno)
+            if not self.purity.is_pure(self.graph.resolve(expr.leaf)) and expr.leaf.lower() not in BUILTIN_FUNCTIONS:
+                state['pure'] = False
+            state['empty'] = False
+            return expr
+
+        if expr.type == 'BinaryOp' and expr.leaf in LOGICAL_OPS:
+            # Curto-circuito: o operando direito só corre consoante o esquerdo,
+            # por isso as suas chamadas ficam no sítio (não se antecipam)
+            expr.children[0] = self.hoist(expr.children[0], prelude, state)
+            self._skip(expr.children[1], state)
+            return expr
+
+        for i, child in enumerate(expr.children):
+            expr.children[i] = self.hoist(child, prelude, state)
+        if expr.type in ('VariableAccess', 'ArrayAccess'):
+            state['empty'] = False
+        return expr
+
+    def _skip(self, expr, state):
+        """Regista em 'state' uma expressão que fica por avaliar no seu lugar."""
+        for n in walk(expr):
+            if n.type in ('VariableAccess', 'ArrayAccess', 'FunctionCall'):
+                state['empty'] = False
+            if n.type == 'FunctionCall' and n.leaf.lower() not in BUILTIN_FUNCTIONS \
+                    and not self.purity.is_pure(self.graph.resolve(n.leaf)):
+                state['pure'] = False
+
+    def _with_prelude(self, prelude, node):
+        if not prelude:
+            return node
+        stmts = prelude + ([node] if node is not None else [])
+        return Node('CompoundStatement', stmts, lineno=stmts[0].lineno)
+
+    # Visitor de Instruções
+    def statement(self, node):
+        if node is None:
+            return node
+        method = getattr(self, f'visit_{node.type}', None)
+        if method:
+            return method(node)
+        return node
+
+    def _new_state(self):
+        return {'empty': True, 'pure': True}
+
+    def visit_CompoundStatement(self, node):
+        node.children = [self.statement(child) for child in node.children]
+        return node
+
+    def visit_AssignmentStatement(self, node):
+        prelude, state = [], self._new_state()
+        target = node.children[0]
+        if target.type == 'ArrayAccess':
+            target.children[0] = self.hoist(target.children[0], prelude, state)
+        node.children[1] = self.hoist(node.children[1], prelude, state)
+        return self._with_prelude(prelude, node)
+
+    def visit_ExpressionStatement(self, node):
+        prelude = []
+        node.children[0] = self.hoist(node.children[0], prelude, self._new_state())
+        if prelude and not has_calls(node.children[0]):
+            return self._with_prelude(prelude, None) # O valor era descartado: basta o código expandido
+        return self._with_prelude(prelude, node)
+
+    def visit_WriteStatement(self, node):
+        prelude, state = [], self._new_state()
+        for i, expr in enumerate(node.children):
+            node.children[i] = self.hoist(expr, prelude, state)
+            state['empty'] = False # O argumento já foi escrito antes do seguinte
+        return self._with_prelude(prelude, node)
+
+    def visit_IfStatement(self, node):
+        prelude = []
+        node.children[0] = self.hoist(node.children[0], prelude, self._new_state())
+        for i in range(1, len(node.children)):
+            node.children[i] = self.statement(node.children[i])
+        return self._with_prelude(prelude, node)
+
+    def visit_CaseStatement(self, node):
+        # O seletor é avaliado uma vez, antes de escolher o ramo
+        prelude = []
+        node.children[0] = self.hoist(node.children[0], prelude, self._new_state())
+        for branch in node.children[1:]:
+            branch.children[-1] = self.statement(branch.children[-1])
+        return self._with_prelude(prelude, node)
+
+    def visit_WhileStatement(self, node):
+        # A condição é reavaliada em cada iteração: não se antecipa nada dela
+        node.children[1] = self.statement(node.children[1])
+        return node
+
+    def visit_ForStatement(self, node):
+        # Valor inicial e limite são avaliados uma vez, por esta ordem, antes do ciclo
+        prelude, state = [], self._new_state()
+        for i in (1, 2):
+            node.children[i] = self.hoist(node.children[i], prelude, state)
+        node.children[3] = self.statement(node.children[3])
+        return self._with_prelude(prelude, node)
+
+    def visit_ProcedureCall(self, node):
+        prelude, state = [], self._new_state()
+        if node.children:
+            args = node.children[0].children
+            for i, arg in enumerate(args):
+                args[i] = self.hoist(arg, prelude, state)
+        callee = self._callee(node)
+        if callee and callee.node.type == 'ProcedureDeclaration':
+            stmts, _ = self.expand(node, callee)
+            return self._with_prelude(prelude + stmts, None)
+        return self._with_prelude(prelude, node)
@@ -0,0 +1,352 @@
+"""
+Representação intermédia do código EWVM: instruções estruturadas agrupadas
+em blocos básicos, com sucessores explícitos (grafo de fluxo de controlo).
+"""
+
+# Efeito de cada instrução na pilha: (valores retirados, valores empilhados).
+# As instruções com argumento numérico variável (PUSHN, POP, DUP) são tratadas em stack_effect.
+STACK_EFFECTS = {
+    'PUSHI': (0, 1), 'PUSHS': (0, 1), 'PUSHG': (0, 1), 'PUSHL': (0, 1),
+    'PUSHFP': (0, 1), 'PUSHGP': (0, 1), 'PUSHA': (0, 1),
+    'STOREG': (1, 0), 'STOREL': (1, 0),
+    'LOAD': (1, 1), 'LOADN': (2, 1), 'STORE': (2, 0),
+    'ADD': (2, 1), 'SUB': (2, 1), 'MUL': (2, 1), 'DIV': (2, 1), 'MOD': (2, 1),
+    'EQUAL': (2, 1), 'INF': (2, 1), 'INFEQ': (2, 1), 'SUP': (2, 1), 'SUPEQ': (2, 1),
+    'AND': (2, 1), 'OR': (2, 1), 'NOT': (1, 1), 'PADD': (2, 1),
+    'CHECK': (1, 1), 'CHARAT': (2, 1), 'STRLEN': (1, 1), 'ATOI': (1, 1),
+    'READ': (0, 1), 'WRITEI': (1, 0), 'WRITES': (1, 0), 'WRITELN': (0, 0),
+    'JZ': (1, 0), 'JUMP': (0, 0), 'START': (0, 0), 'STOP': (0, 0), 'RETURN': (0, 0),
+    'CALL': (1, 0), 'ALLOC': (0, 1), 'ALLOCN': (1, 1), 'FREE': (1, 0),
+}
+JUMPS = ('JUMP', 'JZ')
+TERMINATORS = ('JUMP', 'RETURN', 'STOP')
+
+
+class IRError(Exception):
+    """O código gerado não passou na verificação da representação intermédia."""
+
+
+class Instruction:
+    """Uma instrução EWVM: código de operação e argumento (texto, ou None)."""
+    def __init__(self, op, arg=None):
+        self.op = op
+        self.arg = arg
+
+    @classmethod
+    def parse(cls, text):
+        parts = text.strip().split(None, 1)
+        return cls(parts[0].upper(), parts[1] if len(parts) > 1 else None)
+
+    @property
+    def target(self):
+        """Etiqueta de destino dos saltos (e do PUSHA)."""
+        return self.arg.strip() if self.op in JUMPS + ('PUSHA',) else None
+
+    @property
+    def int_arg(self):
+        return int(self.arg)
+
+    def stack_effect(self):
+        """(retirados, empilhados), ou None se a instrução não for conhecida."""
+        if self.op == 'PUSHN':
+            return (0, self.int_arg)
+        if self.op == 'POP':
+            return (self.int_arg, 0)
+        if self.op == 'DUP':
+            return (self.int_arg, 2 * self.int_arg)
+        return STACK_EFFECTS.get(self.op)
+
+    def __str__(self):
+        return self.op if self.arg is None else f"{self.op} {self.arg}"
+
+    def __repr__(self):
+        return f"Instruction({str(self)!r})"
+
+
+class BasicBlock:
+    """Sequência de instruções com uma só entrada (as etiquetas) e uma só saída (a última instrução)."""
+    def __init__(self, index, labels=None):
+        self.index = index
+        self.labels = labels or []
+        self.instructions = []
+        self.successors = [] # Blocos seguintes (salto e/ou continuação)
+        self.predecessors = []
+
+    @property
+    def name(self):
+        return f"B{self.index}"
+
+    @property
+    def last(self):
+        return self.instructions[-1] if self.instructions else None
+
+    @property
+    def falls_through(self):
+        return self.last is None or self.last.op not in TERMINATORS
+
+
+class ControlFlowGraph:
+    """
+    Grafo de fluxo de controlo construído a partir da lista de instruções do
+    CodeGenerator. Começa um bloco novo em cada etiqueta e depois de cada
+    salto, RETURN ou STOP; o CALL fica dentro do bloco (a execução continua
+    na instrução seguinte). As entradas são o primeiro bloco (programa
+    principal) e os blocos cuja etiqueta é usada por um PUSHA (subprogramas).
+    """
+    def __init__(self, blocks):
+        self.blocks = blocks
+        self.label_blocks = {label: block for block in blocks for label in block.labels}
+        self._link()
+
+    @classmethod
+    def build(cls, code):
+        blocks = []
+        current = None
+        for line in code:
+            line = line.strip()
+            if not line:
+                continue
+            if line.endswith(':'):
+                # Etiquetas seguidas juntam-se no mesmo bloco (ainda vazio)
+                if current is None or current.instructions:
+                    current = BasicBlock(len(blocks))
+                    blocks.append(current)
+                current.labels.append(line[:-1])
+                continue
+            if current is None:
+                current = BasicBlock(len(blocks))
+                blocks.append(current)
+            instr = Instruction.parse(line)
+            current.instructions.append(instr)
+            if instr.op in JUMPS + TERMINATORS:
+                current = None
+        return cls(blocks)
+
+    def _link(self):
+        for i, block in enumerate(self.blocks):
+            block.successors = []
+            last = block.last
+            if last is not None and last.op in JUMPS and last.target in self.label_blocks:
+                block.successors.append(self.label_blocks[last.target])
+            if block.falls_through and i + 1 < len(self.blocks):
+                block.successors.append(self.blocks[i + 1])
+        for block in self.blocks:
+            block.predecessors = []
+        for block in self.blocks:
+            for succ in block.successors:
+                if block not in succ.predecessors:
+                    succ.predecessors.append(block)
+
+    @property
+    def entries(self):
+        """Blocos de entrada: o programa principal e cada subprograma chamado (PUSHA)."""
+        entries = self.blocks[:1]
+        for block in self.blocks:
+            for instr in block.instructions:
+                target = self.label_blocks.get(instr.target) if instr.op == 'PUSHA' else None
+                if target is not None and target not in entries:
+                    entries.append(target)
+        return entries
+
+    def instructions(self):
+        for block in self.blocks:
+            yield from block.instructions
+
+    def __len__(self):
+        return sum(len(block.instructions) for block in self.blocks)
+
+    # Verificação
+    def verify(self):
+        """
+        Verifica a consistência do grafo e devolve a lista de erros encontrados:
+        etiquetas repetidas ou inexistentes, instruções desconhecidas, código
+        que cai para fora do programa e profundidades da pilha diferentes no
+        início de um bloco (ou abaixo do início do seu escopo). Pela convenção
+        de chamada, o subprograma deixa a pilha como a encontrou (chega ao
+        RETURN sem locais) e um CALL só retira o endereço.
+        """
+        errors = []
+        seen = set()
+        for block in self.blocks:
+            for label in block.labels:
+                if label in seen:
+                    errors.append(f"Etiqueta repetida: {label}")
+                seen.add(label)
+            for instr in block.instructions:
+                if instr.stack_effect() is None:
+                    errors.append(f"{block.name}: instrução desconhecida '{instr}'")
+                elif instr.target is not None and instr.target not in self.label_blocks:
+                    errors.append(f"{block.name}: etiqueta inexistente em '{instr}'")
+        if self.blocks and self.blocks[-1].falls_through:
+            errors.append(f"{self.blocks[-1].name}: o código termina sem STOP/RETURN/JUMP")
+        if not errors:
+            errors += self._verify_stack()
+        return errors
+
+    def _verify_stack(self):
+        errors = []
+        depth_in = {}
+        worklist = []
+        for entry in self.entries:
+            depth_in[entry] = 0
+            worklist.append(entry)
+        while worklist:
+            block = worklist.pop()
+            depth = depth_in[block]
+            for instr in block.instructions:
+                pops, pushes = instr.stack_effect()
+                if depth - pops < 0:
+                    errors.append(f"{block.name}: '{instr}' retira valores abaixo do início do escopo")
+                    return errors
+                if instr.op == 'RETURN' and depth != 0:
+                    errors.append(f"{block.name}: RETURN com {depth} valores do subprograma na pilha")
+                depth = depth - pops + pushes
+            for succ in block.successors:
+                if succ not in depth_in:
+                    depth_in[succ] = depth
+                    worklist.append(succ)
+                elif depth_in[succ] != depth:
+                    errors.append(f"{succ.name}: profundidade da pilha inconsistente "
+                                  f"({depth_in[succ]} vs {depth} vinda de {block.name})")
+        return errors
+
+    # Impressão e Emissão
+    def dump(self):
+        """Texto legível do grafo: cada bloco com as etiquetas, instruções e sucessores."""
+        lines = []
+        for block in self.blocks:
+            labels = f" ({', '.join(block.labels)})" if block.labels else ""
+            succs = ", ".join(succ.name for succ in block.successors) or "-"
+            lines.append(f"{block.name}{labels} -> {succs}")
+            for instr in block.instructions:
+                lines.append(f"    {instr}")
+        return "\n".join(lines)
+
+    def emit(self):
+        """Lista de linhas EWVM (o mesmo formato devolvido pelo CodeGenerator)."""
+        code = []
+        for block in self.blocks:
+            code += [f"{label}:" for label in block.labels]
+            code += [str(instr) for instr in block.instructions]
+        return code
+
+
+# Análises de Fluxo de Dados
+def solve(cfg, transfer, join, initial, forward=True):
+    """
+    Resolve um problema de fluxo de dados por lista de trabalho. 'transfer'
+    recebe (bloco, valor à entrada) e devolve o valor à saída (na direção da
+    análise); 'join' combina os valores dos vizinhos. Devolve (entrada, saída)
+    de cada bloco, no sentido da execução.
+    """
+    value_in = {block: initial for block in cfg.blocks}
+    value_out = {block: transfer(block, initial) for block in cfg.blocks}
+    worklist = list(cfg.blocks if forward else reversed(cfg.blocks))
+    while worklist:
+        block = worklist.pop(0)
+        neighbours = block.predecessors if forward else block.successors
+        incoming = [value_out[n] for n in neighbours]
+        value_in[block] = join(incoming) if incoming else initial
+        new_out = transfer(block, value_in[block])
+        if new_out != value_out[block]:
+            value_out[block] = new_out
+            for n in (block.successors if forward else block.predecessors):
+                if n not in worklist:
+                    worklist.append(n)
+    if forward:
+        return value_in, value_out
+    return value_out, value_in
+
+
+def reachable(cfg):
+    """Blocos alcançáveis a partir das entradas (programa principal e subprogramas chamados)."""
+    seen = set()
+    stack = list(cfg.entries)
+    while stack:
+        block = stack.pop()
+        if block in seen:
+            continue
+        seen.add(block)
+        stack.extend(block.successors)
+    return seen
+
+
+# Slot de variável usado/definido por uma instrução: ('G', n) global ou ('L', n) local/parâmetro
+def slot_of(instr):
+    if instr.op in ('PUSHG', 'STOREG'):
+        return ('G', instr.int_arg)
+    if instr.op in ('PUSHL', 'STOREL'):
+        return ('L', instr.int_arg)
+    return None
+
+# Instruções depois das quais qualquer slot pode ser lido (endereços calculados ou outro escopo)
+ALL_SLOTS = '*'
+
+
+def live_before(instr, live):
+    """Slots vivos antes de 'instr', dados os vivos depois dela (altera e devolve 'live')."""
+    slot = slot_of(instr)
+    if instr.op in ('STOREG', 'STOREL'):
+        live.discard(slot)
+    elif slot is not None:
+        live.add(slot)
+    elif instr.op in ('PUSHGP', 'PUSHFP', 'LOAD', 'LOADN', 'CALL', 'RETURN'):
+        live.add(ALL_SLOTS)
+    return live
+
+
+def liveness(cfg):
+    """
+    Slots vivos à entrada e à saída de cada bloco. Um acesso por endereço
+    (PUSHGP/PUSHFP seguidos de LOAD/STORE, ou um LOAD através do endereço
+    recebido num parâmetro 'var') ou um CALL pode ler qualquer slot; nesse
+    caso o conjunto contém ALL_SLOTS.
+    """
+    def transfer(block, live_out):
+        live = set(live_out)
+        for instr in reversed(block.instructions):
+            live_before(instr, live)
+        return frozenset(live)
+
+    def join(values):
+        return frozenset().union(*values)
+
+    return solve(cfg, transfer, join, frozenset(), forward=False)
+
+
+def constants_after(instr, previous, env):
+    """
+    Valores conhecidos dos slots depois de 'instr', dados os de antes (altera e
+    devolve 'env'); 'previous' é a instrução anterior no mesmo bloco.
+    """
+    if instr.op in ('STOREG', 'STOREL'):
+        slot = slot_of(instr)
+        if previous is not None and previous.op == 'PUSHI':
+            env[slot] = previous.int_arg
+        else:
+            env.pop(slot, None)
+    elif instr.op in ('STORE', 'CALL'):
+        env.clear()
+    return env
+
+
+def constants(cfg):
+    """
+    Propagação de constantes pelos slots: valor inteiro conhecido de cada
+    slot à entrada e à saída de cada bloco. Um slot só é conhecido se todos
+    os caminhos lhe atribuírem o mesmo PUSHI; escritas por endereço e
+    chamadas esquecem tudo.
+    """
+    def transfer(block, env):
+        env = dict(env)
+        previous = None
+        for instr in block.instructions:
+            constants_after(instr, previous, env)
+            previous = instr
+        return env
+
+    def join(values):
+        first, *rest = values
+        return {slot: value for slot, value in first.items() if all(v.get(slot) == value for v in rest)}
+
+    return solve(cfg, transfer, join, {}, forward=True)
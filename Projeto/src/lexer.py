@@ -5,6 +5,7 @@ reserved = {
     'program': 'PROGRAM',
     'begin': 'BEGIN',
     'end': 'END',
+    'const': 'CONST',
     'var': 'VAR',
     'integer': 'INTEGER',
     'boolean': 'BOOLEAN',
@@ -14,6 +15,7 @@ reserved = {
     'if': 'IF',
     'then': 'THEN',
     'else': 'ELSE',
+    'case': 'CASE',
     'while': 'WHILE',
     'do': 'DO',
     'for': 'FOR',
@@ -0,0 +1,125 @@
+from parser import Node
+from astutils import (ProgramInfo, assigned_vars, has_calls, is_scalar, is_int, same_expr,
+                      COMPARISON_OPS, LOGICAL_OPS, BUILTIN_FUNCTIONS)
+
+
+class LoopInvariantMover:
+    """
+    Movimento de código invariante em ciclos (LICM).
+    Uma expressão dentro de um WHILE/FOR é invariante se não tem chamadas e
+    nenhum dos seus operandos é alterado no ciclo (atribuições, READ, variável
+    de controlo e, havendo chamadas, as globais escritas pelos subprogramas;
+    com parâmetros 'var', também o que pode partilhar memória com isso).
+    As expressões invariantes maximais são calculadas uma vez antes do ciclo
+    para temporárias '$invN'. Os ciclos exteriores são tratados primeiro, para
+    que cada expressão saia para fora do ciclo mais exterior possível.
+    A expressão passa a ser avaliada mesmo que o ciclo não execute, por isso
+    só se movem expressões que não podem falhar (sem leituras de arrays e
+    com DIV/MOD apenas por constantes diferentes de zero).
+    """
+    def __init__(self):
+        self.count = 0 # Expressões movidas para fora dos ciclos
+
+    def run(self, ast):
+        """Executa a passagem sobre todo o programa. Devolve True se algo mudou."""
+        before = self.count
+        info = ProgramInfo(ast)
+        self.call_writes = info.globals_written()
+        for scope in info.scopes():
+            self.scope = scope
+            self.temps = 0
+            scope.block.children[2] = self.statement(scope.body)
+        return self.count != before
+
+    # Percurso das Instruções
+    def statement(self, node):
+        if node is None:
+            return node
+        if node.type in ('WhileStatement', 'ForStatement'):
+            return self.loop(node)
+        if node.type == 'CompoundStatement':
+            node.children = [self.statement(child) for child in node.children]
+        elif node.type == 'IfStatement':
+            for i in range(1, len(node.children)):
+                node.children[i] = self.statement(node.children[i])
+        elif node.type == 'CaseStatement':
+            for branch in node.children[1:]:
+                branch.children[-1] = self.statement(branch.children[-1])
+        return node
+
+    def loop(self, node):
+        self.assigned = self.scope.aliases(assigned_vars(node))
+        if has_calls(node):
+            self.assigned |= self.scope.call_clobbered(self.call_writes)
+
+        # Partes avaliadas em todas as iterações (o valor inicial e o limite do FOR ficam de fora)
+        self.hoisted = [] # (temporária, expressão)
+        if node.type == 'WhileStatement':
+            self._rewrite(node, [0, 1])
+            body_index = 1
+        else:
+            self._rewrite(node, [3])
+            body_index = 3
+        hoisted = self.hoisted
+
+        # Depois os ciclos interiores (cada um com o seu próprio conjunto alterado)
+        node.children[body_index] = self.statement(node.children[body_index])
+
+        if not hoisted:
+            return node
+        lineno = node.lineno
+        stmts = [Node('AssignmentStatement', [Node('VariableAccess', [], temp, lineno=lineno), expr], lineno=lineno)
+                 for temp, expr in hoisted]
+        return Node('CompoundStatement', stmts + [node], lineno=lineno)
+
+    # Invariância
+    def _invariant(self, expr):
+        if expr.type in ('IntegerConstant', 'BooleanConstant'):
+            return True
+        if expr.type == 'VariableAccess':
+            return expr.leaf not in self.assigned and is_scalar(self.scope.lookup(expr.leaf))
+        if expr.type == 'UnaryOp':
+            return self._invariant(expr.children[0])
+        if expr.type == 'BinaryOp':
+            if expr.leaf in ('DIV', 'MOD'):
+                right = expr.children[1]
+                if not is_int(right) or right.leaf == 0:
+                    return False
+            return all(self._invariant(child) for child in expr.children)
+        if expr.type == 'FunctionCall' and expr.leaf.lower() in BUILTIN_FUNCTIONS:
+            # length(s) de uma string que o ciclo não altera
+            args = expr.children[0].children if expr.children else []
+            return all(arg.type == 'VariableAccess' and arg.leaf not in self.assigned for arg in args)
+        return False
+
+    def _worth_hoisting(self, expr):
+        """Só compensa mover operações (uma variável ou constante já é um único PUSH)."""
+        if expr.type in ('BinaryOp', 'FunctionCall'):
+            return True
+        return expr.type == 'UnaryOp' and expr.children[0].type not in ('IntegerConstant', 'BooleanConstant', 'VariableAccess')
+
+    def _rewrite(self, node, indexes):
+        for i in indexes:
+            child = node.children[i]
+            if not isinstance(child, Node):
+                continue
+            if self._worth_hoisting(child) and self._invariant(child):
+                node.children[i] = Node('VariableAccess', [], self._temp_for(child), lineno=child.lineno)
+            else:
+                self._rewrite(child, range(len(child.children)))
+
+    def _temp_for(self, expr):
+        for temp, hoisted in self.hoisted:
+            if same_expr(hoisted, expr):
+                return temp
+        while True:
+            self.temps += 1
+            temp = f'$inv{self.temps}'
+            if temp not in self.scope.variables:
+                break
+        is_bool = (expr.type == 'BinaryOp' and expr.leaf in COMPARISON_OPS + LOGICAL_OPS) or \
+            (expr.type == 'UnaryOp' and expr.leaf == 'NOT')
+        self.scope.declare(temp, Node('BasicType', [], 'boolean' if is_bool else 'integer'))
+        self.hoisted.append((temp, expr))
+        self.count += 1
+        return temp
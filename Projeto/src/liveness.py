@@ -0,0 +1,144 @@
+from astutils import walk, has_calls, case_bodies, case_has_else
+
+
+class Liveness:
+    """
+    Análise de variáveis vivas sobre a AST estruturada de um escopo.
+    No programa principal seguem-se as globais; uma chamada torna vivas as
+    globais que algum subprograma lê (todas, sem informação do programa).
+    Dentro de um subprograma seguem-se apenas as variáveis locais (parâmetros,
+    locais e variável de retorno); as globais e os parâmetros 'var' (memória
+    de quem chama) são tratados como sempre vivos e nunca são analisados.
+    Um argumento 'var' conta como leitura: a chamada pode usar o valor.
+    """
+    def __init__(self, scope, info=None):
+        self.scope = scope
+        self.tracked = set(scope.variables) - scope.references
+        self.call_uses = set()
+        if scope.is_global:
+            self.call_uses = self.tracked if info is None else self._globals_read_by_calls(info)
+
+    def _globals_read_by_calls(self, info):
+        """Globais que algum subprograma pode ler (as restantes não ficam vivas numa chamada)."""
+        names = set()
+        for sub in info.subprograms.values():
+            for n in walk(sub.body):
+                if n.type in ('VariableAccess', 'ArrayAccess', 'VarArgument') and n.leaf not in sub.variables:
+                    names.add(n.leaf)
+        return names & self.tracked
+
+    def exit_live(self):
+        """Variáveis vivas no fim do corpo (o valor de retorno de uma função)."""
+        if self.scope.node.type == 'FunctionDeclaration':
+            return {self.scope.name}
+        return set()
+
+    def uses(self, expr):
+        """Variáveis seguidas lidas por uma expressão (ou lista de nós)."""
+        result = set()
+        nodes = expr if isinstance(expr, list) else [expr]
+        for node in nodes:
+            for n in walk(node):
+                if n.type in ('VariableAccess', 'ArrayAccess', 'VarArgument') and n.leaf in self.tracked:
+                    result.add(n.leaf)
+            if has_calls(node):
+                result |= self.call_uses
+        return result
+
+    def target_uses(self, target):
+        """Leituras feitas ao calcular o destino de uma escrita (o índice de a[i])."""
+        if target.type == 'ArrayAccess':
+            return self.uses(target.children[0])
+        return set()
+
+    def kills(self, target):
+        """Uma escrita só mata variáveis escalares (escrever a[i] não mata a)."""
+        if target.type == 'VariableAccess' and target.leaf in self.tracked:
+            return {target.leaf}
+        return set()
+
+    # Transferência para trás
+    def live_in(self, node, live_out):
+        if node is None:
+            return set(live_out)
+        method = getattr(self, f'_live_{node.type}', self._live_unknown)
+        return method(node, set(live_out))
+
+    def _live_unknown(self, node, live):
+        return live | self.tracked
+
+    def _live_Empty(self, node, live):
+        return live
+
+    def _live_CompoundStatement(self, node, live):
+        for child in reversed(node.children):
+            live = self.live_in(child, live)
+        return live
+
+    def _live_AssignmentStatement(self, node, live):
+        target, expr = node.children
+        live = live - self.kills(target)
+        return live | self.target_uses(target) | self.uses(expr)
+
+    def _live_ExpressionStatement(self, node, live):
+        return live | self.uses(node.children[0])
+
+    def _live_ReadStatement(self, node, live):
+        for var in reversed(node.children):
+            live = (live - self.kills(var)) | self.target_uses(var)
+        return live
+
+    def _live_WriteStatement(self, node, live):
+        return live | self.uses(node.children)
+
+    def _live_ProcedureCall(self, node, live):
+        return live | self.uses(node.children) | self.call_uses
+
+    def _live_IfStatement(self, node, live):
+        then_live = self.live_in(node.children[1], live)
+        else_live = self.live_in(node.children[2], live) if len(node.children) > 2 else live
+        return then_live | else_live | self.uses(node.children[0])
+
+    def _live_CaseStatement(self, node, live):
+        result = set() if case_has_else(node) else set(live)
+        for body in case_bodies(node):
+            result |= self.live_in(body, live)
+        return result | self.uses(node.children[0])
+
+    def _live_WhileStatement(self, node, live):
+        return self.loop_head(node, live)
+
+    def _live_ForStatement(self, node, live):
+        var = node.children[0].leaf
+        head = self.loop_head(node, live)
+        return (head - {var}) | self.uses(node.children[1]) | self.uses(node.children[2])
+
+    # Ciclos
+    def loop_head(self, node, live_out):
+        """
+        Conjunto vivo no topo do ciclo (ponto fixo).
+        While: o topo avalia a condição; o fim do corpo volta ao topo.
+        For: o topo compara a variável de controlo com o limite (avaliado uma
+        só vez, antes do ciclo); o corpo termina com o incremento da variável.
+        """
+        if node.type == 'WhileStatement':
+            head = set(live_out) | self.uses(node.children[0])
+            body = node.children[1]
+            extra = set()
+        else:
+            var = node.children[0].leaf
+            head = set(live_out) | ({var} & self.tracked)
+            body = node.children[3]
+            extra = {var} & self.tracked
+
+        while True:
+            new_head = head | self.live_in(body, head | extra)
+            if new_head == head:
+                return head
+            head = new_head
+
+    def body_live_out(self, node, head):
+        """Conjunto vivo no fim do corpo de um ciclo, dado o conjunto do topo."""
+        if node.type == 'ForStatement':
+            return head | ({node.children[0].leaf} & self.tracked)
+        return head
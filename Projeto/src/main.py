@@ -12,8 +12,14 @@ from rich import box
 from lexer import lexer, test_lexer
 from parser import parser, parse
 from semantic import SemanticAnalyzer
-from codegen import CodeGenerator
+from codegen import CodeGenerator, DEFAULT_HEAP_THRESHOLD
 from optimizer import Optimizer
+from inliner import DEFAULT_INLINE_BUDGET
+from unroll import DEFAULT_UNROLL_FACTOR
+from callgraph import CallGraph
+from memo import parse_memo_spec
+from peephole import PeepholeOptimizer
+from ir import ControlFlowGraph, IRError
 
 # Configuração do Tema Visual (Cores)
 custom_theme = Theme({
@@ -142,7 +148,7 @@ def compile_file(file_path, options):
 
             # Fase Semântica
             console.print("  [step]🧠 Verificando Semântica...[/]")
-            analyzer = SemanticAnalyzer()
+            analyzer = SemanticAnalyzer(bounds_check=options.bounds_check)
             is_valid, errors, warnings = analyzer.analyze(ast)
 
         # Mostrar Resultados Semânticos
@@ -157,20 +163,65 @@ def compile_file(file_path, options):
         else:
             console.print("     ✅[success] Semântica Válida[/]")
 
+        # Grafo de Chamadas (antes da otimização, para mostrar também o código morto)
+        if options.callgraph:
+            graph = CallGraph(ast)
+            graph.dump(options.callgraph)
+            console.print(f"     📈[info] Grafo de chamadas gravado em {options.callgraph}[/]")
+
         # Fase de Otimização
+        if options.no_opt and options.memo:
+            console.print("     ⚠️[warning] --memo ignorado: as otimizações estão desativadas (--no-opt)[/]")
         if not options.no_opt:
             with console.status("[bold magenta]A otimizar código...[/]", spinner="bouncingBall"):
-                opt = Optimizer()
+                opt = Optimizer(inline_budget=options.inline_budget, unroll_factor=options.unroll_factor,
+                                bounds_check=options.bounds_check, memo=options.memo)
                 ast = opt.optimize(ast)
+                if opt.memo.rejected:
+                    reasons = "\n".join(f"• {reason}" for reason in opt.memo.rejected)
+                    console.print(Panel(reasons, title="⚠️ [warning]Memoização recusada[/]", border_style="yellow"))
                 if opt.optimizations_count > 0:
                     console.print(f"     ⚡[bold yellow] Otimização:[/][success] {opt.optimizations_count} Simplificações[/]")
+                    for pass_name, total in opt.report.items():
+                        if total:
+                            console.print(f"        [info]• {pass_name}: {total}[/]")
+                    if opt.slots.merged:
+                        before = sum(frame[1] for frame in opt.slots.frames)
+                        after = sum(frame[2] for frame in opt.slots.frames)
+                        console.print(f"        [info]• Slots de variáveis: {before} → {after}[/]")
+                    if options.verbose:
+                        for scope_name, before, after in opt.slots.frames:
+                            if before != after:
+                                console.print(f"          [info]Slots de {scope_name}: {before} → {after}[/]")
+                        for rule, total in opt.algebra.fired.items():
+                            console.print(f"          [info]{rule} ({total}x)[/]")
+                        for name, total in opt.pure_calls.evaluated.items():
+                            console.print(f"          [info]Avaliada em compilação: {name} ({total}x)[/]")
+                        for name, lo, hi in opt.memo.memoized:
+                            console.print(f"          [info]Memoizada: {name} (argumentos {lo}..{hi})[/]")
+                        for name, total in opt.inliner.inlined.items():
+                            console.print(f"          [info]Expandido: {name} ({total}x)[/]")
+                        for line, var, trips, kind in opt.unroller.unrolled:
+                            console.print(f"          [info]Linha {line}: FOR {var} ({trips} iterações) desenrolado ({kind})[/]")
+                        for name in opt.removed_subprograms:
+                            console.print(f"          [info]Removido (nunca chamado): {name}[/]")
 
         # Fase da Geração de Código
         output_file = ""
         if not options.no_code:
             with console.status("[bold cyan]A gerar Assembly EWVM...[/]", spinner="earth"):
-                generator = CodeGenerator(analyzer.global_scope) 
+                generator = CodeGenerator(analyzer.global_scope, bounds_check=options.bounds_check,
+                                          heap_threshold=options.heap_threshold)
                 code = generator.generate(ast)
+                ir = generator.ir
+                peephole = None
+                if not options.no_opt:
+                    peephole = PeepholeOptimizer()
+                    code = peephole.run(code)
+                    ir = ControlFlowGraph.build(code)
+                    errors = ir.verify()
+                    if errors:
+                        raise IRError("Código inválido depois do peephole:\n" + "\n".join(errors))
                 
                 output_file = options.output
                 if not output_file:
@@ -189,6 +240,19 @@ def compile_file(file_path, options):
                         f.write(f"{instruction}\n")
             
             console.print(f"     ✅[success] Código Gerado com Sucesso![/]")
+            if peephole and peephole.count:
+                console.print(f"        [info]• Peephole: {peephole.count} instruções removidas[/]")
+                for rule, total in peephole.removed.items():
+                    if total or options.verbose:
+                        console.print(f"          [info]{rule}: {total} ({peephole.fired[rule]}x)[/]")
+            if options.ir:
+                console.print(Panel(ir.dump(), title=f"🧱 [bold]Blocos Básicos ({len(ir.blocks)})[/]",
+                                    border_style="cyan", expand=False))
+            if options.bounds_check:
+                console.print(f"        [info]• Verificações de limites: {generator.checks_emitted} emitidas, "
+                              f"{generator.checks_elided} eliminadas (índice provado seguro)[/]")
+            if generator.heap_allocated:
+                console.print(f"        [info]• Arrays no heap: {generator.heap_allocated}[/]")
             console.print("\n")
             
             # Visualização do Código Gerado
@@ -222,6 +286,13 @@ def compile_file(file_path, options):
             import traceback
             traceback.print_exc()
 
+def memo_spec(text):
+    """Tipo do argparse para --memo (as mensagens de erro vêm do parse_memo_spec)."""
+    try:
+        return parse_memo_spec(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
 def main():
     parser_args = argparse.ArgumentParser(
         description='Compilador Pascal Standard',
@@ -234,11 +305,24 @@ def main():
     group_debug = parser_args.add_argument_group('Debug e Visualização')
     group_debug.add_argument('-t', '--tokens-only', action='store_true', help='Mostra apenas os tokens (Lexer)')
     group_debug.add_argument('-a', '--ast-only', action='store_true', help='Mostra apenas a AST (Parser)')
+    group_debug.add_argument('--callgraph', metavar='FICHEIRO', help='Grava o grafo de chamadas (DOT, ou JSON se terminar em .json)')
+    group_debug.add_argument('--ir', action='store_true', help='Mostra a representação intermédia (blocos básicos e sucessores)')
     group_debug.add_argument('-v', '--verbose', action='store_true', help='Modo verboso (mostra código fonte e stack traces)')
     
     group_config = parser_args.add_argument_group('Configurações')
     group_config.add_argument('--no-code', action='store_true', help='Não gerar código final')
     group_config.add_argument('--no-opt', action='store_true', help='Desativar otimizações')
+    group_config.add_argument('--inline-budget', type=int, default=DEFAULT_INLINE_BUDGET, metavar='N',
+                              help=f'Tamanho máximo (nós da AST) dos subprogramas expandidos em linha (0 desativa, padrão {DEFAULT_INLINE_BUDGET})')
+    group_config.add_argument('--bounds-check', action='store_true',
+                              help='Verifica os índices dos arrays em execução (CHECK), exceto onde a análise de intervalos prova que são seguros')
+    group_config.add_argument('--heap-threshold', type=int, default=DEFAULT_HEAP_THRESHOLD, metavar='N',
+                              help=f'Arrays com mais de N elementos são alocados no heap em vez da pilha (padrão {DEFAULT_HEAP_THRESHOLD})')
+    group_config.add_argument('--unroll-factor', type=int, default=DEFAULT_UNROLL_FACTOR, metavar='N',
+                              help=f'Fator de desenrolamento parcial dos FOR com limites constantes (1 desativa, padrão {DEFAULT_UNROLL_FACTOR})')
+    
+    group_config.add_argument('--memo', type=memo_spec, action='append', default=[], metavar='NOME:LO..HI',
+                              help='Memoiza a função pura NOME (um parâmetro inteiro) com uma tabela para os argumentos LO..HI (repetível)')
     
     if len(sys.argv) == 1:
         parser_args.print_help()
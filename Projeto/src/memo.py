@@ -0,0 +1,155 @@
+import re
+from parser import Node
+from astutils import assigned_vars, make_int, make_bool
+from callgraph import CallGraph
+from purity import PurityAnalysis
+
+# Entradas máximas de uma tabela (cada função memoizada ocupa 2 * entradas slots globais)
+MAX_MEMO_ENTRIES = 10000
+
+_SPEC = re.compile(r'^\s*([A-Za-z_]\w*)\s*:\s*(-?\d+)\s*\.\.\s*(-?\d+)\s*$')
+
+
+def parse_memo_spec(text):
+    """
+    Interpreta 'nome:lo..hi' (ex.: 'fib:0..40'). Devolve (nome, lo, hi);
+    lança ValueError com a explicação se o formato ou o intervalo forem inválidos.
+    """
+    match = _SPEC.match(text)
+    if not match:
+        raise ValueError(f"'{text}' não tem o formato nome:lo..hi (ex.: fib:0..40)")
+    name, lo, hi = match.group(1), int(match.group(2)), int(match.group(3))
+    if lo > hi:
+        raise ValueError(f"intervalo vazio em '{text}' ({lo} > {hi})")
+    if hi - lo + 1 > MAX_MEMO_ENTRIES:
+        raise ValueError(f"intervalo demasiado grande em '{text}' (máximo {MAX_MEMO_ENTRIES} entradas)")
+    return name, lo, hi
+
+
+class Memoizer:
+    """
+    Memoização automática (opcional, --memo nome:lo..hi) de funções puras
+    com um único parâmetro inteiro. Para cada função aceite criam-se duas
+    tabelas globais indexadas pelo argumento: '$memo_f' com os resultados e
+    '$memo_f_ok' com a marca de entrada preenchida (o zero do PUSHN serve de
+    sentinela 'ainda não calculado'). O corpo passa a ser:
+
+        $hit := false;
+        if (n >= lo) and (n <= hi) then
+          if $memo_f_ok[n] then begin f := $memo_f[n]; $hit := true end;
+        if not $hit then begin
+          <corpo original>;
+          if (n >= lo) and (n <= hi) then begin $memo_f[n] := f; $memo_f_ok[n] := true end
+        end
+
+    Argumentos fora do intervalo declarado calculam-se sempre. Se o corpo
+    altera o parâmetro, a chave é guardada numa local ('$key') à entrada.
+    Só se aceitam funções avaliáveis (ver PurityAnalysis): com efeitos
+    colaterais ou dependência de globais, reutilizar o resultado mudaria o
+    comportamento do programa. As recusas ficam em 'rejected', com o motivo.
+    """
+    def __init__(self, specs=()):
+        self.specs = list(specs)
+        self.count = 0 # Funções memoizadas
+        self.memoized = [] # (nome, lo, hi)
+        self.rejected = [] # Mensagens com o motivo de cada recusa
+
+    def run(self, ast):
+        """Executa a passagem sobre todo o programa. Devolve True se algo mudou."""
+        if not self.specs:
+            return False
+        before = self.count
+        graph = CallGraph(ast)
+        purity = PurityAnalysis(graph)
+        info = graph.info
+        for spec_name, lo, hi in self.specs:
+            name = graph.resolve(spec_name)
+            reason = self._reject_reason(name, spec_name, info, purity)
+            if reason:
+                self.rejected.append(f"{spec_name}: {reason}")
+                continue
+            self._memoize(info.subprograms[name], info.main, lo, hi)
+            self.memoized.append((name, lo, hi))
+            self.count += 1
+        self.specs = [] # Aplica-se uma só vez
+        return self.count != before
+
+    def _reject_reason(self, name, spec_name, info, purity):
+        if name is None:
+            return f"não existe nenhuma função '{spec_name}'"
+        if any(done == name for done, _, _ in self.memoized):
+            return "já foi memoizada"
+        scope = info.subprograms[name]
+        if scope.node.type != 'FunctionDeclaration':
+            return f"'{name}' é um procedimento (não devolve valor para guardar)"
+        if len(scope.params) != 1 or scope.variables[scope.params[0]] != 'integer':
+            return "só se memoizam funções com exatamente um parâmetro inteiro"
+        if scope.variables[name] not in ('integer', 'boolean'):
+            return "o resultado tem de ser inteiro ou booleano"
+        if not purity.is_evaluable(name):
+            return (f"a função não é pura: {purity.explain(name)}; "
+                    "reutilizar resultados guardados mudaria o comportamento do programa")
+        return None
+
+    # Reescrita
+    def _memoize(self, scope, main, lo, hi):
+        name = scope.name
+        lineno = scope.node.lineno
+        param = scope.params[0]
+        results, filled = f'$memo_{name}', f'$memo_{name}_ok'
+        result_type = Node('BasicType', [], scope.variables[name])
+        main.declare(results, Node('ArrayType', [result_type], (lo, hi)))
+        main.declare(filled, Node('ArrayType', [Node('BasicType', [], 'boolean')], (lo, hi)))
+
+        def var(var_name):
+            return Node('VariableAccess', [], var_name, lineno=lineno)
+
+        def entry(array, key):
+            return Node('ArrayAccess', [var(key)], array, lineno=lineno)
+
+        def assign(target, value):
+            return Node('AssignmentStatement', [target, value], lineno=lineno)
+
+        def in_range(key):
+            return Node('BinaryOp', [
+                Node('BinaryOp', [var(key), make_int(lo, lineno)], '>=', lineno=lineno),
+                Node('BinaryOp', [var(key), make_int(hi, lineno)], '<=', lineno=lineno),
+            ], 'AND', lineno=lineno)
+
+        prologue = []
+        key = param
+        if param in assigned_vars(scope.body):
+            key = '$key'
+            scope.declare(key, Node('BasicType', [], 'integer'))
+            prologue.append(assign(var(key), var(param)))
+        hit = '$hit'
+        scope.declare(hit, Node('BasicType', [], 'boolean'))
+
+        lookup = Node('IfStatement', [
+            in_range(key),
+            Node('IfStatement', [
+                entry(filled, key),
+                Node('CompoundStatement', [
+                    assign(var(name), entry(results, key)),
+                    assign(var(hit), make_bool(True, lineno)),
+                ], lineno=lineno),
+            ], lineno=lineno),
+        ], lineno=lineno)
+        store = Node('IfStatement', [
+            in_range(key),
+            Node('CompoundStatement', [
+                assign(entry(results, key), var(name)),
+                assign(entry(filled, key), make_bool(True, lineno)),
+            ], lineno=lineno),
+        ], lineno=lineno)
+        body = scope.body
+        stmts = body.children if body.type == 'CompoundStatement' else [body]
+        compute = Node('IfStatement', [
+            Node('UnaryOp', [var(hit)], 'NOT', lineno=lineno),
+            Node('CompoundStatement', stmts + [store], lineno=lineno),
+        ], lineno=lineno)
+        scope.block.children[2] = Node('CompoundStatement', prologue + [
+            assign(var(hit), make_bool(False, lineno)),
+            lookup,
+            compute,
+        ], lineno=lineno)
@@ -1,94 +1,324 @@
 from parser import Node
+from astutils import constant_value, make_constant, eval_binary, is_int, is_bool, case_bodies, case_select, ARITHMETIC_OPS
+from algebraic import AlgebraicSimplifier
+from propagation import ConstantPropagator
+from deadstore import DeadStoreEliminator
+from callgraph import remove_unreachable
+from inliner import Inliner, DEFAULT_INLINE_BUDGET
+from tailcall import TailCallEliminator
+from licm import LoopInvariantMover
+from unroll import LoopUnroller, DEFAULT_UNROLL_FACTOR
+from cse import CommonSubexpressionEliminator
+from induction import InductionVariableReducer
+from purity import PureCallEvaluator
+from ranges import RangeAnalysis
+from slots import SlotAllocator
+from memo import Memoizer
+from astutils import is_pure
+
+# Limite de iterações do ciclo propagação -> dobragem
+MAX_PASSES = 10
 
 class Optimizer:
     """
     Realiza otimizações na AST antes da geração de código.
-    Estratégia: Constant Folding e Dead Code Elimination.
+    Estratégia: Avaliação de Funções Puras, Memoização (opcional), Eliminação de Chamadas em Cauda, Inlining, Constant Folding, Simplificação Algébrica, Propagação de
+    Constantes/Cópias, Dead Code Elimination, Dead Store Elimination, remoção
+    de subprogramas nunca chamados, Loop Unrolling, Loop-Invariant Code Motion,
+    Common Subexpression Elimination, redução de força das variáveis de indução
+    e partilha de slots entre variáveis com tempos de vida disjuntos.
     """
-    def __init__(self):
+    def __init__(self, inline_budget=DEFAULT_INLINE_BUDGET, unroll_factor=DEFAULT_UNROLL_FACTOR, bounds_check=False,
+                 memo=()):
         self.optimizations_count = 0
+        self.folded_count = 0 # Simplificações feitas pela dobragem de constantes/código morto
+        self.algebra = AlgebraicSimplifier()
+        self.propagator = ConstantPropagator(fold=self.fold)
+        self.dead_stores = DeadStoreEliminator()
+        self.inliner = Inliner(budget=inline_budget)
+        self.tail_calls = TailCallEliminator()
+        self.licm = LoopInvariantMover()
+        self.unroller = LoopUnroller(factor=unroll_factor)
+        self.cse = CommonSubexpressionEliminator()
+        self.bounds_check = bounds_check
+        self.induction = InductionVariableReducer(safe_only=bounds_check)
+        self.pure_calls = PureCallEvaluator()
+        self.slots = SlotAllocator()
+        self.memo = Memoizer(memo)
+        self.removed_subprograms = [] # Subprogramas inalcançáveis eliminados
+
+    @property
+    def report(self):
+        """Resumo das otimizações aplicadas (nome da passagem -> contagem)."""
+        return {
+            'Chamadas avaliadas em compilação': self.pure_calls.count,
+            'Funções memoizadas': self.memo.count,
+            'Chamadas em cauda eliminadas': self.tail_calls.count,
+            'Chamadas expandidas (inlining)': self.inliner.count,
+            'Dobragem de constantes': self.folded_count,
+            'Simplificação algébrica': self.algebra.count,
+            'Propagação de constantes/cópias': self.propagator.count,
+            'Armazenamentos mortos eliminados': self.dead_stores.stores_removed,
+            'Slots de memória libertados': self.dead_stores.slots_removed,
+            'Subprogramas removidos': len(self.removed_subprograms),
+            'Ciclos desenrolados': self.unroller.count,
+            'Expressões invariantes movidas': self.licm.count,
+            'Subexpressões comuns eliminadas': self.cse.count,
+            'Reavaliações evitadas (CSE)': self.cse.uses_removed,
+            'Variáveis de indução reduzidas': self.induction.count,
+            'Slots partilhados (tempos de vida disjuntos)': self.slots.merged,
+        }
+
+    def optimize(self, ast):
+        """
+        Pipeline de otimização: dobragem inicial, avaliação das chamadas puras
+        com argumentos constantes, memoização das funções pedidas, recursão em cauda, inlining e depois
+        propagação, dobragem, avaliação de chamadas, eliminação de
+        armazenamentos mortos e de subprogramas inalcançáveis até estabilizar. Segue-se o desenrolamento
+        dos FOR com limites constantes (e nova estabilização) e, no fim, o
+        movimento de invariantes para fora dos ciclos, a eliminação de
+        subexpressões comuns, a troca dos índices de arrays nos ciclos por
+        ponteiros que avançam a cada iteração e, por último, a partilha de
+        slots entre variáveis que nunca estão vivas ao mesmo tempo.
+        """
+        ast = self.fold(ast)
+        if not ast or ast.type != 'Program':
+            return ast
+
+        # Chamadas puras com argumentos literais (antes que o inlining as desfaça)
+        ast = self.evaluate_calls(ast)
+
+        # Memoização pedida (--memo): antes da recursão em cauda e do inlining mudarem o corpo
+        if self.memo.run(ast):
+            self.optimizations_count += self.memo.count
+
+        # Recursão em cauda vira ciclo (e o subprograma pode deixar de ser recursivo)
+        if self.tail_calls.run(ast):
+            self.optimizations_count += self.tail_calls.count
+
+        # Inlining primeiro: os argumentos expandidos alimentam a propagação
+        for _ in range(MAX_PASSES):
+            before = self.inliner.count
+            if not self.inliner.run(ast):
+                break
+            self.optimizations_count += self.inliner.count - before
+
+        ast = self.simplify(ast)
+
+        # Desenrolamento: as cópias com constantes voltam a passar pela propagação/dobragem
+        before = self.unroller.count
+        if self.unroller.run(ast):
+            self.optimizations_count += self.unroller.count - before
+            ast = self.simplify(self.fold(ast))
+
+        before = self.licm.count
+        if self.licm.run(ast):
+            self.optimizations_count += self.licm.count - before
+
+        before = self.cse.count
+        if self.cse.run(ast):
+            self.optimizations_count += self.cse.count - before
+
+        # Por último: introduz nós de ponteiros que as passagens anteriores não conhecem
+        if self.bounds_check:
+            RangeAnalysis().run(ast) # Os ponteiros só substituem acessos provados seguros
+        before = self.induction.count
+        if self.induction.run(ast):
+            self.optimizations_count += self.induction.count - before
 
-    def optimize(self, node):
+        # Depois de todas as temporárias terem sido criadas
+        before = self.slots.merged
+        if self.slots.run(ast):
+            self.optimizations_count += self.slots.merged - before
+        return ast
+
+    def simplify(self, ast):
+        """Propagação, dobragem e eliminação de código morto até estabilizar."""
+        for _ in range(MAX_PASSES):
+            before = self.propagator.count
+            changed = self.propagator.run(ast)
+            if changed:
+                self.optimizations_count += self.propagator.count - before
+                ast = self.fold(ast)
+
+            before = self.pure_calls.count
+            ast = self.evaluate_calls(ast)
+            changed = changed or self.pure_calls.count != before
+
+            before = self.dead_stores.stores_removed
+            if self.dead_stores.run(ast):
+                changed = True
+                self.optimizations_count += self.dead_stores.stores_removed - before
+                ast = self.fold(ast)
+
+            removed = remove_unreachable(ast)
+            if removed:
+                changed = True
+                self.removed_subprograms += removed
+                self.optimizations_count += len(removed)
+
+            if not changed:
+                break
+        return ast
+
+    def evaluate_calls(self, ast):
+        """Substitui chamadas puras com argumentos constantes pelo resultado (e dobra o que daí resulta)."""
+        before = self.pure_calls.count
+        if self.pure_calls.run(ast):
+            self.optimizations_count += self.pure_calls.count - before
+            ast = self.fold(ast)
+        return ast
+
+    def fold(self, node):
+        """Dobragem de constantes, regras algébricas e eliminação de ramos mortos (bottom-up)."""
         if not node or not isinstance(node, Node):
             return node
 
         # Otimizar filhos primeiro (Bottom-Up / Pós-Ordem)
         # Isto é crucial: garante que (2+3)+4 vira 5+4 e depois 9 numa só passagem recursiva.
         for i, child in enumerate(node.children):
-            node.children[i] = self.optimize(child)
+            node.children[i] = self.fold(child)
 
         # Tentar simplificar o nó atual com base nos filhos já otimizados
-        if node.type == 'BinaryOp':
-            return self.fold_binary_op(node)
-        elif node.type == 'UnaryOp':
-            return self.fold_unary_op(node)
+        if node.type in ('BinaryOp', 'UnaryOp'):
+            return self.simplify_expression(node)
+        elif node.type == 'IndexCheck':
+            return self.fold_index_check(node)
         elif node.type == 'IfStatement':
             return self.fold_if_statement(node)
+        elif node.type == 'CaseStatement':
+            return self.fold_case_statement(node)
+        elif node.type == 'WhileStatement':
+            return self.fold_while_statement(node)
+        elif node.type == 'ForStatement':
+            return self.fold_for_statement(node)
+
+        return node
 
+    def simplify_expression(self, node):
+        """Alterna dobragem de constantes e regras algébricas até estabilizar."""
+        while node.type in ('BinaryOp', 'UnaryOp'):
+            folded = self.fold_binary_op(node) if node.type == 'BinaryOp' else self.fold_unary_op(node)
+            if folded is not node:
+                node = folded
+                continue
+
+            rewritten = self.algebra.simplify(node)
+            if rewritten is node:
+                break
+            self.optimizations_count += 1
+            node = rewritten
         return node
 
+    def _count_fold(self):
+        self.folded_count += 1
+        self.optimizations_count += 1
+
     def fold_binary_op(self, node):
         """Tenta resolver operações binárias estáticas (ex: 3 + 4 -> 7)"""
         left = node.children[0]
         right = node.children[1]
         op = node.leaf
 
-        # Só otimiza se ambos os operandos forem constantes inteiras
-        if left.type == 'IntegerConstant' and right.type == 'IntegerConstant':
-            v1 = left.leaf
-            v2 = right.leaf
-            res = None
-
-            try:
-                if op == '+': res = v1 + v2
-                elif op == '-': res = v1 - v2
-                elif op == '*': res = v1 * v2
-                elif op == 'DIV': res = v1 // v2 # Divisão inteira
-                elif op == 'MOD': res = v1 % v2
-                # Otimização extra: Resolve comparação estática (ex: if 1=1)
-                elif op == '=': 
-                    self.optimizations_count += 1
-                    # Transforma a operação num nó booleano fixo
-                    return Node('BooleanConstant', [], 'true' if v1 == v2 else 'false', lineno=node.lineno)
-            except ZeroDivisionError:
-                return node # Se houver divisão por zero, deixa para o runtime ou ignora
-
-            if res is not None:
-                self.optimizations_count += 1
-                # Substitui a operação inteira pelo resultado
-                return Node('IntegerConstant', [], res, lineno=node.lineno)
+        # Só otimiza se ambos os operandos forem constantes do mesmo tipo
+        both_int = is_int(left) and is_int(right)
+        both_bool = is_bool(left) and is_bool(right)
+        if not (both_int or both_bool):
+            return node
+        # Aritmética só faz sentido sobre inteiros
+        if both_bool and op in ARITHMETIC_OPS:
+            return node
+
+        res = eval_binary(op, constant_value(left), constant_value(right))
+        if res is None:
+            return node # Se houver divisão por zero, deixa para o runtime
 
-        return node
+        self._count_fold()
+        # Substitui a operação inteira pelo resultado (comparações viram BooleanConstant)
+        return make_constant(res, lineno=node.lineno)
 
     def fold_unary_op(self, node):
-        """Simplifica unários (ex: -5 estático)"""
+        """Simplifica unários (ex: -5 estático, not true)"""
         child = node.children[0]
         op = node.leaf
 
         if child.type == 'IntegerConstant' and op == 'MINUS':
-            self.optimizations_count += 1
+            self._count_fold()
             return Node('IntegerConstant', [], -child.leaf, lineno=node.lineno)
-        
+        if child.type == 'BooleanConstant' and op == 'NOT':
+            self._count_fold()
+            return make_constant(not constant_value(child), lineno=node.lineno)
+
+        return node
+
+    def fold_index_check(self, node):
+        """Índice constante dentro da sua dimensão: a verificação é desnecessária."""
+        index = node.children[0]
+        lo, hi = node.leaf
+        if is_int(index) and lo <= index.leaf <= hi:
+            self._count_fold()
+            return index
         return node
 
     def fold_if_statement(self, node):
         """Eliminação de Código Morto em IFs"""
         cond = node.children[0]
-        
+
+        # IF sem nada para executar em nenhum dos ramos
+        branches = node.children[1:]
+        if is_pure(cond) and all(b.type == 'Empty' or (b.type == 'CompoundStatement' and not b.children)
+                                 for b in branches):
+            self._count_fold()
+            return Node('Empty', [], lineno=node.lineno)
+
         # Só otimiza se a condição for uma constante booleana conhecida
         if cond.type == 'BooleanConstant':
             val = str(cond.leaf).lower()
-            
+
             if val == 'true':
-                self.optimizations_count += 1
+                self._count_fold()
                 # Se é sempre True, substitui o IF inteiro pelo conteúdo do THEN
-                return node.children[1] 
+                return node.children[1]
             elif val == 'false':
-                self.optimizations_count += 1
+                self._count_fold()
                 # Se é sempre False, substitui pelo ELSE (se existir) ou remove tudo
                 if len(node.children) > 2:
-                    return node.children[2] 
+                    return node.children[2]
                 else:
                     return Node('Empty', [], lineno=node.lineno)
-                    
-        return node
\ No newline at end of file
+
+        return node
+
+    def fold_case_statement(self, node):
+        """Eliminação de Código Morto em CASEs (seletor constante ou nenhum ramo com instruções)"""
+        selector = node.children[0]
+        if is_pure(selector) and all(b.type == 'Empty' or (b.type == 'CompoundStatement' and not b.children)
+                                     for b in case_bodies(node)):
+            self._count_fold()
+            return Node('Empty', [], lineno=node.lineno)
+
+        if is_int(selector) or is_bool(selector):
+            self._count_fold()
+            # Fica só o ramo escolhido (ou nada, se nenhum rótulo corresponder e não houver ELSE)
+            body = case_select(node, int(constant_value(selector)))
+            return body if body is not None else Node('Empty', [], lineno=node.lineno)
+
+        return node
+
+    def fold_for_statement(self, node):
+        """Eliminação de FORs com limites constantes que nunca executam (fica só a atribuição inicial)"""
+        var, start, limit = node.children[:3]
+        if is_int(start) and is_int(limit):
+            never = start.leaf > limit.leaf if node.leaf == 'to' else start.leaf < limit.leaf
+            if never:
+                self._count_fold()
+                return Node('AssignmentStatement', [var, start], lineno=node.lineno)
+        return node
+
+    def fold_while_statement(self, node):
+        """Eliminação de ciclos cuja condição é sempre falsa"""
+        cond = node.children[0]
+        if is_bool(cond, False):
+            self._count_fold()
+            return Node('Empty', [], lineno=node.lineno)
+        return node
@@ -93,13 +93,32 @@ def p_program_block_simple(p):
 
 # Declarações
 def p_declarations(p):
-    '''declarations : VAR declaration_list
+    '''declarations : CONST constant_list VAR declaration_list
+                    | CONST constant_list
+                    | VAR declaration_list
                     | empty'''
-    if len(p) == 3:
+    # Filhos: ConstDeclaration... seguidos de Declaration...
+    if len(p) == 5:
+        p[0] = Node('Declarations', p[2] + p[4], lineno=p.lineno(1))
+    elif len(p) == 3:
         p[0] = Node('Declarations', p[2], lineno=p.lineno(1))
     else:
         p[0] = Node('Declarations', [])
 
+def p_constant_list(p):
+    '''constant_list : constant_list constant_declaration
+                     | constant_declaration'''
+    if len(p) == 3:
+        p[1].append(p[2])
+        p[0] = p[1]
+    else:
+        p[0] = [p[1]]
+
+def p_constant_declaration(p):
+    '''constant_declaration : ID EQUAL expression SEMICOLON'''
+    # O valor é calculado pelo analisador semântico (não ocupa memória na VM)
+    p[0] = Node('ConstDeclaration', [p[3]], p[1], lineno=p.lineno(1))
+
 def p_declaration_list(p):
     '''declaration_list : declaration_list declaration
                         | declaration'''
@@ -145,8 +164,27 @@ def p_type(p):
         p[0] = Node('BasicType', [], p[1].lower(), lineno=p.lineno(1))
 
 def p_array_type(p):
-    '''array_type : ARRAY LBRACKET INTEGER_CONST DOTDOT INTEGER_CONST RBRACKET OF type'''
-    p[0] = Node('ArrayType', [p[8]], (p[3], p[5]), lineno=p.lineno(1))
+    '''array_type : ARRAY LBRACKET subrange_list RBRACKET OF type'''
+    # array[a..b, c..d] of T é o mesmo que array[a..b] of array[c..d] of T
+    node = p[6]
+    for bounds in reversed(p[3]):
+        node = Node('ArrayType', [node], bounds, lineno=p.lineno(1))
+    p[0] = node
+
+def p_subrange_list(p):
+    '''subrange_list : subrange_list COMMA subrange
+                     | subrange'''
+    if len(p) == 4:
+        p[1].append(p[3])
+        p[0] = p[1]
+    else:
+        p[0] = [p[1]]
+
+def p_subrange(p):
+    '''subrange : expression DOTDOT expression'''
+    # Limites literais ficam já como inteiros; expressões com constantes
+    # (ex: 1..MAX+1) são resolvidas pelo analisador semântico
+    p[0] = tuple(b.leaf if b.type == 'IntegerConstant' else b for b in (p[1], p[3]))
 
 
 # Subprogramas
@@ -191,8 +229,13 @@ def p_parameter_list(p):
         p[0] = [p[1]]
 
 def p_parameter(p):
-    '''parameter : id_list COLON type'''
-    p[0] = Node('Parameter', [p[1], p[3]], None, lineno=p.lineno(2))
+    '''parameter : id_list COLON type
+                 | VAR id_list COLON type'''
+    # Parâmetros 'var' (leaf) recebem o endereço do argumento em vez de uma cópia
+    if len(p) == 5:
+        p[0] = Node('Parameter', [p[2], p[4]], 'var', lineno=p.lineno(3))
+    else:
+        p[0] = Node('Parameter', [p[1], p[3]], None, lineno=p.lineno(2))
 
 # Comandos (Statements) e Recuperação de Erro
 def p_compound_statement(p):
@@ -212,6 +255,7 @@ def p_statement_list(p):
 def p_statement(p):
     '''statement : assignment_statement
                  | if_statement
+                 | case_statement
                  | while_statement
                  | for_statement
                  | procedure_call
@@ -243,6 +287,69 @@ def p_if_statement(p):
     else:
         p[0] = Node('IfStatement', [p[2], p[4], p[6]], None, lineno=p.lineno(1))
 
+def p_case_statement(p):
+    '''case_statement : CASE expression OF case_list END
+                      | CASE expression OF case_list SEMICOLON END
+                      | CASE expression OF case_list ELSE statement_list END
+                      | CASE expression OF case_list SEMICOLON ELSE statement_list END'''
+    # Filhos: [Seletor, CaseBranch..., CaseElse (opcional)]
+    branches = p[4]
+    if len(p) >= 8:
+        else_body = Node('CompoundStatement', p[len(p) - 2], lineno=p.lineno(len(p) - 3))
+        branches = branches + [Node('CaseElse', [else_body], lineno=p.lineno(len(p) - 3))]
+    p[0] = Node('CaseStatement', [p[2]] + branches, None, lineno=p.lineno(1))
+
+def p_case_list(p):
+    '''case_list : case_list SEMICOLON case_branch
+                 | case_branch'''
+    if len(p) == 4:
+        p[1].append(p[3])
+        p[0] = p[1]
+    else:
+        p[0] = [p[1]]
+
+def p_case_branch(p):
+    '''case_branch : case_label_list COLON statement'''
+    p[0] = Node('CaseBranch', [Node('CaseLabels', p[1]), p[3]], None, lineno=p.lineno(2))
+
+def p_case_label_list(p):
+    '''case_label_list : case_label_list COMMA case_label
+                       | case_label'''
+    if len(p) == 4:
+        p[1].append(p[3])
+        p[0] = p[1]
+    else:
+        p[0] = [p[1]]
+
+def p_case_label(p):
+    '''case_label : case_constant
+                  | case_constant DOTDOT case_constant'''
+    if len(p) == 4:
+        p[0] = Node('CaseRange', [p[1], p[3]], None, lineno=p[1].lineno)
+    else:
+        p[0] = p[1]
+
+def p_case_constant(p):
+    '''case_constant : INTEGER_CONST
+                     | MINUS INTEGER_CONST
+                     | STRING_CONST
+                     | TRUE
+                     | FALSE
+                     | ID'''
+    if len(p) == 3:
+        p[0] = Node('IntegerConstant', [], -p[2], lineno=p.lineno(1))
+        return
+    token_type = p.slice[1].type
+    if token_type == 'INTEGER_CONST':
+        p[0] = Node('IntegerConstant', [], p[1], lineno=p.lineno(1))
+    elif token_type == 'STRING_CONST':
+        p[0] = Node('StringConstant', [], p[1], lineno=p.lineno(1))
+    elif token_type == 'ID':
+        # Nome de uma constante: substituído pelo valor na análise semântica
+        p[0] = Node('VariableAccess', [], p[1], lineno=p.lineno(1))
+    else:
+        p[0] = Node('BooleanConstant', [], p[1], lineno=p.lineno(1))
+
 def p_while_statement(p):
     '''while_statement : WHILE expression DO statement'''
     p[0] = Node('WhileStatement', [p[2], p[4]], None, lineno=p.lineno(1))
@@ -355,11 +462,14 @@ def p_function_call(p):
 
 def p_variable(p):
     '''variable : ID
-                | ID LBRACKET expression RBRACKET'''
+                | variable LBRACKET expression_list RBRACKET'''
     if len(p) == 2:
         p[0] = Node('VariableAccess', [], p[1], lineno=p.lineno(1))
     else:
-        p[0] = Node('ArrayAccess', [p[3]], p[1], lineno=p.lineno(1))
+        # m[i, j] e m[i][j] dão o mesmo nó: um índice por dimensão
+        p[1].type = 'ArrayAccess'
+        p[1].children += p[3]
+        p[0] = p[1]
 
 
 # Tratamento de Erros Globais
@@ -373,7 +483,7 @@ def p_error(p):
         if p.type == 'SEMICOLON':
             dica = "Dica: Pode ter esquecido um 'end' ou ter um ';' a mais."
         elif p.value == 'var':
-            dica = "Dica: Verifique a ordem das declarações (Program -> Function -> Var -> Begin)."
+            dica = "Dica: Verifique a ordem das declarações (Program -> Function -> Const -> Var -> Begin)."
         
         errors.append({
             'lineno': p.lineno,
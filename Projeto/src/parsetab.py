@@ -6,9 +6,9 @@ _tabversion = '3.10'
 
 _lr_method = 'LALR'
 
-_lr_signature = 'programrightELSErightASSIGNnonassocEQUALNOTEQUALLESSTHANLESSEQUALGREATERTHANGREATEREQUALleftORleftANDleftPLUSMINUSleftTIMESDIVIDEDIVMODrightNOTUMINUSAND ARRAY ASSIGN BEGIN BOOLEAN COLON COMMA DIV DIVIDE DO DOT DOTDOT DOWNTO ELSE END EQUAL FALSE FOR FUNCTION GREATEREQUAL GREATERTHAN ID IF INTEGER INTEGER_CONST LBRACKET LESSEQUAL LESSTHAN LPAREN MINUS MOD NOT NOTEQUAL OF OR PLUS PROCEDURE PROGRAM RBRACKET READ READLN REAL_CONST RPAREN SEMICOLON STRING STRING_CONST THEN TIMES TO TRUE VAR WHILE WRITE WRITELNempty :program : PROGRAM ID SEMICOLON program_block DOTprogram_block : declarations function_declarations compound_statementprogram_block : function_declarations declarations compound_statementprogram_block : declarations compound_statementprogram_block : function_declarations compound_statementprogram_block : compound_statementdeclarations : VAR declaration_list\n| emptydeclaration_list : declaration_list declaration\n| declarationdeclaration : id_list COLON type SEMICOLONdeclaration : error SEMICOLONid_list : id_list COMMA ID\n| IDtype : INTEGER\n| BOOLEAN\n| STRING\n| array_typearray_type : ARRAY LBRACKET INTEGER_CONST DOTDOT INTEGER_CONST RBRACKET OF typefunction_declarations : function_declarations function_declaration\n| function_declarations procedure_declaration\n| function_declaration\n| procedure_declarationfunction_declaration : FUNCTION ID formal_parameters COLON type SEMICOLON block SEMICOLONprocedure_declaration : PROCEDURE ID formal_parameters SEMICOLON block SEMICOLONblock : declarations compound_statementformal_parameters : LPAREN parameter_list RPAREN\n| emptyparameter_list : parameter_list SEMICOLON parameter\n| parameterparameter : id_list COLON typecompound_statement : BEGIN statement_list ENDstatement_list : statement_list SEMICOLON statement\n| statementstatement : assignment_statement\n| if_statement\n| while_statement\n| for_statement\n| procedure_call\n| compound_statement\n| read_statement\n| write_statement\n| emptystatement : error SEMICOLONassignment_statement : variable ASSIGN expressionif_statement : IF expression THEN statement\n| IF expression THEN statement ELSE statementwhile_statement : WHILE expression DO statementfor_statement : FOR ID ASSIGN expression TO expression DO statement\n| FOR ID ASSIGN expression DOWNTO expression DO statementread_statement : READ LPAREN variable_list RPAREN\n| READLN LPAREN variable_list RPARENwrite_statement : WRITE LPAREN expression_list RPAREN\n| WRITELN LPAREN expression_list RPARENprocedure_call : ID LPAREN expression_list RPAREN\n| ID LPAREN RPARENvariable_list : variable_list COMMA variable\n| variableexpression_list : expression_list COMMA expression\n| expressionexpression : expression PLUS expression\n| expression MINUS expression\n| expression TIMES expression\n| expression DIVIDE expression\n| expression DIV expression\n| expression MOD expression\n| expression OR expression\n| expression AND expression\n| expression EQUAL expression\n| expression NOTEQUAL expression\n| expression LESSTHAN expression\n| expression GREATERTHAN expression\n| expression LESSEQUAL expression\n| expression GREATEREQUAL expressionexpression : NOT expression\n| MINUS expression %prec UMINUSexpression : LPAREN expression RPARENexpression : variable\n| INTEGER_CONST\n| REAL_CONST\n| STRING_CONST\n| function_call\n| TRUE\n| FALSEfunction_call : ID LPAREN expression_list RPAREN\n| ID LPAREN RPARENvariable : ID\n| ID LBRACKET expression RBRACKET'
+_lr_signature = 'programrightELSErightASSIGNnonassocEQUALNOTEQUALLESSTHANLESSEQUALGREATERTHANGREATEREQUALleftORleftANDleftPLUSMINUSleftTIMESDIVIDEDIVMODrightNOTUMINUSAND ARRAY ASSIGN BEGIN BOOLEAN CASE COLON COMMA CONST DIV DIVIDE DO DOT DOTDOT DOWNTO ELSE END EQUAL FALSE FOR FUNCTION GREATEREQUAL GREATERTHAN ID IF INTEGER INTEGER_CONST LBRACKET LESSEQUAL LESSTHAN LPAREN MINUS MOD NOT NOTEQUAL OF OR PLUS PROCEDURE PROGRAM RBRACKET READ READLN REAL_CONST RPAREN SEMICOLON STRING STRING_CONST THEN TIMES TO TRUE VAR WHILE WRITE WRITELNempty :program : PROGRAM ID SEMICOLON program_block DOTprogram_block : declarations function_declarations compound_statementprogram_block : function_declarations declarations compound_statementprogram_block : declarations compound_statementprogram_block : function_declarations compound_statementprogram_block : compound_statementdeclarations : CONST constant_list VAR declaration_list\n                    | CONST constant_list\n                    | VAR declaration_list\n                    | emptyconstant_list : constant_list constant_declaration\n                     | constant_declarationconstant_declaration : ID EQUAL expression SEMICOLONdeclaration_list : declaration_list declaration\n                        | declarationdeclaration : id_list COLON type SEMICOLONdeclaration : error SEMICOLONid_list : id_list COMMA ID\n               | IDtype : INTEGER\n            | BOOLEAN\n            | STRING\n            | array_typearray_type : ARRAY LBRACKET subrange_list RBRACKET OF typesubrange_list : subrange_list COMMA subrange\n                     | subrangesubrange : expression DOTDOT expressionfunction_declarations : function_declarations function_declaration\n                             | function_declarations procedure_declaration\n                             | function_declaration\n                             | procedure_declarationfunction_declaration : FUNCTION ID formal_parameters COLON type SEMICOLON block SEMICOLONprocedure_declaration : PROCEDURE ID formal_parameters SEMICOLON block SEMICOLONblock : declarations compound_statementformal_parameters : LPAREN parameter_list RPAREN\n                         | emptyparameter_list : parameter_list SEMICOLON parameter\n                      | parameterparameter : id_list COLON type\n                 | VAR id_list COLON typecompound_statement : BEGIN statement_list ENDstatement_list : statement_list SEMICOLON statement\n                      | statementstatement : assignment_statement\n                 | if_statement\n                 | case_statement\n                 | while_statement\n                 | for_statement\n                 | procedure_call\n                 | compound_statement\n                 | read_statement\n                 | write_statement\n                 | emptystatement : error SEMICOLONassignment_statement : variable ASSIGN expressionif_statement : IF expression THEN statement\n                    | IF expression THEN statement ELSE statementcase_statement : CASE expression OF case_list END\n                      | CASE expression OF case_list SEMICOLON END\n                      | CASE expression OF case_list ELSE statement_list END\n                      | CASE expression OF case_list SEMICOLON ELSE statement_list ENDcase_list : case_list SEMICOLON case_branch\n                 | case_branchcase_branch : case_label_list COLON statementcase_label_list : case_label_list COMMA case_label\n                       | case_labelcase_label : case_constant\n                  | case_constant DOTDOT case_constantcase_constant : INTEGER_CONST\n                     | MINUS INTEGER_CONST\n                     | STRING_CONST\n                     | TRUE\n                     | FALSE\n                     | IDwhile_statement : WHILE expression DO statementfor_statement : FOR ID ASSIGN expression TO expression DO statement\n                     | FOR ID ASSIGN expression DOWNTO expression DO statementread_statement : READ LPAREN variable_list RPAREN\n                      | READLN LPAREN variable_list RPARENwrite_statement : WRITE LPAREN expression_list RPAREN\n                       | WRITELN LPAREN expression_list RPARENprocedure_call : ID LPAREN expression_list RPAREN\n                      | ID LPAREN RPARENvariable_list : variable_list COMMA variable\n                      | variableexpression_list : expression_list COMMA expression\n                       | expressionexpression : expression PLUS expression\n                  | expression MINUS expression\n                  | expression TIMES expression\n                  | expression DIVIDE expression\n                  | expression DIV expression\n                  | expression MOD expression\n                  | expression OR expression\n                  | expression AND expression\n                  | expression EQUAL expression\n                  | expression NOTEQUAL expression\n                  | expression LESSTHAN expression\n                  | expression GREATERTHAN expression\n                  | expression LESSEQUAL expression\n                  | expression GREATEREQUAL expressionexpression : NOT expression\n                  | MINUS expression %prec UMINUSexpression : LPAREN expression RPARENexpression : variable\n                  | INTEGER_CONST\n                  | REAL_CONST\n                  | STRING_CONST\n                  | function_call\n                  | TRUE\n                  | FALSEfunction_call : ID LPAREN expression_list RPAREN\n                     | ID LPAREN RPARENvariable : ID\n                | variable LBRACKET expression_list RBRACKET'
     
-_lr_action_items = {'PROGRAM':([0,],[2,]),'$end':([1,16,],[0,-2,]),'ID':([2,9,13,14,15,23,24,41,42,43,53,55,56,58,60,62,63,64,75,76,77,78,79,80,82,94,95,96,97,98,99,100,101,102,103,104,105,106,107,108,112,113,114,130,153,156,162,167,169,170,184,185,],[3,27,44,49,50,27,-11,72,72,74,-10,91,-13,44,72,72,72,72,72,72,121,121,72,72,27,44,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,44,72,-12,72,121,27,44,72,72,44,44,]),'SEMICOLON':([3,13,26,28,29,30,31,32,33,34,35,36,37,38,39,50,57,58,59,65,66,67,68,69,70,71,72,83,84,85,86,87,88,89,92,93,94,109,110,113,116,126,127,132,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,150,152,154,155,157,158,159,160,161,164,167,168,174,175,177,179,182,184,185,188,189,191,],[4,-1,56,58,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,59,-1,-33,-1,-45,-79,-80,-81,-82,-83,-84,-85,-88,-29,129,130,-16,-17,-18,-19,-34,-46,-1,-77,-76,-1,-57,162,-31,-47,-62,-63,-64,-65,-66,-67,-68,-69,-70,-71,-72,-73,-74,-75,-78,-87,-49,-56,-89,-52,-53,-54,-55,173,-28,176,-1,-86,-30,-32,-27,-48,186,-1,-1,-50,-51,-20,]),'VAR':([4,7,11,12,21,22,129,173,176,186,],[9,9,-23,-24,-21,-22,9,9,-26,-25,]),'BEGIN':([4,6,7,10,11,12,13,17,19,21,22,23,24,53,56,58,94,113,129,130,165,167,173,176,184,185,186,],[13,13,13,-9,-23,-24,13,13,13,-21,-22,-8,-11,-10,-13,13,13,13,-1,-12,13,13,-1,-26,13,13,-25,]),'FUNCTION':([4,6,7,10,11,12,17,21,22,23,24,53,56,130,176,186,],[14,14,14,-9,-23,-24,14,-21,-22,-8,-11,-10,-13,-12,-26,-25,]),'PROCEDURE':([4,6,7,10,11,12,17,21,22,23,24,53,56,130,176,186,],[15,15,15,-9,-23,-24,15,-21,-22,-8,-11,-10,-13,-12,-26,-25,]),'DOT':([5,8,18,20,51,52,57,],[16,-7,-5,-6,-3,-4,-33,]),'error':([9,13,23,24,53,56,58,94,113,130,167,184,185,],[26,39,26,-11,-10,-13,39,39,39,-12,39,39,39,]),'IF':([13,58,94,113,167,184,185,],[41,41,41,41,41,41,41,]),'WHILE':([13,58,94,113,167,184,185,],[42,42,42,42,42,42,42,]),'FOR':([13,58,94,113,167,184,185,],[43,43,43,43,43,43,43,]),'READ':([13,58,94,113,167,184,185,],[45,45,45,45,45,45,45,]),'READLN':([13,58,94,113,167,184,185,],[46,46,46,46,46,46,46,]),'WRITE':([13,58,94,113,167,184,185,],[47,47,47,47,47,47,47,]),'WRITELN':([13,58,94,113,167,184,185,],[48,48,48,48,48,48,48,]),'END':([13,28,29,30,31,32,33,34,35,36,37,38,57,58,59,65,66,67,68,69,70,71,72,92,93,94,109,110,113,116,132,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,150,152,154,155,157,158,159,167,168,179,184,185,188,189,],[-1,57,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-33,-1,-45,-79,-80,-81,-82,-83,-84,-85,-88,-34,-46,-1,-77,-76,-1,-57,-47,-62,-63,-64,-65,-66,-67,-68,-69,-70,-71,-72,-73,-74,-75,-78,-87,-49,-56,-89,-52,-53,-54,-55,-1,-86,-48,-1,-1,-50,-51,]),'COLON':([25,27,49,81,83,91,128,161,],[54,-15,-1,125,-29,-14,163,-28,]),'COMMA':([25,27,65,66,67,68,69,70,71,72,91,109,110,115,117,119,120,121,122,123,124,128,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,148,149,154,168,171,172,],[55,-15,-79,-80,-81,-82,-83,-84,-85,-88,-14,-77,-76,153,-61,156,-59,-88,156,153,153,55,-62,-63,-64,-65,-66,-67,-68,-69,-70,-71,-72,-73,-74,-75,-78,153,-87,-89,-86,-60,-58,]),'ELSE':([30,31,32,33,34,35,36,37,38,57,59,65,66,67,68,69,70,71,72,93,94,109,110,113,116,132,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,150,152,154,155,157,158,159,167,168,179,184,185,188,189,],[-36,-37,-38,-39,-40,-41,-42,-43,-44,-33,-45,-79,-80,-81,-82,-83,-84,-85,-88,-46,-1,-77,-76,-1,-57,167,-62,-63,-64,-65,-66,-67,-68,-69,-70,-71,-72,-73,-74,-75,-78,-87,-49,-56,-89,-52,-53,-54,-55,-1,-86,-48,-1,-1,-50,-51,]),'ASSIGN':([40,44,74,154,],[60,-88,114,-89,]),'NOT':([41,42,60,62,63,64,75,76,79,80,95,96,97,98,99,100,101,102,103,104,105,106,107,108,112,114,153,169,170,],[63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,]),'MINUS':([41,42,60,61,62,63,64,65,66,67,68,69,70,71,72,73,75,76,79,80,93,95,96,97,98,99,100,101,102,103,104,105,106,107,108,109,110,111,112,114,117,118,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,153,154,168,169,170,171,180,181,],[62,62,62,96,62,62,62,-79,-80,-81,-82,-83,-84,-85,-88,96,62,62,62,62,96,62,62,62,62,62,62,62,62,62,62,62,62,62,62,-77,-76,96,62,62,96,96,-62,-63,-64,-65,-66,-67,96,96,96,96,96,96,96,96,-78,-87,96,62,-89,-86,62,62,96,96,96,]),'LPAREN':([41,42,44,45,46,47,48,49,50,60,62,63,64,72,75,76,79,80,95,96,97,98,99,100,101,102,103,104,105,106,107,108,112,114,153,169,170,],[64,64,75,77,78,79,80,82,82,64,64,64,64,112,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,]),'INTEGER_CONST':([41,42,60,62,63,64,75,76,79,80,95,96,97,98,99,100,101,102,103,104,105,106,107,108,112,114,131,153,169,170,178,],[66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,166,66,66,66,183,]),'REAL_CONST':([41,42,60,62,63,64,75,76,79,80,95,96,97,98,99,100,101,102,103,104,105,106,107,108,112,114,153,169,170,],[67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,]),'STRING_CONST':([41,42,60,62,63,64,75,76,79,80,95,96,97,98,99,100,101,102,103,104,105,106,107,108,112,114,153,169,170,],[68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,]),'TRUE':([41,42,60,62,63,64,75,76,79,80,95,96,97,98,99,100,101,102,103,104,105,106,107,108,112,114,153,169,170,],[70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,]),'FALSE':([41,42,60,62,63,64,75,76,79,80,95,96,97,98,99,100,101,102,103,104,105,106,107,108,112,114,153,169,170,],[71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,]),'LBRACKET':([44,72,90,121,],[76,76,131,76,]),'INTEGER':([54,125,163,190,],[86,86,86,86,]),'BOOLEAN':([54,125,163,190,],[87,87,87,87,]),'STRING':([54,125,163,190,],[88,88,88,88,]),'ARRAY':([54,125,163,190,],[90,90,90,90,]),'THEN':([61,65,66,67,68,69,70,71,72,109,110,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,154,168,],[94,-79,-80,-81,-82,-83,-84,-85,-88,-77,-76,-62,-63,-64,-65,-66,-67,-68,-69,-70,-71,-72,-73,-74,-75,-78,-87,-89,-86,]),'PLUS':([61,65,66,67,68,69,70,71,72,73,93,109,110,111,117,118,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,154,168,171,180,181,],[95,-79,-80,-81,-82,-83,-84,-85,-88,95,95,-77,-76,95,95,95,-62,-63,-64,-65,-66,-67,95,95,95,95,95,95,95,95,-78,-87,95,-89,-86,95,95,95,]),'TIMES':([61,65,66,67,68,69,70,71,72,73,93,109,110,111,117,118,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,154,168,171,180,181,],[97,-79,-80,-81,-82,-83,-84,-85,-88,97,97,-77,-76,97,97,97,97,97,-64,-65,-66,-67,97,97,97,97,97,97,97,97,-78,-87,97,-89,-86,97,97,97,]),'DIVIDE':([61,65,66,67,68,69,70,71,72,73,93,109,110,111,117,118,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,154,168,171,180,181,],[98,-79,-80,-81,-82,-83,-84,-85,-88,98,98,-77,-76,98,98,98,98,98,-64,-65,-66,-67,98,98,98,98,98,98,98,98,-78,-87,98,-89,-86,98,98,98,]),'DIV':([61,65,66,67,68,69,70,71,72,73,93,109,110,111,117,118,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,154,168,171,180,181,],[99,-79,-80,-81,-82,-83,-84,-85,-88,99,99,-77,-76,99,99,99,99,99,-64,-65,-66,-67,99,99,99,99,99,99,99,99,-78,-87,99,-89,-86,99,99,99,]),'MOD':([61,65,66,67,68,69,70,71,72,73,93,109,110,111,117,118,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,154,168,171,180,181,],[100,-79,-80,-81,-82,-83,-84,-85,-88,100,100,-77,-76,100,100,100,100,100,-64,-65,-66,-67,100,100,100,100,100,100,100,100,-78,-87,100,-89,-86,100,100,100,]),'OR':([61,65,66,67,68,69,70,71,72,73,93,109,110,111,117,118,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,154,168,171,180,181,],[101,-79,-80,-81,-82,-83,-84,-85,-88,101,101,-77,-76,101,101,101,-62,-63,-64,-65,-66,-67,-68,-69,101,101,101,101,101,101,-78,-87,101,-89,-86,101,101,101,]),'AND':([61,65,66,67,68,69,70,71,72,73,93,109,110,111,117,118,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,154,168,171,180,181,],[102,-79,-80,-81,-82,-83,-84,-85,-88,102,102,-77,-76,102,102,102,-62,-63,-64,-65,-66,-67,102,-69,102,102,102,102,102,102,-78,-87,102,-89,-86,102,102,102,]),'EQUAL':([61,65,66,67,68,69,70,71,72,73,93,109,110,111,117,118,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,154,168,171,180,181,],[103,-79,-80,-81,-82,-83,-84,-85,-88,103,103,-77,-76,103,103,103,-62,-63,-64,-65,-66,-67,-68,-69,None,None,None,None,None,None,-78,-87,103,-89,-86,103,103,103,]),'NOTEQUAL':([61,65,66,67,68,69,70,71,72,73,93,109,110,111,117,118,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,154,168,171,180,181,],[104,-79,-80,-81,-82,-83,-84,-85,-88,104,104,-77,-76,104,104,104,-62,-63,-64,-65,-66,-67,-68,-69,None,None,None,None,None,None,-78,-87,104,-89,-86,104,104,104,]),'LESSTHAN':([61,65,66,67,68,69,70,71,72,73,93,109,110,111,117,118,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,154,168,171,180,181,],[105,-79,-80,-81,-82,-83,-84,-85,-88,105,105,-77,-76,105,105,105,-62,-63,-64,-65,-66,-67,-68,-69,None,None,None,None,None,None,-78,-87,105,-89,-86,105,105,105,]),'GREATERTHAN':([61,65,66,67,68,69,70,71,72,73,93,109,110,111,117,118,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,154,168,171,180,181,],[106,-79,-80,-81,-82,-83,-84,-85,-88,106,106,-77,-76,106,106,106,-62,-63,-64,-65,-66,-67,-68,-69,None,None,None,None,None,None,-78,-87,106,-89,-86,106,106,106,]),'LESSEQUAL':([61,65,66,67,68,69,70,71,72,73,93,109,110,111,117,118,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,154,168,171,180,181,],[107,-79,-80,-81,-82,-83,-84,-85,-88,107,107,-77,-76,107,107,107,-62,-63,-64,-65,-66,-67,-68,-69,None,None,None,None,None,None,-78,-87,107,-89,-86,107,107,107,]),'GREATEREQUAL':([61,65,66,67,68,69,70,71,72,73,93,109,110,111,117,118,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,154,168,171,180,181,],[108,-79,-80,-81,-82,-83,-84,-85,-88,108,108,-77,-76,108,108,108,-62,-63,-64,-65,-66,-67,-68,-69,None,None,None,None,None,None,-78,-87,108,-89,-86,108,108,108,]),'DO':([65,66,67,68,69,70,71,72,73,109,110,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,154,168,180,181,],[-79,-80,-81,-82,-83,-84,-85,-88,113,-77,-76,-62,-63,-64,-65,-66,-67,-68,-69,-70,-71,-72,-73,-74,-75,-78,-87,-89,-86,184,185,]),'RPAREN':([65,66,67,68,69,70,71,72,75,86,87,88,89,109,110,111,112,115,117,119,120,121,122,123,124,126,127,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,148,149,154,168,171,172,174,175,191,],[-79,-80,-81,-82,-83,-84,-85,-88,116,-16,-17,-18,-19,-77,-76,147,149,152,-61,155,-59,-88,157,158,159,161,-31,-62,-63,-64,-65,-66,-67,-68,-69,-70,-71,-72,-73,-74,-75,-78,168,-87,-89,-86,-60,-58,-30,-32,-20,]),'RBRACKET':([65,66,67,68,69,70,71,72,109,110,118,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,154,168,183,],[-79,-80,-81,-82,-83,-84,-85,-88,-77,-76,154,-62,-63,-64,-65,-66,-67,-68,-69,-70,-71,-72,-73,-74,-75,-78,-87,-89,-86,187,]),'TO':([65,66,67,68,69,70,71,72,109,110,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,154,168,],[-79,-80,-81,-82,-83,-84,-85,-88,-77,-76,-62,-63,-64,-65,-66,-67,-68,-69,-70,-71,-72,-73,-74,-75,-78,-87,169,-89,-86,]),'DOWNTO':([65,66,67,68,69,70,71,72,109,110,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,154,168,],[-79,-80,-81,-82,-83,-84,-85,-88,-77,-76,-62,-63,-64,-65,-66,-67,-68,-69,-70,-71,-72,-73,-74,-75,-78,-87,170,-89,-86,]),'DOTDOT':([166,],[178,]),'OF':([187,],[190,]),}
+_lr_action_items = {'PROGRAM':([0,],[2,]),'$end':([1,17,],[0,-2,]),'ID':([2,9,10,14,15,16,24,25,27,28,46,47,48,49,59,60,61,62,64,65,67,69,70,72,73,74,86,87,88,89,90,92,95,108,109,110,111,112,113,114,115,116,117,118,119,120,121,122,126,127,128,129,142,144,145,146,148,182,188,197,200,201,202,203,204,206,207,216,217,220,235,236,],[3,26,31,50,55,56,26,-13,31,-16,82,82,82,85,31,-12,82,-15,103,-18,50,82,82,82,82,82,82,134,134,82,82,31,31,50,82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,177,50,82,31,-14,-17,82,82,134,31,50,177,50,50,177,177,82,82,82,82,50,50,50,]),'SEMICOLON':([3,14,30,32,33,34,35,36,37,38,39,40,41,42,43,44,56,66,67,68,75,76,77,78,79,80,81,82,93,94,96,97,98,99,100,101,104,105,108,123,124,128,131,139,140,147,149,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,166,167,168,178,180,181,183,184,185,186,187,191,197,198,199,201,202,210,211,214,218,219,220,221,222,223,228,229,233,234,235,236,238,239,240,241,],[4,-1,65,67,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,68,-1,-42,-1,-55,-106,-107,-108,-109,-110,-111,-112,-115,-37,143,144,145,-21,-22,-23,-24,-43,-56,-1,-104,-103,-1,-84,188,-39,-116,-57,-89,-90,-91,-92,-93,-94,-95,-96,-97,-98,-99,-100,-101,-102,-105,-114,200,-64,-76,-83,-79,-80,-81,-82,209,-36,213,-1,-113,-59,-1,-1,-38,-40,-35,-58,-60,-1,-63,67,-65,237,-41,67,-61,-1,-1,-25,-62,-77,-78,]),'CONST':([4,7,12,13,22,23,143,209,213,237,],[9,9,-31,-32,-29,-30,9,9,-34,-33,]),'VAR':([4,7,12,13,22,23,24,25,60,92,143,144,188,209,213,237,],[10,10,-31,-32,-29,-30,59,-13,-12,142,10,-14,142,10,-34,-33,]),'BEGIN':([4,6,7,11,12,13,14,18,20,22,23,24,25,27,28,60,62,65,67,95,108,128,143,144,145,192,197,201,202,209,213,220,235,236,237,],[14,14,14,-11,-31,-32,14,14,14,-29,-30,-9,-13,-10,-16,-12,-15,-18,14,-8,14,14,-1,-14,-17,14,14,14,14,-1,-34,14,14,14,-33,]),'FUNCTION':([4,6,7,11,12,13,18,22,23,24,25,27,28,60,62,65,95,144,145,213,237,],[15,15,15,-11,-31,-32,15,-29,-30,-9,-13,-10,-16,-12,-15,-18,-8,-14,-17,-34,-33,]),'PROCEDURE':([4,6,7,11,12,13,18,22,23,24,25,27,28,60,62,65,95,144,145,213,237,],[16,16,16,-11,-31,-32,16,-29,-30,-9,-13,-10,-16,-12,-15,-18,-8,-14,-17,-34,-33,]),'DOT':([5,8,19,21,57,58,66,],[17,-7,-5,-6,-3,-4,-42,]),'error':([10,14,27,28,59,62,65,67,95,108,128,145,197,201,202,220,235,236,],[30,44,30,-16,30,-15,-18,44,30,44,44,-17,44,44,44,44,44,44,]),'IF':([14,67,108,128,197,201,202,220,235,236,],[46,46,46,46,46,46,46,46,46,46,]),'CASE':([14,67,108,128,197,201,202,220,235,236,],[47,47,47,47,47,47,47,47,47,47,]),'WHILE':([14,67,108,128,197,201,202,220,235,236,],[48,48,48,48,48,48,48,48,48,48,]),'FOR':([14,67,108,128,197,201,202,220,235,236,],[49,49,49,49,49,49,49,49,49,49,]),'READ':([14,67,108,128,197,201,202,220,235,236,],[51,51,51,51,51,51,51,51,51,51,]),'READLN':([14,67,108,128,197,201,202,220,235,236,],[52,52,52,52,52,52,52,52,52,52,]),'WRITE':([14,67,108,128,197,201,202,220,235,236,],[53,53,53,53,53,53,53,53,53,53,]),'WRITELN':([14,67,108,128,197,201,202,220,235,236,],[54,54,54,54,54,54,54,54,54,54,]),'END':([14,32,33,34,35,36,37,38,39,40,41,42,43,66,67,68,75,76,77,78,79,80,81,82,104,105,108,123,124,128,131,147,149,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,166,167,168,178,180,181,183,184,185,197,198,199,200,201,202,218,219,220,221,222,223,233,234,235,236,239,240,241,],[-1,66,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-42,-1,-55,-106,-107,-108,-109,-110,-111,-112,-115,-43,-56,-1,-104,-103,-1,-84,-116,-57,-89,-90,-91,-92,-93,-94,-95,-96,-97,-98,-99,-100,-101,-102,-105,-114,199,-64,-76,-83,-79,-80,-81,-82,-1,-113,-59,219,-1,-1,-58,-60,-1,-63,234,-65,239,-61,-1,-1,-62,-77,-78,]),'EQUAL':([26,71,75,76,77,78,79,80,81,82,83,84,96,105,107,123,124,125,147,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,166,179,195,196,198,226,227,232,],[61,117,-106,-107,-108,-109,-110,-111,-112,-115,117,117,117,117,117,-104,-103,117,-116,-89,-90,-91,-92,-93,-94,-95,-96,None,None,None,None,None,None,-105,-114,117,117,117,-113,117,117,117,]),'COLON':([29,31,55,91,93,103,141,169,170,171,172,174,175,176,177,187,190,205,224,225,],[63,-20,-1,138,-37,-19,189,202,-67,-68,-70,-72,-73,-74,-75,-36,212,-71,-66,-69,]),'COMMA':([29,31,75,76,77,78,79,80,81,82,103,106,107,123,124,130,132,133,134,135,136,137,141,147,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,165,166,169,170,171,172,174,175,176,177,190,193,194,196,198,205,208,224,225,231,232,],[64,-20,-106,-107,-108,-109,-110,-111,-112,-115,-19,148,-88,-104,-103,148,182,-86,-115,182,148,148,64,-116,-89,-90,-91,-92,-93,-94,-95,-96,-97,-98,-99,-100,-101,-102,-105,148,-114,203,-67,-68,-70,-72,-73,-74,-75,64,216,-27,-87,-113,-71,-85,-66,-69,-26,-28,]),'ELSE':([34,35,36,37,38,39,40,41,42,43,66,68,75,76,77,78,79,80,81,82,105,108,123,124,128,131,147,149,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,166,167,168,178,180,181,183,184,185,197,198,199,200,202,218,219,221,223,234,235,236,239,240,241,],[-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-42,-55,-106,-107,-108,-109,-110,-111,-112,-115,-56,-1,-104,-103,-1,-84,-116,197,-89,-90,-91,-92,-93,-94,-95,-96,-97,-98,-99,-100,-101,-102,-105,-114,201,-64,-76,-83,-79,-80,-81,-82,-1,-113,-59,220,-1,-58,-60,-63,-65,-61,-1,-1,-62,-77,-78,]),'ASSIGN':([45,50,85,147,],[69,-115,129,-116,]),'LBRACKET':([45,50,75,82,102,133,134,147,208,],[70,-115,70,-115,146,70,-115,-116,70,]),'NOT':([46,47,48,61,69,70,72,73,74,86,89,90,109,110,111,112,113,114,115,116,117,118,119,120,121,122,126,129,146,148,206,207,216,217,],[73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,]),'MINUS':([46,47,48,61,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,86,89,90,96,105,107,109,110,111,112,113,114,115,116,117,118,119,120,121,122,123,124,125,126,127,129,146,147,148,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,166,179,195,196,198,200,203,204,206,207,216,217,226,227,232,],[72,72,72,72,72,72,110,72,72,72,-106,-107,-108,-109,-110,-111,-112,-115,110,110,72,72,72,110,110,110,72,72,72,72,72,72,72,72,72,72,72,72,72,72,-104,-103,110,72,173,72,72,-116,72,-89,-90,-91,-92,-93,-94,110,110,110,110,110,110,110,110,-105,-114,110,110,110,-113,173,173,173,72,72,72,72,110,110,110,]),'LPAREN':([46,47,48,50,51,52,53,54,55,56,61,69,70,72,73,74,82,86,89,90,109,110,111,112,113,114,115,116,117,118,119,120,121,122,126,129,146,148,206,207,216,217,],[74,74,74,86,87,88,89,90,92,92,74,74,74,74,74,74,126,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,]),'INTEGER_CONST':([46,47,48,61,69,70,72,73,74,86,89,90,109,110,111,112,113,114,115,116,117,118,119,120,121,122,126,127,129,146,148,173,200,203,204,206,207,216,217,],[76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,172,76,76,76,205,172,172,172,76,76,76,76,]),'REAL_CONST':([46,47,48,61,69,70,72,73,74,86,89,90,109,110,111,112,113,114,115,116,117,118,119,120,121,122,126,129,146,148,206,207,216,217,],[77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,]),'STRING_CONST':([46,47,48,61,69,70,72,73,74,86,89,90,109,110,111,112,113,114,115,116,117,118,119,120,121,122,126,127,129,146,148,200,203,204,206,207,216,217,],[78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,174,78,78,78,174,174,174,78,78,78,78,]),'TRUE':([46,47,48,61,69,70,72,73,74,86,89,90,109,110,111,112,113,114,115,116,117,118,119,120,121,122,126,127,129,146,148,200,203,204,206,207,216,217,],[80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,175,80,80,80,175,175,175,80,80,80,80,]),'FALSE':([46,47,48,61,69,70,72,73,74,86,89,90,109,110,111,112,113,114,115,116,117,118,119,120,121,122,126,127,129,146,148,200,203,204,206,207,216,217,],[81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,176,81,81,81,176,176,176,81,81,81,81,]),'INTEGER':([63,138,189,212,230,],[98,98,98,98,98,]),'BOOLEAN':([63,138,189,212,230,],[99,99,99,99,99,]),'STRING':([63,138,189,212,230,],[100,100,100,100,100,]),'ARRAY':([63,138,189,212,230,],[102,102,102,102,102,]),'THEN':([71,75,76,77,78,79,80,81,82,123,124,147,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,166,198,],[108,-106,-107,-108,-109,-110,-111,-112,-115,-104,-103,-116,-89,-90,-91,-92,-93,-94,-95,-96,-97,-98,-99,-100,-101,-102,-105,-114,-113,]),'PLUS':([71,75,76,77,78,79,80,81,82,83,84,96,105,107,123,124,125,147,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,166,179,195,196,198,226,227,232,],[109,-106,-107,-108,-109,-110,-111,-112,-115,109,109,109,109,109,-104,-103,109,-116,-89,-90,-91,-92,-93,-94,109,109,109,109,109,109,109,109,-105,-114,109,109,109,-113,109,109,109,]),'TIMES':([71,75,76,77,78,79,80,81,82,83,84,96,105,107,123,124,125,147,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,166,179,195,196,198,226,227,232,],[111,-106,-107,-108,-109,-110,-111,-112,-115,111,111,111,111,111,-104,-103,111,-116,111,111,-91,-92,-93,-94,111,111,111,111,111,111,111,111,-105,-114,111,111,111,-113,111,111,111,]),'DIVIDE':([71,75,76,77,78,79,80,81,82,83,84,96,105,107,123,124,125,147,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,166,179,195,196,198,226,227,232,],[112,-106,-107,-108,-109,-110,-111,-112,-115,112,112,112,112,112,-104,-103,112,-116,112,112,-91,-92,-93,-94,112,112,112,112,112,112,112,112,-105,-114,112,112,112,-113,112,112,112,]),'DIV':([71,75,76,77,78,79,80,81,82,83,84,96,105,107,123,124,125,147,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,166,179,195,196,198,226,227,232,],[113,-106,-107,-108,-109,-110,-111,-112,-115,113,113,113,113,113,-104,-103,113,-116,113,113,-91,-92,-93,-94,113,113,113,113,113,113,113,113,-105,-114,113,113,113,-113,113,113,113,]),'MOD':([71,75,76,77,78,79,80,81,82,83,84,96,105,107,123,124,125,147,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,166,179,195,196,198,226,227,232,],[114,-106,-107,-108,-109,-110,-111,-112,-115,114,114,114,114,114,-104,-103,114,-116,114,114,-91,-92,-93,-94,114,114,114,114,114,114,114,114,-105,-114,114,114,114,-113,114,114,114,]),'OR':([71,75,76,77,78,79,80,81,82,83,84,96,105,107,123,124,125,147,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,166,179,195,196,198,226,227,232,],[115,-106,-107,-108,-109,-110,-111,-112,-115,115,115,115,115,115,-104,-103,115,-116,-89,-90,-91,-92,-93,-94,-95,-96,115,115,115,115,115,115,-105,-114,115,115,115,-113,115,115,115,]),'AND':([71,75,76,77,78,79,80,81,82,83,84,96,105,107,123,124,125,147,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,166,179,195,196,198,226,227,232,],[116,-106,-107,-108,-109,-110,-111,-112,-115,116,116,116,116,116,-104,-103,116,-116,-89,-90,-91,-92,-93,-94,116,-96,116,116,116,116,116,116,-105,-114,116,116,116,-113,116,116,116,]),'NOTEQUAL':([71,75,76,77,78,79,80,81,82,83,84,96,105,107,123,124,125,147,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,166,179,195,196,198,226,227,232,],[118,-106,-107,-108,-109,-110,-111,-112,-115,118,118,118,118,118,-104,-103,118,-116,-89,-90,-91,-92,-93,-94,-95,-96,None,None,None,None,None,None,-105,-114,118,118,118,-113,118,118,118,]),'LESSTHAN':([71,75,76,77,78,79,80,81,82,83,84,96,105,107,123,124,125,147,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,166,179,195,196,198,226,227,232,],[119,-106,-107,-108,-109,-110,-111,-112,-115,119,119,119,119,119,-104,-103,119,-116,-89,-90,-91,-92,-93,-94,-95,-96,None,None,None,None,None,None,-105,-114,119,119,119,-113,119,119,119,]),'GREATERTHAN':([71,75,76,77,78,79,80,81,82,83,84,96,105,107,123,124,125,147,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,166,179,195,196,198,226,227,232,],[120,-106,-107,-108,-109,-110,-111,-112,-115,120,120,120,120,120,-104,-103,120,-116,-89,-90,-91,-92,-93,-94,-95,-96,None,None,None,None,None,None,-105,-114,120,120,120,-113,120,120,120,]),'LESSEQUAL':([71,75,76,77,78,79,80,81,82,83,84,96,105,107,123,124,125,147,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,166,179,195,196,198,226,227,232,],[121,-106,-107,-108,-109,-110,-111,-112,-115,121,121,121,121,121,-104,-103,121,-116,-89,-90,-91,-92,-93,-94,-95,-96,None,None,None,None,None,None,-105,-114,121,121,121,-113,121,121,121,]),'GREATEREQUAL':([71,75,76,77,78,79,80,81,82,83,84,96,105,107,123,124,125,147,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,166,179,195,196,198,226,227,232,],[122,-106,-107,-108,-109,-110,-111,-112,-115,122,122,122,122,122,-104,-103,122,-116,-89,-90,-91,-92,-93,-94,-95,-96,None,None,None,None,None,None,-105,-114,122,122,122,-113,122,122,122,]),'OF':([75,76,77,78,79,80,81,82,83,123,124,147,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,166,198,215,],[-106,-107,-108,-109,-110,-111,-112,-115,127,-104,-103,-116,-89,-90,-91,-92,-93,-94,-95,-96,-97,-98,-99,-100,-101,-102,-105,-114,-113,230,]),'DO':([75,76,77,78,79,80,81,82,84,123,124,147,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,166,198,226,227,],[-106,-107,-108,-109,-110,-111,-112,-115,128,-104,-103,-116,-89,-90,-91,-92,-93,-94,-95,-96,-97,-98,-99,-100,-101,-102,-105,-114,-113,235,236,]),'RBRACKET':([75,76,77,78,79,80,81,82,106,107,123,124,147,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,166,193,194,196,198,231,232,],[-106,-107,-108,-109,-110,-111,-112,-115,147,-88,-104,-103,-116,-89,-90,-91,-92,-93,-94,-95,-96,-97,-98,-99,-100,-101,-102,-105,-114,215,-27,-87,-113,-26,-28,]),'RPAREN':([75,76,77,78,79,80,81,82,86,98,99,100,101,107,123,124,125,126,130,132,133,134,135,136,137,139,140,147,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,165,166,196,198,208,210,211,229,238,],[-106,-107,-108,-109,-110,-111,-112,-115,131,-21,-22,-23,-24,-88,-104,-103,164,166,180,181,-86,-115,183,184,185,187,-39,-116,-89,-90,-91,-92,-93,-94,-95,-96,-97,-98,-99,-100,-101,-102,-105,198,-114,-87,-113,-85,-38,-40,-41,-25,]),'TO':([75,76,77,78,79,80,81,82,123,124,147,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,166,179,198,],[-106,-107,-108,-109,-110,-111,-112,-115,-104,-103,-116,-89,-90,-91,-92,-93,-94,-95,-96,-97,-98,-99,-100,-101,-102,-105,-114,206,-113,]),'DOWNTO':([75,76,77,78,79,80,81,82,123,124,147,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,166,179,198,],[-106,-107,-108,-109,-110,-111,-112,-115,-104,-103,-116,-89,-90,-91,-92,-93,-94,-95,-96,-97,-98,-99,-100,-101,-102,-105,-114,207,-113,]),'DOTDOT':([75,76,77,78,79,80,81,82,123,124,147,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,166,171,172,174,175,176,177,195,198,205,],[-106,-107,-108,-109,-110,-111,-112,-115,-104,-103,-116,-89,-90,-91,-92,-93,-94,-95,-96,-97,-98,-99,-100,-101,-102,-105,-114,204,-70,-72,-73,-74,-75,217,-113,-71,]),}
 
 _lr_action = {}
 for _k, _v in _lr_action_items.items():
@@ -17,7 +17,7 @@ for _k, _v in _lr_action_items.items():
       _lr_action[_x][_k] = _y
 del _lr_action_items
 
-_lr_goto_items = {'program':([0,],[1,]),'program_block':([4,],[5,]),'declarations':([4,7,129,173,],[6,19,165,165,]),'function_declarations':([4,6,],[7,17,]),'compound_statement':([4,6,7,13,17,19,58,94,113,165,167,184,185,],[8,18,20,35,51,52,35,35,35,177,35,35,35,]),'empty':([4,7,13,49,50,58,94,113,129,167,173,184,185,],[10,10,38,83,83,38,38,38,10,38,10,38,38,]),'function_declaration':([4,6,7,17,],[11,11,21,21,]),'procedure_declaration':([4,6,7,17,],[12,12,22,22,]),'declaration_list':([9,],[23,]),'declaration':([9,23,],[24,53,]),'id_list':([9,23,82,162,],[25,25,128,128,]),'statement_list':([13,],[28,]),'statement':([13,58,94,113,167,184,185,],[29,92,132,150,179,188,189,]),'assignment_statement':([13,58,94,113,167,184,185,],[30,30,30,30,30,30,30,]),'if_statement':([13,58,94,113,167,184,185,],[31,31,31,31,31,31,31,]),'while_statement':([13,58,94,113,167,184,185,],[32,32,32,32,32,32,32,]),'for_statement':([13,58,94,113,167,184,185,],[33,33,33,33,33,33,33,]),'procedure_call':([13,58,94,113,167,184,185,],[34,34,34,34,34,34,34,]),'read_statement':([13,58,94,113,167,184,185,],[36,36,36,36,36,36,36,]),'write_statement':([13,58,94,113,167,184,185,],[37,37,37,37,37,37,37,]),'variable':([13,41,42,58,60,62,63,64,75,76,77,78,79,80,94,95,96,97,98,99,100,101,102,103,104,105,106,107,108,112,113,114,153,156,167,169,170,184,185,],[40,65,65,40,65,65,65,65,65,65,120,120,65,65,40,65,65,65,65,65,65,65,65,65,65,65,65,65,65,65,40,65,65,172,40,65,65,40,40,]),'expression':([41,42,60,62,63,64,75,76,79,80,95,96,97,98,99,100,101,102,103,104,105,106,107,108,112,114,153,169,170,],[61,73,93,109,110,111,117,118,117,117,133,134,135,136,137,138,139,140,141,142,143,144,145,146,117,151,171,180,181,]),'function_call':([41,42,60,62,63,64,75,76,79,80,95,96,97,98,99,100,101,102,103,104,105,106,107,108,112,114,153,169,170,],[69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,]),'formal_parameters':([49,50,],[81,84,]),'type':([54,125,163,190,],[85,160,175,191,]),'array_type':([54,125,163,190,],[89,89,89,89,]),'expression_list':([75,79,80,112,],[115,123,124,148,]),'variable_list':([77,78,],[119,122,]),'parameter_list':([82,],[126,]),'parameter':([82,162,],[127,174,]),'block':([129,173,],[164,182,]),}
+_lr_goto_items = {'program':([0,],[1,]),'program_block':([4,],[5,]),'declarations':([4,7,143,209,],[6,20,192,192,]),'function_declarations':([4,6,],[7,18,]),'compound_statement':([4,6,7,14,18,20,67,108,128,192,197,201,202,220,235,236,],[8,19,21,40,57,58,40,40,40,214,40,40,40,40,40,40,]),'empty':([4,7,14,55,56,67,108,128,143,197,201,202,209,220,235,236,],[11,11,43,93,93,43,43,43,11,43,43,43,11,43,43,43,]),'function_declaration':([4,6,7,18,],[12,12,22,22,]),'procedure_declaration':([4,6,7,18,],[13,13,23,23,]),'constant_list':([9,],[24,]),'constant_declaration':([9,24,],[25,60,]),'declaration_list':([10,59,],[27,95,]),'declaration':([10,27,59,95,],[28,62,28,62,]),'id_list':([10,27,59,92,95,142,188,],[29,29,29,141,29,190,141,]),'statement_list':([14,201,220,],[32,222,233,]),'statement':([14,67,108,128,197,201,202,220,235,236,],[33,104,149,178,218,33,223,33,240,241,]),'assignment_statement':([14,67,108,128,197,201,202,220,235,236,],[34,34,34,34,34,34,34,34,34,34,]),'if_statement':([14,67,108,128,197,201,202,220,235,236,],[35,35,35,35,35,35,35,35,35,35,]),'case_statement':([14,67,108,128,197,201,202,220,235,236,],[36,36,36,36,36,36,36,36,36,36,]),'while_statement':([14,67,108,128,197,201,202,220,235,236,],[37,37,37,37,37,37,37,37,37,37,]),'for_statement':([14,67,108,128,197,201,202,220,235,236,],[38,38,38,38,38,38,38,38,38,38,]),'procedure_call':([14,67,108,128,197,201,202,220,235,236,],[39,39,39,39,39,39,39,39,39,39,]),'read_statement':([14,67,108,128,197,201,202,220,235,236,],[41,41,41,41,41,41,41,41,41,41,]),'write_statement':([14,67,108,128,197,201,202,220,235,236,],[42,42,42,42,42,42,42,42,42,42,]),'variable':([14,46,47,48,61,67,69,70,72,73,74,86,87,88,89,90,108,109,110,111,112,113,114,115,116,117,118,119,120,121,122,126,128,129,146,148,182,197,201,202,206,207,216,217,220,235,236,],[45,75,75,75,75,45,75,75,75,75,75,75,133,133,75,75,45,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,45,75,75,75,208,45,45,45,75,75,75,75,45,45,45,]),'expression':([46,47,48,61,69,70,72,73,74,86,89,90,109,110,111,112,113,114,115,116,117,118,119,120,121,122,126,129,146,148,206,207,216,217,],[71,83,84,96,105,107,123,124,125,107,107,107,150,151,152,153,154,155,156,157,158,159,160,161,162,163,107,179,195,196,226,227,195,232,]),'function_call':([46,47,48,61,69,70,72,73,74,86,89,90,109,110,111,112,113,114,115,116,117,118,119,120,121,122,126,129,146,148,206,207,216,217,],[79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,]),'formal_parameters':([55,56,],[91,94,]),'type':([63,138,189,212,230,],[97,186,211,229,238,]),'array_type':([63,138,189,212,230,],[101,101,101,101,101,]),'expression_list':([70,86,89,90,126,],[106,130,136,137,165,]),'variable_list':([87,88,],[132,135,]),'parameter_list':([92,],[139,]),'parameter':([92,188,],[140,210,]),'case_list':([127,],[167,]),'case_branch':([127,200,],[168,221,]),'case_label_list':([127,200,],[169,169,]),'case_label':([127,200,203,],[170,170,224,]),'case_constant':([127,200,203,204,],[171,171,171,225,]),'block':([143,209,],[191,228,]),'subrange_list':([146,],[193,]),'subrange':([146,216,],[194,231,]),}
 
 _lr_goto = {}
 for _k, _v in _lr_goto_items.items():
@@ -27,93 +27,120 @@ for _k, _v in _lr_goto_items.items():
 del _lr_goto_items
 _lr_productions = [
   ("S' -> program","S'",1,None,None,None),
-  ('empty -> <empty>','empty',0,'p_empty','parser.py',63),
-  ('program -> PROGRAM ID SEMICOLON program_block DOT','program',5,'p_program','parser.py',71),
-  ('program_block -> declarations function_declarations compound_statement','program_block',3,'p_program_block_vars_funcs','parser.py',79),
-  ('program_block -> function_declarations declarations compound_statement','program_block',3,'p_program_block_funcs_vars','parser.py',84),
-  ('program_block -> declarations compound_statement','program_block',2,'p_program_block_vars_only','parser.py',89),
-  ('program_block -> function_declarations compound_statement','program_block',2,'p_program_block_funcs_only','parser.py',94),
-  ('program_block -> compound_statement','program_block',1,'p_program_block_simple','parser.py',99),
-  ('declarations -> VAR declaration_list','declarations',2,'p_declarations','parser.py',108),
-  ('declarations -> empty','declarations',1,'p_declarations','parser.py',109),
-  ('declaration_list -> declaration_list declaration','declaration_list',2,'p_declaration_list','parser.py',116),
-  ('declaration_list -> declaration','declaration_list',1,'p_declaration_list','parser.py',117),
-  ('declaration -> id_list COLON type SEMICOLON','declaration',4,'p_declaration','parser.py',125),
-  ('declaration -> error SEMICOLON','declaration',2,'p_declaration_error','parser.py',131),
-  ('id_list -> id_list COMMA ID','id_list',3,'p_id_list','parser.py',137),
-  ('id_list -> ID','id_list',1,'p_id_list','parser.py',138),
-  ('type -> INTEGER','type',1,'p_type','parser.py',150),
-  ('type -> BOOLEAN','type',1,'p_type','parser.py',151),
-  ('type -> STRING','type',1,'p_type','parser.py',152),
-  ('type -> array_type','type',1,'p_type','parser.py',153),
-  ('array_type -> ARRAY LBRACKET INTEGER_CONST DOTDOT INTEGER_CONST RBRACKET OF type','array_type',8,'p_array_type','parser.py',160),
-  ('function_declarations -> function_declarations function_declaration','function_declarations',2,'p_function_declarations','parser.py',169),
-  ('function_declarations -> function_declarations procedure_declaration','function_declarations',2,'p_function_declarations','parser.py',170),
-  ('function_declarations -> function_declaration','function_declarations',1,'p_function_declarations','parser.py',171),
-  ('function_declarations -> procedure_declaration','function_declarations',1,'p_function_declarations','parser.py',172),
-  ('function_declaration -> FUNCTION ID formal_parameters COLON type SEMICOLON block SEMICOLON','function_declaration',8,'p_function_declaration','parser.py',180),
-  ('procedure_declaration -> PROCEDURE ID formal_parameters SEMICOLON block SEMICOLON','procedure_declaration',6,'p_procedure_declaration','parser.py',185),
-  ('block -> declarations compound_statement','block',2,'p_block','parser.py',190),
-  ('formal_parameters -> LPAREN parameter_list RPAREN','formal_parameters',3,'p_formal_parameters','parser.py',196),
-  ('formal_parameters -> empty','formal_parameters',1,'p_formal_parameters','parser.py',197),
-  ('parameter_list -> parameter_list SEMICOLON parameter','parameter_list',3,'p_parameter_list','parser.py',204),
-  ('parameter_list -> parameter','parameter_list',1,'p_parameter_list','parser.py',205),
-  ('parameter -> id_list COLON type','parameter',3,'p_parameter','parser.py',213),
-  ('compound_statement -> BEGIN statement_list END','compound_statement',3,'p_compound_statement','parser.py',221),
-  ('statement_list -> statement_list SEMICOLON statement','statement_list',3,'p_statement_list','parser.py',225),
-  ('statement_list -> statement','statement_list',1,'p_statement_list','parser.py',226),
-  ('statement -> assignment_statement','statement',1,'p_statement','parser.py',235),
-  ('statement -> if_statement','statement',1,'p_statement','parser.py',236),
-  ('statement -> while_statement','statement',1,'p_statement','parser.py',237),
-  ('statement -> for_statement','statement',1,'p_statement','parser.py',238),
-  ('statement -> procedure_call','statement',1,'p_statement','parser.py',239),
-  ('statement -> compound_statement','statement',1,'p_statement','parser.py',240),
-  ('statement -> read_statement','statement',1,'p_statement','parser.py',241),
-  ('statement -> write_statement','statement',1,'p_statement','parser.py',242),
-  ('statement -> empty','statement',1,'p_statement','parser.py',243),
-  ('statement -> error SEMICOLON','statement',2,'p_statement_error','parser.py',248),
-  ('assignment_statement -> variable ASSIGN expression','assignment_statement',3,'p_assignment_statement','parser.py',256),
-  ('if_statement -> IF expression THEN statement','if_statement',4,'p_if_statement','parser.py',260),
-  ('if_statement -> IF expression THEN statement ELSE statement','if_statement',6,'p_if_statement','parser.py',261),
-  ('while_statement -> WHILE expression DO statement','while_statement',4,'p_while_statement','parser.py',268),
-  ('for_statement -> FOR ID ASSIGN expression TO expression DO statement','for_statement',8,'p_for_statement','parser.py',272),
-  ('for_statement -> FOR ID ASSIGN expression DOWNTO expression DO statement','for_statement',8,'p_for_statement','parser.py',273),
-  ('read_statement -> READ LPAREN variable_list RPAREN','read_statement',4,'p_read_statement','parser.py',280),
-  ('read_statement -> READLN LPAREN variable_list RPAREN','read_statement',4,'p_read_statement','parser.py',281),
-  ('write_statement -> WRITE LPAREN expression_list RPAREN','write_statement',4,'p_write_statement','parser.py',285),
-  ('write_statement -> WRITELN LPAREN expression_list RPAREN','write_statement',4,'p_write_statement','parser.py',286),
-  ('procedure_call -> ID LPAREN expression_list RPAREN','procedure_call',4,'p_procedure_call','parser.py',290),
-  ('procedure_call -> ID LPAREN RPAREN','procedure_call',3,'p_procedure_call','parser.py',291),
-  ('variable_list -> variable_list COMMA variable','variable_list',3,'p_variable_list','parser.py',299),
-  ('variable_list -> variable','variable_list',1,'p_variable_list','parser.py',300),
-  ('expression_list -> expression_list COMMA expression','expression_list',3,'p_expression_list','parser.py',308),
-  ('expression_list -> expression','expression_list',1,'p_expression_list','parser.py',309),
-  ('expression -> expression PLUS expression','expression',3,'p_expression_binop','parser.py',321),
-  ('expression -> expression MINUS expression','expression',3,'p_expression_binop','parser.py',322),
-  ('expression -> expression TIMES expression','expression',3,'p_expression_binop','parser.py',323),
-  ('expression -> expression DIVIDE expression','expression',3,'p_expression_binop','parser.py',324),
-  ('expression -> expression DIV expression','expression',3,'p_expression_binop','parser.py',325),
-  ('expression -> expression MOD expression','expression',3,'p_expression_binop','parser.py',326),
-  ('expression -> expression OR expression','expression',3,'p_expression_binop','parser.py',327),
-  ('expression -> expression AND expression','expression',3,'p_expression_binop','parser.py',328),
-  ('expression -> expression EQUAL expression','expression',3,'p_expression_binop','parser.py',329),
-  ('expression -> expression NOTEQUAL expression','expression',3,'p_expression_binop','parser.py',330),
-  ('expression -> expression LESSTHAN expression','expression',3,'p_expression_binop','parser.py',331),
-  ('expression -> expression GREATERTHAN expression','expression',3,'p_expression_binop','parser.py',332),
-  ('expression -> expression LESSEQUAL expression','expression',3,'p_expression_binop','parser.py',333),
-  ('expression -> expression GREATEREQUAL expression','expression',3,'p_expression_binop','parser.py',334),
-  ('expression -> NOT expression','expression',2,'p_expression_unary','parser.py',338),
-  ('expression -> MINUS expression','expression',2,'p_expression_unary','parser.py',339),
-  ('expression -> LPAREN expression RPAREN','expression',3,'p_expression_group','parser.py',344),
-  ('expression -> variable','expression',1,'p_expression_simple','parser.py',348),
-  ('expression -> INTEGER_CONST','expression',1,'p_expression_simple','parser.py',349),
-  ('expression -> REAL_CONST','expression',1,'p_expression_simple','parser.py',350),
-  ('expression -> STRING_CONST','expression',1,'p_expression_simple','parser.py',351),
-  ('expression -> function_call','expression',1,'p_expression_simple','parser.py',352),
-  ('expression -> TRUE','expression',1,'p_expression_simple','parser.py',353),
-  ('expression -> FALSE','expression',1,'p_expression_simple','parser.py',354),
-  ('function_call -> ID LPAREN expression_list RPAREN','function_call',4,'p_function_call','parser.py',381),
-  ('function_call -> ID LPAREN RPAREN','function_call',3,'p_function_call','parser.py',382),
-  ('variable -> ID','variable',1,'p_variable','parser.py',389),
-  ('variable -> ID LBRACKET expression RBRACKET','variable',4,'p_variable','parser.py',390),
+  ('empty -> <empty>','empty',0,'p_empty','parser.py',59),
+  ('program -> PROGRAM ID SEMICOLON program_block DOT','program',5,'p_program','parser.py',64),
+  ('program_block -> declarations function_declarations compound_statement','program_block',3,'p_program_block_vars_funcs','parser.py',69),
+  ('program_block -> function_declarations declarations compound_statement','program_block',3,'p_program_block_funcs_vars','parser.py',74),
+  ('program_block -> declarations compound_statement','program_block',2,'p_program_block_vars_only','parser.py',79),
+  ('program_block -> function_declarations compound_statement','program_block',2,'p_program_block_funcs_only','parser.py',84),
+  ('program_block -> compound_statement','program_block',1,'p_program_block_simple','parser.py',89),
+  ('declarations -> CONST constant_list VAR declaration_list','declarations',4,'p_declarations','parser.py',96),
+  ('declarations -> CONST constant_list','declarations',2,'p_declarations','parser.py',97),
+  ('declarations -> VAR declaration_list','declarations',2,'p_declarations','parser.py',98),
+  ('declarations -> empty','declarations',1,'p_declarations','parser.py',99),
+  ('constant_list -> constant_list constant_declaration','constant_list',2,'p_constant_list','parser.py',109),
+  ('constant_list -> constant_declaration','constant_list',1,'p_constant_list','parser.py',110),
+  ('constant_declaration -> ID EQUAL expression SEMICOLON','constant_declaration',4,'p_constant_declaration','parser.py',118),
+  ('declaration_list -> declaration_list declaration','declaration_list',2,'p_declaration_list','parser.py',123),
+  ('declaration_list -> declaration','declaration_list',1,'p_declaration_list','parser.py',124),
+  ('declaration -> id_list COLON type SEMICOLON','declaration',4,'p_declaration','parser.py',132),
+  ('declaration -> error SEMICOLON','declaration',2,'p_declaration_error','parser.py',137),
+  ('id_list -> id_list COMMA ID','id_list',3,'p_id_list','parser.py',146),
+  ('id_list -> ID','id_list',1,'p_id_list','parser.py',147),
+  ('type -> INTEGER','type',1,'p_type','parser.py',157),
+  ('type -> BOOLEAN','type',1,'p_type','parser.py',158),
+  ('type -> STRING','type',1,'p_type','parser.py',159),
+  ('type -> array_type','type',1,'p_type','parser.py',160),
+  ('array_type -> ARRAY LBRACKET subrange_list RBRACKET OF type','array_type',6,'p_array_type','parser.py',167),
+  ('subrange_list -> subrange_list COMMA subrange','subrange_list',3,'p_subrange_list','parser.py',175),
+  ('subrange_list -> subrange','subrange_list',1,'p_subrange_list','parser.py',176),
+  ('subrange -> expression DOTDOT expression','subrange',3,'p_subrange','parser.py',184),
+  ('function_declarations -> function_declarations function_declaration','function_declarations',2,'p_function_declarations','parser.py',192),
+  ('function_declarations -> function_declarations procedure_declaration','function_declarations',2,'p_function_declarations','parser.py',193),
+  ('function_declarations -> function_declaration','function_declarations',1,'p_function_declarations','parser.py',194),
+  ('function_declarations -> procedure_declaration','function_declarations',1,'p_function_declarations','parser.py',195),
+  ('function_declaration -> FUNCTION ID formal_parameters COLON type SEMICOLON block SEMICOLON','function_declaration',8,'p_function_declaration','parser.py',203),
+  ('procedure_declaration -> PROCEDURE ID formal_parameters SEMICOLON block SEMICOLON','procedure_declaration',6,'p_procedure_declaration','parser.py',207),
+  ('block -> declarations compound_statement','block',2,'p_block','parser.py',211),
+  ('formal_parameters -> LPAREN parameter_list RPAREN','formal_parameters',3,'p_formal_parameters','parser.py',215),
+  ('formal_parameters -> empty','formal_parameters',1,'p_formal_parameters','parser.py',216),
+  ('parameter_list -> parameter_list SEMICOLON parameter','parameter_list',3,'p_parameter_list','parser.py',223),
+  ('parameter_list -> parameter','parameter_list',1,'p_parameter_list','parser.py',224),
+  ('parameter -> id_list COLON type','parameter',3,'p_parameter','parser.py',232),
+  ('parameter -> VAR id_list COLON type','parameter',4,'p_parameter','parser.py',233),
+  ('compound_statement -> BEGIN statement_list END','compound_statement',3,'p_compound_statement','parser.py',242),
+  ('statement_list -> statement_list SEMICOLON statement','statement_list',3,'p_statement_list','parser.py',246),
+  ('statement_list -> statement','statement_list',1,'p_statement_list','parser.py',247),
+  ('statement -> assignment_statement','statement',1,'p_statement','parser.py',256),
+  ('statement -> if_statement','statement',1,'p_statement','parser.py',257),
+  ('statement -> case_statement','statement',1,'p_statement','parser.py',258),
+  ('statement -> while_statement','statement',1,'p_statement','parser.py',259),
+  ('statement -> for_statement','statement',1,'p_statement','parser.py',260),
+  ('statement -> procedure_call','statement',1,'p_statement','parser.py',261),
+  ('statement -> compound_statement','statement',1,'p_statement','parser.py',262),
+  ('statement -> read_statement','statement',1,'p_statement','parser.py',263),
+  ('statement -> write_statement','statement',1,'p_statement','parser.py',264),
+  ('statement -> empty','statement',1,'p_statement','parser.py',265),
+  ('statement -> error SEMICOLON','statement',2,'p_statement_error','parser.py',270),
+  ('assignment_statement -> variable ASSIGN expression','assignment_statement',3,'p_assignment_statement','parser.py',279),
+  ('if_statement -> IF expression THEN statement','if_statement',4,'p_if_statement','parser.py',283),
+  ('if_statement -> IF expression THEN statement ELSE statement','if_statement',6,'p_if_statement','parser.py',284),
+  ('case_statement -> CASE expression OF case_list END','case_statement',5,'p_case_statement','parser.py',291),
+  ('case_statement -> CASE expression OF case_list SEMICOLON END','case_statement',6,'p_case_statement','parser.py',292),
+  ('case_statement -> CASE expression OF case_list ELSE statement_list END','case_statement',7,'p_case_statement','parser.py',293),
+  ('case_statement -> CASE expression OF case_list SEMICOLON ELSE statement_list END','case_statement',8,'p_case_statement','parser.py',294),
+  ('case_list -> case_list SEMICOLON case_branch','case_list',3,'p_case_list','parser.py',303),
+  ('case_list -> case_branch','case_list',1,'p_case_list','parser.py',304),
+  ('case_branch -> case_label_list COLON statement','case_branch',3,'p_case_branch','parser.py',312),
+  ('case_label_list -> case_label_list COMMA case_label','case_label_list',3,'p_case_label_list','parser.py',316),
+  ('case_label_list -> case_label','case_label_list',1,'p_case_label_list','parser.py',317),
+  ('case_label -> case_constant','case_label',1,'p_case_label','parser.py',325),
+  ('case_label -> case_constant DOTDOT case_constant','case_label',3,'p_case_label','parser.py',326),
+  ('case_constant -> INTEGER_CONST','case_constant',1,'p_case_constant','parser.py',333),
+  ('case_constant -> MINUS INTEGER_CONST','case_constant',2,'p_case_constant','parser.py',334),
+  ('case_constant -> STRING_CONST','case_constant',1,'p_case_constant','parser.py',335),
+  ('case_constant -> TRUE','case_constant',1,'p_case_constant','parser.py',336),
+  ('case_constant -> FALSE','case_constant',1,'p_case_constant','parser.py',337),
+  ('case_constant -> ID','case_constant',1,'p_case_constant','parser.py',338),
+  ('while_statement -> WHILE expression DO statement','while_statement',4,'p_while_statement','parser.py',354),
+  ('for_statement -> FOR ID ASSIGN expression TO expression DO statement','for_statement',8,'p_for_statement','parser.py',358),
+  ('for_statement -> FOR ID ASSIGN expression DOWNTO expression DO statement','for_statement',8,'p_for_statement','parser.py',359),
+  ('read_statement -> READ LPAREN variable_list RPAREN','read_statement',4,'p_read_statement','parser.py',366),
+  ('read_statement -> READLN LPAREN variable_list RPAREN','read_statement',4,'p_read_statement','parser.py',367),
+  ('write_statement -> WRITE LPAREN expression_list RPAREN','write_statement',4,'p_write_statement','parser.py',371),
+  ('write_statement -> WRITELN LPAREN expression_list RPAREN','write_statement',4,'p_write_statement','parser.py',372),
+  ('procedure_call -> ID LPAREN expression_list RPAREN','procedure_call',4,'p_procedure_call','parser.py',376),
+  ('procedure_call -> ID LPAREN RPAREN','procedure_call',3,'p_procedure_call','parser.py',377),
+  ('variable_list -> variable_list COMMA variable','variable_list',3,'p_variable_list','parser.py',385),
+  ('variable_list -> variable','variable_list',1,'p_variable_list','parser.py',386),
+  ('expression_list -> expression_list COMMA expression','expression_list',3,'p_expression_list','parser.py',394),
+  ('expression_list -> expression','expression_list',1,'p_expression_list','parser.py',395),
+  ('expression -> expression PLUS expression','expression',3,'p_expression_binop','parser.py',404),
+  ('expression -> expression MINUS expression','expression',3,'p_expression_binop','parser.py',405),
+  ('expression -> expression TIMES expression','expression',3,'p_expression_binop','parser.py',406),
+  ('expression -> expression DIVIDE expression','expression',3,'p_expression_binop','parser.py',407),
+  ('expression -> expression DIV expression','expression',3,'p_expression_binop','parser.py',408),
+  ('expression -> expression MOD expression','expression',3,'p_expression_binop','parser.py',409),
+  ('expression -> expression OR expression','expression',3,'p_expression_binop','parser.py',410),
+  ('expression -> expression AND expression','expression',3,'p_expression_binop','parser.py',411),
+  ('expression -> expression EQUAL expression','expression',3,'p_expression_binop','parser.py',412),
+  ('expression -> expression NOTEQUAL expression','expression',3,'p_expression_binop','parser.py',413),
+  ('expression -> expression LESSTHAN expression','expression',3,'p_expression_binop','parser.py',414),
+  ('expression -> expression GREATERTHAN expression','expression',3,'p_expression_binop','parser.py',415),
+  ('expression -> expression LESSEQUAL expression','expression',3,'p_expression_binop','parser.py',416),
+  ('expression -> expression GREATEREQUAL expression','expression',3,'p_expression_binop','parser.py',417),
+  ('expression -> NOT expression','expression',2,'p_expression_unary','parser.py',421),
+  ('expression -> MINUS expression','expression',2,'p_expression_unary','parser.py',422),
+  ('expression -> LPAREN expression RPAREN','expression',3,'p_expression_group','parser.py',427),
+  ('expression -> variable','expression',1,'p_expression_simple','parser.py',431),
+  ('expression -> INTEGER_CONST','expression',1,'p_expression_simple','parser.py',432),
+  ('expression -> REAL_CONST','expression',1,'p_expression_simple','parser.py',433),
+  ('expression -> STRING_CONST','expression',1,'p_expression_simple','parser.py',434),
+  ('expression -> function_call','expression',1,'p_expression_simple','parser.py',435),
+  ('expression -> TRUE','expression',1,'p_expression_simple','parser.py',436),
+  ('expression -> FALSE','expression',1,'p_expression_simple','parser.py',437),
+  ('function_call -> ID LPAREN expression_list RPAREN','function_call',4,'p_function_call','parser.py',456),
+  ('function_call -> ID LPAREN RPAREN','function_call',3,'p_function_call','parser.py',457),
+  ('variable -> ID','variable',1,'p_variable','parser.py',464),
+  ('variable -> variable LBRACKET expression_list RBRACKET','variable',4,'p_variable','parser.py',465),
 ]
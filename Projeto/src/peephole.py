@@ -0,0 +1,281 @@
+from ir import (Instruction, ControlFlowGraph, reachable, liveness, live_before, constants, constants_after, slot_of,
+                ALL_SLOTS)
+
+# Operações entre duas constantes que a janela consegue calcular
+CONSTANT_OPS = {
+    'ADD': lambda a, b: a + b,
+    'SUB': lambda a, b: a - b,
+    'MUL': lambda a, b: a * b,
+    'EQUAL': lambda a, b: int(a == b),
+    'INF': lambda a, b: int(a < b),
+    'INFEQ': lambda a, b: int(a <= b),
+    'SUP': lambda a, b: int(a > b),
+    'SUPEQ': lambda a, b: int(a >= b),
+}
+# Instruções que só empilham um valor (descartá-lo logo a seguir não tem efeito)
+PURE_PUSHES = ('PUSHI', 'PUSHS', 'PUSHG', 'PUSHL', 'PUSHFP', 'PUSHGP')
+# Número máximo de voltas até estabilizar
+MAX_ROUNDS = 20
+
+
+def _pushi(instr, value=None):
+    return instr.op == 'PUSHI' and (value is None or instr.int_arg == value)
+
+
+class PeepholeOptimizer:
+    """
+    Otimização por janela sobre a lista de instruções EWVM devolvida pelo
+    CodeGenerator. Cada regra da tabela recebe as instruções da janela
+    (sem etiquetas pelo meio) e devolve a sequência que as substitui, ou None
+    se não se aplicar. A seguir às regras de janela:
+      * os saltos para um JUMP passam a saltar diretamente para o destino final;
+      * um JUMP para a etiqueta seguinte desaparece;
+      * os blocos inalcançáveis (ControlFlowGraph) e as etiquetas que ninguém
+        usa são removidos;
+      * 'STOREG x; PUSHG x' desaparece quando x já não é lido depois (o valor
+        fica na pilha), segundo a liveness dos slots;
+      * 'PUSHG x' passa a 'PUSHI c' quando todos os caminhos até lá deixam x
+        com o mesmo PUSHI c (propagação de constantes pelos slots), para que
+        as regras de janela dobrem o que se segue.
+    Repete tudo até não haver alterações. 'removed' conta as instruções
+    removidas por regra e 'fired' as vezes que cada regra se aplicou.
+    """
+    def __init__(self):
+        self.removed = {} # Nome da regra -> instruções removidas
+        self.fired = {} # Nome da regra -> número de aplicações
+
+        # Tabela de regras de janela: (nome, tamanho da janela, função de reescrita)
+        self.rules = [
+            ('c1 c2 op -> c',                 3, self._fold_constants),
+            ('x + 0 / x - 0 / x * 1 -> x',     2, self._neutral),
+            ('+ c1 + c2 -> + c',              4, self._combine_offsets),
+            ('neg neg -> nada',               4, self._double_negation),
+            ('NOT NOT -> nada',               2, self._double_not),
+            ('c = NOT JZ -> c - JZ',          4, self._not_equal_jump),
+            ('PUSHI c JZ -> JUMP / nada',     2, self._constant_jump),
+            ('push POP 1 -> nada',            2, self._discarded_push),
+        ]
+
+    @property
+    def count(self):
+        return sum(self.removed.values())
+
+    def _record(self, rule, removed):
+        self.fired[rule] = self.fired.get(rule, 0) + 1
+        self.removed[rule] = self.removed.get(rule, 0) + removed
+
+    def run(self, code):
+        """Devolve a lista de instruções otimizada (o mesmo formato da entrada)."""
+        for _ in range(MAX_ROUNDS):
+            before = list(code)
+            code = self._apply_windows(code)
+            code = self._thread_jumps(code)
+            code = self._jumps_to_next(code)
+            code = self._remove_unreachable(code)
+            code = self._remove_unused_labels(code)
+            code = self._forward_stores(code)
+            code = self._propagate_constants(code)
+            if code == before:
+                break
+        return code
+
+    # Regras de Janela
+    def _apply_windows(self, code):
+        result = []
+        for line in code:
+            result.append(line)
+            if line.endswith(':'):
+                continue
+            # Volta a tentar as regras enquanto o fim da lista mudar
+            changed = True
+            while changed:
+                changed = False
+                for name, size, rewrite in self.rules:
+                    window = result[-size:]
+                    if len(window) < size or any(item.endswith(':') for item in window):
+                        continue
+                    replacement = rewrite([Instruction.parse(item) for item in window])
+                    if replacement is None:
+                        continue
+                    result[-size:] = [str(instr) for instr in replacement]
+                    self._record(name, size - len(replacement))
+                    changed = True
+                    break
+        return result
+
+    def _fold_constants(self, window):
+        a, b, op = window
+        if not (_pushi(a) and _pushi(b)) or op.op not in CONSTANT_OPS:
+            return None
+        return [Instruction('PUSHI', str(CONSTANT_OPS[op.op](a.int_arg, b.int_arg)))]
+
+    def _neutral(self, window):
+        const, op = window
+        if _pushi(const, 0) and op.op in ('ADD', 'SUB', 'PADD'):
+            return []
+        if _pushi(const, 1) and op.op in ('MUL', 'DIV'):
+            return []
+        return None
+
+    def _combine_offsets(self, window):
+        c1, op1, c2, op2 = window
+        if not (_pushi(c1) and _pushi(c2)) or op1.op not in ('ADD', 'SUB') or op2.op not in ('ADD', 'SUB'):
+            return None
+        total = (c1.int_arg if op1.op == 'ADD' else -c1.int_arg) + (c2.int_arg if op2.op == 'ADD' else -c2.int_arg)
+        if total == 0:
+            return []
+        if total > 0:
+            return [Instruction('PUSHI', str(total)), Instruction('ADD')]
+        return [Instruction('PUSHI', str(-total)), Instruction('SUB')]
+
+    def _double_negation(self, window):
+        if all(_pushi(window[i], -1) and window[i + 1].op == 'MUL' for i in (0, 2)):
+            return []
+        return None
+
+    def _double_not(self, window):
+        return [] if all(instr.op == 'NOT' for instr in window) else None
+
+    def _not_equal_jump(self, window):
+        # a <> c num salto: JZ salta quando a = c, ou seja, quando a - c = 0 (só para inteiros)
+        const, equal, neg, jump = window
+        if not _pushi(const) or (equal.op, neg.op, jump.op) != ('EQUAL', 'NOT', 'JZ'):
+            return None
+        if const.int_arg == 0:
+            return [jump]
+        return [const, Instruction('SUB'), jump]
+
+    def _constant_jump(self, window):
+        const, jump = window
+        if not _pushi(const) or jump.op != 'JZ':
+            return None
+        if const.int_arg == 0:
+            return [Instruction('JUMP', jump.arg)]
+        return []
+
+    def _discarded_push(self, window):
+        push, pop = window
+        if push.op in PURE_PUSHES and pop.op == 'POP' and pop.int_arg == 1:
+            return []
+        return None
+
+    # Saltos e Etiquetas
+    def _label_targets(self, code):
+        """Etiqueta -> primeira instrução a seguir (saltando outras etiquetas)."""
+        targets = {}
+        pending = []
+        for line in code:
+            if line.endswith(':'):
+                pending.append(line[:-1])
+                continue
+            for label in pending:
+                targets[label] = Instruction.parse(line)
+            pending = []
+        return targets
+
+    def _thread_jumps(self, code):
+        targets = self._label_targets(code)
+        result = []
+        for line in code:
+            if not line.endswith(':'):
+                instr = Instruction.parse(line)
+                if instr.op in ('JUMP', 'JZ'):
+                    final, seen = instr.target, {instr.target}
+                    while final in targets and targets[final].op == 'JUMP' and targets[final].target not in seen:
+                        final = targets[final].target
+                        seen.add(final)
+                    if final != instr.target:
+                        line = f"{instr.op} {final}"
+                        self._record('saltos encadeados', 0)
+            result.append(line)
+        return result
+
+    def _jumps_to_next(self, code):
+        result = []
+        for i, line in enumerate(code):
+            if line.startswith('JUMP '):
+                target = Instruction.parse(line).target
+                following = []
+                for item in code[i + 1:]:
+                    if not item.endswith(':'):
+                        break
+                    following.append(item[:-1])
+                if target in following:
+                    self._record('JUMP para a etiqueta seguinte', 1)
+                    continue
+            result.append(line)
+        return result
+
+    def _remove_unreachable(self, code):
+        cfg = ControlFlowGraph.build(code)
+        live = reachable(cfg)
+        dead = [block for block in cfg.blocks if block not in live and block.instructions]
+        if not dead:
+            return code
+        for block in dead:
+            self._record('código inalcançável', len(block.instructions))
+            block.instructions = []
+        return cfg.emit()
+
+    def _remove_unused_labels(self, code):
+        used = set()
+        for line in code:
+            if not line.endswith(':'):
+                target = Instruction.parse(line).target
+                if target:
+                    used.add(target)
+        result = []
+        for line in code:
+            if line.endswith(':') and line[:-1] not in used:
+                self._record('etiquetas não usadas', 0)
+                continue
+            result.append(line)
+        return result
+
+    def _forward_stores(self, code):
+        cfg = ControlFlowGraph.build(code)
+        _, live_out = liveness(cfg)
+        changed = False
+        for block in cfg.blocks:
+            instrs = block.instructions
+            # Slots vivos depois de cada instrução do bloco
+            live_after = [None] * len(instrs)
+            live = set(live_out[block])
+            for i in range(len(instrs) - 1, -1, -1):
+                live_after[i] = frozenset(live)
+                live_before(instrs[i], live)
+            result = []
+            i = 0
+            while i < len(instrs):
+                store = instrs[i]
+                load = instrs[i + 1] if i + 1 < len(instrs) else None
+                if (store.op in ('STOREG', 'STOREL') and load is not None
+                        and load.op == store.op.replace('STORE', 'PUSH') and load.arg == store.arg
+                        and slot_of(store) not in live_after[i + 1] and ALL_SLOTS not in live_after[i + 1]):
+                    self._record('STORE x; PUSH x (x morta)', 2)
+                    changed = True
+                    i += 2
+                    continue
+                result.append(store)
+                i += 1
+            block.instructions = result
+        return cfg.emit() if changed else code
+
+    def _propagate_constants(self, code):
+        cfg = ControlFlowGraph.build(code)
+        known_in, _ = constants(cfg)
+        changed = False
+        for block in cfg.blocks:
+            env = dict(known_in[block])
+            previous = None
+            for i, instr in enumerate(block.instructions):
+                slot = slot_of(instr)
+                # Logo a seguir ao STORE do mesmo slot fica para _forward_stores
+                after_store = previous is not None and previous.op.startswith('STORE') and slot_of(previous) == slot
+                if instr.op in ('PUSHG', 'PUSHL') and slot in env and not after_store:
+                    instr = block.instructions[i] = Instruction('PUSHI', str(env[slot]))
+                    self._record('PUSH x constante -> PUSHI', 0)
+                    changed = True
+                constants_after(instr, previous, env)
+                previous = instr
+        return cfg.emit() if changed else code
@@ -0,0 +1,232 @@
+import copy
+from astutils import (ProgramInfo, has_calls, same_expr, assigned_vars, reference_args, is_scalar, is_bool, bool_value,
+                      case_has_else)
+
+
+class ConstantPropagator:
+    """
+    Propagação de constantes e de cópias, sensível ao fluxo.
+    Percorre cada corpo (principal e subprogramas) em ordem de execução mantendo
+    um mapa de factos 'variável -> constante ou cópia' que é:
+      * invalidado por atribuições, READ e chamadas (que podem alterar globais
+        e os argumentos 'var'); num subprograma com parâmetros 'var', escrever
+        num deles ou numa global invalida também tudo o que pode partilhar a
+        mesma memória;
+      * intersetado nas junções dos IFs e CASEs;
+      * restrito às variáveis não alteradas dentro dos ciclos.
+    O resultado alimenta a dobragem de constantes e a eliminação de ramos mortos.
+    """
+    def __init__(self, fold):
+        self.fold = fold # Dobragem de constantes aplicada às expressões reescritas
+        self.count = 0 # Número de usos substituídos
+
+    def run(self, ast):
+        """Executa a propagação sobre todo o programa. Devolve True se algo mudou."""
+        before = self.count
+        info = ProgramInfo(ast)
+        self.call_writes = info.globals_written()
+        for scope in info.scopes():
+            self.scope = scope
+            self.clobbered = scope.call_clobbered(self.call_writes)
+            self.statement(scope.body, {})
+        return self.count != before
+
+    # Gestão de Factos
+    def _tracked(self, name):
+        """Só se propagam escalares (inteiros/booleanos) visíveis neste escopo."""
+        return is_scalar(self.scope.lookup(name))
+
+    def _kill(self, facts, names):
+        """Remove os factos sobre 'names' (e sobre o que partilha memória com eles) e as cópias que dependem deles."""
+        names = self.scope.aliases(names)
+        for var in list(facts):
+            value = facts[var]
+            if var in names or (value.type == 'VariableAccess' and value.leaf in names):
+                del facts[var]
+
+    def _kill_globals(self, facts, node):
+        """As chamadas em 'node' podem alterar as globais escritas por algum subprograma e os argumentos 'var'."""
+        self._kill(facts, {var for var in self._fact_vars(facts) if not self._stable(var)} | reference_args(node))
+
+    def _stable(self, name):
+        """Variável que nenhuma chamada consegue alterar (local ou global nunca escrita por subprogramas)."""
+        return name not in self.clobbered
+
+    def _fact_vars(self, facts):
+        names = set(facts)
+        names.update(v.leaf for v in facts.values() if v.type == 'VariableAccess')
+        return names
+
+    def _join(self, a, b):
+        """Interseção de dois conjuntos de factos (só fica o que é igual em ambos)."""
+        return {var: val for var, val in a.items() if var in b and same_expr(val, b[var])}
+
+    # Substituição nas Expressões
+    def substitute(self, expr, facts, calls_in_statement=False):
+        """
+        Substitui usos de variáveis conhecidas por constantes/cópias e volta a
+        dobrar a expressão. Se a instrução tiver chamadas, as globais escritas
+        pelos subprogramas podem mudar a meio da avaliação, por isso só se
+        substituem variáveis (e cópias) que nenhuma chamada altera.
+        """
+        before = self.count
+        expr = self._replace(expr, facts, calls_in_statement)
+        if self.count != before:
+            expr = self.fold(expr)
+        return expr
+
+    def _replace(self, expr, facts, calls_in_statement):
+        if expr is None:
+            return expr
+        if expr.type == 'VariableAccess':
+            fact = facts.get(expr.leaf)
+            stable = fact is not None and self._stable(expr.leaf) and \
+                (fact.type != 'VariableAccess' or self._stable(fact.leaf))
+            if fact is not None and (not calls_in_statement or stable):
+                self.count += 1
+                replacement = copy.deepcopy(fact)
+                replacement.lineno = expr.lineno
+                return replacement
+            return expr
+        for i, child in enumerate(expr.children):
+            expr.children[i] = self._replace(child, facts, calls_in_statement)
+        return expr
+
+    # Visitor de Instruções
+    def statement(self, node, facts):
+        """Processa uma instrução e devolve os factos válidos depois dela."""
+        if node is None:
+            return facts
+        method = getattr(self, f'visit_{node.type}', self.visit_unknown)
+        return method(node, facts)
+
+    def visit_unknown(self, node, facts):
+        # Instrução desconhecida: nada se pode assumir depois dela
+        return {}
+
+    def visit_Empty(self, node, facts):
+        return facts
+
+    def visit_CompoundStatement(self, node, facts):
+        for child in node.children:
+            facts = self.statement(child, facts)
+        return facts
+
+    def visit_AssignmentStatement(self, node, facts):
+        target, expr = node.children
+        calls = has_calls(node)
+
+        if target.type == 'ArrayAccess':
+            target.children[0] = self.substitute(target.children[0], facts, calls)
+        node.children[1] = expr = self.substitute(expr, facts, calls)
+
+        if calls:
+            self._kill_globals(facts, node)
+        self._kill(facts, {target.leaf})
+
+        # Regista o novo facto (apenas para variáveis escalares simples)
+        if target.type == 'VariableAccess' and self._tracked(target.leaf):
+            if expr.type in ('IntegerConstant', 'BooleanConstant'):
+                facts[target.leaf] = expr
+            elif (expr.type == 'VariableAccess' and expr.leaf != target.leaf
+                  and self._tracked(expr.leaf)):
+                facts[target.leaf] = expr
+        return facts
+
+    def visit_IfStatement(self, node, facts):
+        calls = has_calls(node.children[0])
+        node.children[0] = self.substitute(node.children[0], facts, calls)
+        if calls:
+            self._kill_globals(facts, node.children[0])
+
+        has_else = len(node.children) > 2
+        cond = node.children[0]
+        if is_bool(cond):
+            # Ramo conhecido: o outro será eliminado pela dobragem, não entra na junção
+            if bool_value(cond):
+                return self.statement(node.children[1], facts)
+            return self.statement(node.children[2], facts) if has_else else facts
+
+        then_facts = self.statement(node.children[1], dict(facts))
+        else_facts = self.statement(node.children[2], dict(facts)) if has_else else facts
+        return self._join(then_facts, else_facts)
+
+    def visit_CaseStatement(self, node, facts):
+        calls = has_calls(node.children[0])
+        node.children[0] = selector = self.substitute(node.children[0], facts, calls)
+        if calls:
+            self._kill_globals(facts, selector)
+
+        # Cada ramo parte dos mesmos factos; sem ELSE, o CASE pode não executar nenhum
+        outcomes = [] if case_has_else(node) else [facts]
+        for branch in node.children[1:]:
+            branch_facts = dict(facts)
+            labels = branch.children[0].children if branch.type == 'CaseBranch' else []
+            if (selector.type == 'VariableAccess' and self._tracked(selector.leaf) and len(labels) == 1
+                    and labels[0].type in ('IntegerConstant', 'BooleanConstant')):
+                # Dentro de um ramo com um único valor, o seletor é conhecido
+                branch_facts[selector.leaf] = copy.deepcopy(labels[0])
+            outcomes.append(self.statement(branch.children[-1], branch_facts))
+
+        result = outcomes[0]
+        for other in outcomes[1:]:
+            result = self._join(result, other)
+        return result
+
+    def _loop_facts(self, node, facts):
+        """Factos válidos em qualquer iteração: retira tudo o que o ciclo altera."""
+        facts = dict(facts)
+        self._kill(facts, assigned_vars(node))
+        if has_calls(node):
+            self._kill_globals(facts, node)
+        return facts
+
+    def visit_WhileStatement(self, node, facts):
+        facts = self._loop_facts(node, facts)
+        calls = has_calls(node.children[0])
+        node.children[0] = self.substitute(node.children[0], facts, calls)
+        self.statement(node.children[1], dict(facts))
+        return facts
+
+    def visit_ForStatement(self, node, facts):
+        # O valor inicial e o limite são avaliados uma vez, antes do ciclo
+        calls = has_calls(node.children[1]) or has_calls(node.children[2])
+        for i in (1, 2):
+            node.children[i] = self.substitute(node.children[i], facts, calls)
+        if calls:
+            self._kill_globals(facts, node)
+
+        facts = self._loop_facts(node, facts)
+        self.statement(node.children[3], dict(facts))
+        return facts
+
+    def visit_ExpressionStatement(self, node, facts):
+        calls = has_calls(node)
+        node.children[0] = self.substitute(node.children[0], facts, calls)
+        if calls:
+            self._kill_globals(facts, node)
+        return facts
+
+    def visit_ReadStatement(self, node, facts):
+        for var in node.children:
+            if var.type == 'ArrayAccess':
+                var.children[0] = self.substitute(var.children[0], facts, has_calls(var))
+            self._kill(facts, {var.leaf})
+        return facts
+
+    def visit_WriteStatement(self, node, facts):
+        calls = has_calls(node)
+        for i, expr in enumerate(node.children):
+            node.children[i] = self.substitute(expr, facts, calls)
+        if calls:
+            self._kill_globals(facts, node)
+        return facts
+
+    def visit_ProcedureCall(self, node, facts):
+        if node.children:
+            args = node.children[0]
+            calls = any(has_calls(arg) for arg in args.children)
+            for i, arg in enumerate(args.children):
+                args.children[i] = self.substitute(arg, facts, calls)
+        self._kill_globals(facts, node)
+        return facts
@@ -0,0 +1,300 @@
+from parser import Node
+from astutils import (walk, assigned_vars, used_vars, eval_binary, constant_value, make_constant, case_select,
+                      BUILTIN_FUNCTIONS)
+from callgraph import CallGraph
+
+# Limites do avaliador: instruções executadas por chamada e profundidade de recursão
+MAX_EVAL_STEPS = 20000
+MAX_EVAL_DEPTH = 64
+# Os inteiros da VM são de 32 bits: resultados fora deste intervalo não se dobram
+INT_MIN, INT_MAX = -2**31, 2**31 - 1
+
+
+class PurityAnalysis:
+    """
+    Classificação dos subprogramas quanto a efeitos colaterais:
+      * puro: sem READ/WRITE, sem escritas fora dos próprios parâmetros (de
+        valor) e locais, e só chama subprogramas puros;
+      * avaliável: puro e, além disso, só lê os próprios parâmetros e locais,
+        ou seja, o resultado depende apenas dos argumentos.
+    A recursão resolve-se por ponto fixo: parte-se de todos os subprogramas
+    que passam nas verificações locais e retiram-se os que chamam algum que
+    não seja puro, até estabilizar.
+    """
+    def __init__(self, graph):
+        self.graph = graph
+        subprograms = graph.info.subprograms
+        self.pure = {name for name, scope in subprograms.items() if self._locally_pure(scope)}
+        self.pure = self._fixpoint(self.pure)
+        self.evaluable = {name for name in self.pure
+                          if used_vars(subprograms[name].body) <= self._own(subprograms[name])}
+        self.evaluable = self._fixpoint(self.evaluable)
+
+    def _locally_pure(self, scope):
+        for n in walk(scope.body):
+            if n.type in ('ReadStatement', 'WriteStatement'):
+                return False
+        return assigned_vars(scope.body) <= self._own(scope)
+
+    def _own(self, scope):
+        """Variáveis cuja memória pertence à chamada (os parâmetros 'var' são de quem chama)."""
+        return set(scope.variables) - scope.references
+
+    def _fixpoint(self, names):
+        changed = True
+        while changed:
+            changed = False
+            for name in list(names):
+                if any(callee not in names for callee in self.graph.callees(name)):
+                    names.discard(name)
+                    changed = True
+        return names
+
+    def is_pure(self, name):
+        return name in self.pure
+
+    def is_evaluable(self, name):
+        return name in self.evaluable
+
+    def explain(self, name, seen=None):
+        """Motivo (em texto) por que o subprograma não é avaliável, ou None se for."""
+        if name in self.evaluable:
+            return None
+        seen = (seen or set()) | {name}
+        scope = self.graph.info.subprograms[name]
+        for n in walk(scope.body):
+            if n.type in ('ReadStatement', 'WriteStatement'):
+                return f"'{name}' faz entrada/saída (linha {n.lineno})"
+        written = sorted(assigned_vars(scope.body) - self._own(scope))
+        if written:
+            kind = "o parâmetro 'var'" if written[0] in scope.references else "a variável global"
+            return f"'{name}' altera {kind} '{written[0]}'"
+        read = sorted(used_vars(scope.body) - self._own(scope))
+        if read:
+            kind = "o parâmetro 'var'" if read[0] in scope.references else "a variável global"
+            return f"'{name}' lê {kind} '{read[0]}' (o resultado não depende só dos argumentos)"
+        for callee in self.graph.callees(name):
+            if callee not in self.evaluable and callee not in seen:
+                return f"'{name}' chama '{callee}', e {self.explain(callee, seen)}"
+        return f"'{name}' depende de subprogramas com efeitos colaterais"
+
+
+class EvaluationAborted(Exception):
+    """A avaliação em compilação desistiu (limites, erro de execução ou construção não suportada)."""
+
+
+class ConstantEvaluator:
+    """
+    Interpretador limitado para chamadas de subprogramas avaliáveis com
+    argumentos constantes. Segue a mesma aritmética da dobragem de constantes
+    (eval_binary) e desiste (EvaluationAborted) ao ultrapassar MAX_EVAL_STEPS
+    ou MAX_EVAL_DEPTH, com índices fora dos limites, divisões por zero ou
+    valores fora dos inteiros de 32 bits.
+    """
+    def __init__(self, graph):
+        self.graph = graph
+
+    def call(self, name, args):
+        """Valor devolvido por name(args), ou None se não for possível calcular."""
+        self.steps = 0
+        self.depth = 0
+        try:
+            return self._call(name, args)
+        except (EvaluationAborted, RecursionError):
+            return None
+
+    def _call(self, name, args):
+        scope = self.graph.info.subprograms[name]
+        self.depth += 1
+        if self.depth > MAX_EVAL_DEPTH:
+            raise EvaluationAborted()
+        frame = {var: self._default(var_type) for var, var_type in scope.variables.items()}
+        if len(args) != len(scope.params):
+            raise EvaluationAborted()
+        for param, value in zip(scope.params, args):
+            frame[param] = dict(value) if isinstance(value, dict) else value
+        self.statement(scope.body, frame)
+        self.depth -= 1
+        return frame.get(name)
+
+    def _default(self, var_type):
+        if isinstance(var_type, dict):
+            lo, hi = var_type['range']
+            return {i: self._default(var_type['elem_type']) for i in range(lo, hi + 1)}
+        if var_type == 'boolean':
+            return False
+        if var_type == 'string':
+            return ''
+        return 0
+
+    # Instruções
+    def statement(self, node, frame):
+        self.steps += 1
+        if self.steps > MAX_EVAL_STEPS:
+            raise EvaluationAborted()
+        kind = node.type
+        if kind == 'CompoundStatement':
+            for child in node.children:
+                self.statement(child, frame)
+        elif kind == 'AssignmentStatement':
+            target, expr = node.children
+            if target.type == 'ArrayAccess':
+                array = self._array(target, frame)
+                index = self.expr(target.children[0], frame)
+                value = self.expr(expr, frame)
+                if index not in array:
+                    raise EvaluationAborted()
+                array[index] = value
+            else:
+                frame[target.leaf] = self.expr(expr, frame)
+        elif kind == 'IfStatement':
+            if self.expr(node.children[0], frame):
+                self.statement(node.children[1], frame)
+            elif len(node.children) > 2:
+                self.statement(node.children[2], frame)
+        elif kind == 'CaseStatement':
+            body = case_select(node, int(self._char_code(self.expr(node.children[0], frame))))
+            if body is not None:
+                self.statement(body, frame)
+        elif kind == 'WhileStatement':
+            while self.expr(node.children[0], frame):
+                self.statement(node.children[1], frame)
+                self.steps += 1
+                if self.steps > MAX_EVAL_STEPS:
+                    raise EvaluationAborted()
+        elif kind == 'ForStatement':
+            var = node.children[0].leaf
+            start = self.expr(node.children[1], frame)
+            limit = self.expr(node.children[2], frame)
+            step = 1 if node.leaf == 'to' else -1
+            frame[var] = start
+            while (frame[var] <= limit) if step > 0 else (frame[var] >= limit):
+                self.statement(node.children[3], frame)
+                frame[var] += step
+        elif kind in ('ProcedureCall', 'ExpressionStatement'):
+            call = node if kind == 'ProcedureCall' else node.children[0]
+            self.expr(call, frame)
+        elif kind != 'Empty':
+            raise EvaluationAborted()
+
+    # Expressões
+    def _array(self, node, frame):
+        array = frame.get(node.leaf)
+        if not isinstance(array, dict):
+            raise EvaluationAborted()
+        return array
+
+    def expr(self, node, frame):
+        kind = node.type
+        if kind in ('IntegerConstant', 'BooleanConstant'):
+            return constant_value(node)
+        if kind == 'StringConstant':
+            return node.leaf
+        if kind == 'VariableAccess':
+            if node.leaf not in frame:
+                raise EvaluationAborted()
+            return frame[node.leaf]
+        if kind == 'ArrayAccess':
+            value = frame.get(node.leaf)
+            index = self.expr(node.children[0], frame)
+            if isinstance(value, str):
+                if not 1 <= index <= len(value):
+                    raise EvaluationAborted()
+                return ord(value[index - 1])
+            array = self._array(node, frame)
+            if index not in array:
+                raise EvaluationAborted()
+            return array[index]
+        if kind == 'IndexCheck':
+            index = self.expr(node.children[0], frame)
+            lo, hi = node.leaf
+            if not lo <= index <= hi:
+                raise EvaluationAborted() # O CHECK falha na execução
+            return index
+        if kind == 'UnaryOp':
+            value = self.expr(node.children[0], frame)
+            return self._checked(not value if node.leaf == 'NOT' else -value)
+        if kind == 'BinaryOp':
+            left = self.expr(node.children[0], frame)
+            if node.leaf in ('AND', 'OR') and bool(left) == (node.leaf == 'OR'):
+                return left # Curto-circuito, como no código gerado
+            right = self.expr(node.children[1], frame)
+            if isinstance(left, str) or isinstance(right, str):
+                left, right = self._char_code(left), self._char_code(right)
+            return self._checked(eval_binary(node.leaf, left, right))
+        if kind in ('FunctionCall', 'ProcedureCall'):
+            args = [self.expr(arg, frame) for arg in node.children[0].children] if node.children else []
+            if node.leaf.lower() in BUILTIN_FUNCTIONS:
+                if len(args) != 1 or not isinstance(args[0], str):
+                    raise EvaluationAborted()
+                return len(args[0])
+            name = self.graph.resolve(node.leaf)
+            if name is None:
+                raise EvaluationAborted()
+            return self._call(name, args)
+        raise EvaluationAborted()
+
+    def _char_code(self, value):
+        """Um literal de um carácter compara-se pelo código (como no gerador de código)."""
+        if isinstance(value, str):
+            if len(value) != 1:
+                raise EvaluationAborted()
+            return ord(value)
+        return value
+
+    def _checked(self, value):
+        if value is None:
+            raise EvaluationAborted() # Divisão por zero
+        if not isinstance(value, bool) and not INT_MIN <= value <= INT_MAX:
+            raise EvaluationAborted()
+        return value
+
+
+class PureCallEvaluator:
+    """
+    Avaliação em compilação de chamadas a funções avaliáveis (ver
+    PurityAnalysis) cujos argumentos são todos constantes: a chamada é
+    substituída pelo IntegerConstant/BooleanConstant devolvido. As chamadas
+    são tratadas de dentro para fora, por isso f(g(2)) resolve-se numa só
+    passagem.
+    """
+    def __init__(self):
+        self.count = 0 # Chamadas substituídas pelo seu valor
+        self.evaluated = {} # Nome da função -> número de chamadas avaliadas
+
+    def run(self, ast):
+        """Executa a passagem sobre todo o programa. Devolve True se algo mudou."""
+        before = self.count
+        self.graph = CallGraph(ast)
+        self.purity = PurityAnalysis(self.graph)
+        if not self.purity.evaluable:
+            return False
+        self.evaluator = ConstantEvaluator(self.graph)
+        for scope in self.graph.info.scopes():
+            scope.block.children[2] = self.rewrite(scope.body)
+        return self.count != before
+
+    def rewrite(self, node):
+        for i, child in enumerate(node.children):
+            if isinstance(child, Node):
+                node.children[i] = self.rewrite(child)
+        if node.type == 'FunctionCall':
+            return self.evaluate(node)
+        return node
+
+    def evaluate(self, call):
+        name = self.graph.resolve(call.leaf)
+        if name is None or not self.purity.is_evaluable(name):
+            return call
+        if self.graph.info.subprograms[name].node.type != 'FunctionDeclaration':
+            return call
+        args = call.children[0].children if call.children else []
+        if not all(arg.type in ('IntegerConstant', 'BooleanConstant', 'StringConstant') for arg in args):
+            return call
+        values = [arg.leaf if arg.type == 'StringConstant' else constant_value(arg) for arg in args]
+        result = self.evaluator.call(name, values)
+        if result is None or not isinstance(result, (bool, int)):
+            return call
+        self.count += 1
+        self.evaluated[name] = self.evaluated.get(name, 0) + 1
+        return make_constant(result, call.lineno)
@@ -0,0 +1,349 @@
+import math
+from astutils import (ProgramInfo, walk, has_calls, assigned_vars, reference_args, case_has_else, case_intervals,
+                      BUILTIN_FUNCTIONS)
+from purity import INT_MIN, INT_MAX
+
+INF = math.inf
+TOP = (-INF, INF) # Intervalo desconhecido
+# Iterações de um ciclo antes de alargar os limites que ainda crescem (widening)
+WIDEN_AFTER = 3
+
+# Comparação equivalente com os operandos trocados / negada
+MIRROR = {'<': '>', '>': '<', '<=': '>=', '>=': '<=', '=': '=', '<>': '<>'}
+NEGATE = {'<': '>=', '>=': '<', '>': '<=', '<=': '>', '=': '<>', '<>': '='}
+
+
+# Aritmética de Intervalos
+def saturate(interval):
+    """
+    Limites fora dos inteiros da VM passam a infinito: assim os valores nunca
+    crescem sem fim (nem deixam de caber num float ao somar com INF).
+    """
+    lo, hi = interval
+    if lo > INT_MAX or hi < INT_MIN:
+        return TOP # Transborda de certeza: o valor real é desconhecido
+    return (lo if lo >= INT_MIN else -INF, hi if hi <= INT_MAX else INF)
+
+def _mul(a, b):
+    return 0 if a == 0 or b == 0 else a * b
+
+def interval_add(a, b):
+    return saturate((a[0] + b[0], a[1] + b[1]))
+
+def interval_sub(a, b):
+    return saturate((a[0] - b[1], a[1] - b[0]))
+
+def interval_mul(a, b):
+    products = [_mul(x, y) for x in a for y in b]
+    return saturate((min(products), max(products)))
+
+def interval_join(a, b):
+    return (min(a[0], b[0]), max(a[1], b[1]))
+
+def within(inner, outer):
+    return outer[0] <= inner[0] and inner[1] <= outer[1]
+
+
+class RangeAnalysis:
+    """
+    Análise de intervalos de valores das variáveis inteiras, sensível ao
+    fluxo. Percorre cada corpo em ordem de execução com um ambiente
+    'variável -> (mínimo, máximo)':
+      * as atribuições calculam o intervalo da expressão (aritmética de
+        intervalos; DIV/MOD só por constantes);
+      * as condições dos IF/WHILE restringem os ramos (x < n, x >= 1, AND/OR);
+      * os ciclos iteram até estabilizar, alargando para infinito os limites
+        que continuam a crescer ao fim de WIDEN_AFTER iterações;
+      * o FOR dá à variável de controlo o intervalo [início, limite];
+      * READ e chamadas (nas globais que os subprogramas escrevem e nos
+        argumentos 'var') esquecem; com parâmetros 'var', uma escrita esquece
+        também o que pode partilhar a mesma memória.
+    Cada ArrayAccess (ou elemento passado a um 'var') sobre um array fica com 'safe_index' verdadeiro quando o
+    intervalo do índice cabe no ArrayType declarado; nos arrays
+    multidimensionais, cada IndexCheck fica marcado se o índice da sua
+    dimensão cabe no intervalo dela. Essa marca permite ao gerador omitir a
+    verificação de limites (--bounds-check).
+    """
+    def __init__(self):
+        self.proven = 0 # Acessos provados dentro dos limites
+        self.unproven = 0 # Acessos que continuam a precisar de verificação
+
+    def run(self, ast):
+        """Marca todos os acessos a arrays do programa."""
+        info = ProgramInfo(ast)
+        self.call_writes = info.globals_written()
+        self.proven = self.unproven = 0
+        for scope in info.scopes():
+            self.scope = scope
+            self.clobbered = scope.call_clobbered(self.call_writes)
+            self.marking = True
+            env = {}
+            if scope.is_global:
+                # As globais começam a zero (PUSHN)
+                env = {name: (0, 0) for name, var_type in scope.variables.items() if var_type == 'integer'}
+            self.statement(scope.body, env)
+
+    # Ambiente
+    def _tracked(self, name):
+        return self.scope.lookup(name) == 'integer'
+
+    def _stable(self, name):
+        return name not in self.clobbered
+
+    def _kill_calls(self, env, node):
+        written = self.scope.aliases(reference_args(node))
+        return {name: value for name, value in env.items() if self._stable(name) and name not in written}
+
+    def _forget(self, env, name):
+        """Escrita em 'name': esquece-o a ele e ao que partilha a mesma memória."""
+        for alias in self.scope.aliases({name}):
+            env.pop(alias, None)
+
+    def _join(self, a, b):
+        return {name: interval_join(a[name], b[name]) for name in a if name in b}
+
+    def _widen(self, old, new):
+        result = {}
+        for name, (lo, hi) in new.items():
+            if name not in old:
+                continue
+            old_lo, old_hi = old[name]
+            result[name] = (lo if lo >= old_lo else -INF, hi if hi <= old_hi else INF)
+        return result
+
+    # Expressões
+    def value(self, expr, env):
+        """Intervalo de valores de uma expressão inteira."""
+        kind = expr.type
+        if kind == 'IntegerConstant':
+            return saturate((expr.leaf, expr.leaf))
+        if kind == 'VariableAccess':
+            return env.get(expr.leaf, TOP)
+        if kind == 'UnaryOp' and expr.leaf == 'MINUS':
+            lo, hi = self.value(expr.children[0], env)
+            return saturate((-hi, -lo))
+        if kind == 'IndexCheck':
+            # Depois do CHECK o índice está dentro da dimensão (senão a execução parou)
+            lo, hi = self.value(expr.children[0], env)
+            bound_lo, bound_hi = expr.leaf
+            if lo > bound_hi or hi < bound_lo:
+                return expr.leaf
+            return (max(lo, bound_lo), min(hi, bound_hi))
+        if kind == 'FunctionCall' and expr.leaf.lower() in BUILTIN_FUNCTIONS:
+            return (0, INF) # length
+        if kind != 'BinaryOp':
+            return TOP
+        op = expr.leaf
+        left = self.value(expr.children[0], env)
+        right = self.value(expr.children[1], env)
+        if op == '+':
+            return interval_add(left, right)
+        if op == '-':
+            return interval_sub(left, right)
+        if op == '*':
+            return interval_mul(left, right)
+        if op in ('DIV', 'MOD') and right[0] == right[1] and right[0] != 0:
+            divisor = right[0]
+            if op == 'MOD':
+                bound = abs(divisor) - 1
+                return (0, bound) if left[0] >= 0 else (-bound, bound)
+            if divisor > 0:
+                # Cobre tanto a divisão truncada como a arredondada para baixo
+                lo = left[0] if math.isinf(left[0]) else left[0] // divisor
+                hi = left[1] if math.isinf(left[1]) else -(-left[1] // divisor)
+                return saturate((lo, hi))
+        return TOP
+
+    def refine(self, env, cond, truth):
+        """Ambiente restringido por 'cond' ter o valor 'truth'."""
+        env = dict(env)
+        if cond.type == 'UnaryOp' and cond.leaf == 'NOT':
+            return self.refine(env, cond.children[0], not truth)
+        if cond.type != 'BinaryOp':
+            return env
+        op = cond.leaf
+        if op in ('AND', 'OR'):
+            # Só um dos casos diz algo sobre ambos os operandos
+            if (op == 'AND') == truth:
+                env = self.refine(env, cond.children[0], truth)
+                env = self.refine(env, cond.children[1], truth)
+            return env
+        if op not in NEGATE:
+            return env
+        if not truth:
+            op = NEGATE[op]
+        left, right = cond.children
+        if left.type == 'VariableAccess' and self._tracked(left.leaf):
+            self._restrict(env, left.leaf, op, self.value(right, env))
+        if right.type == 'VariableAccess' and self._tracked(right.leaf):
+            self._restrict(env, right.leaf, MIRROR[op], self.value(left, env))
+        return env
+
+    def _restrict(self, env, name, op, bound):
+        lo, hi = env.get(name, TOP)
+        if op == '<':
+            hi = min(hi, bound[1] - 1)
+        elif op == '<=':
+            hi = min(hi, bound[1])
+        elif op == '>':
+            lo = max(lo, bound[0] + 1)
+        elif op == '>=':
+            lo = max(lo, bound[0])
+        elif op == '=':
+            lo, hi = max(lo, bound[0]), min(hi, bound[1])
+        env[name] = (lo, hi)
+
+    def mark(self, node, env):
+        """Marca os acessos a arrays avaliados em 'node' com o ambiente atual."""
+        if not self.marking or node is None:
+            return
+        for n in walk(node):
+            if n.type == 'IndexCheck':
+                # Cada dimensão de um array multidimensional prova-se à parte
+                n.safe_index = within(self.value(n.children[0], env), n.leaf)
+            elif n.type in ('ArrayAccess', 'VarArgument') and n.children:
+                var_type = self.scope.lookup(n.leaf)
+                if not isinstance(var_type, dict) or var_type.get('kind') != 'array':
+                    continue
+                n.safe_index = within(self.value(n.children[0], env), var_type['range'])
+            else:
+                continue
+            if n.safe_index:
+                self.proven += 1
+            else:
+                self.unproven += 1
+
+    # Instruções
+    def statement(self, node, env):
+        """Processa uma instrução e devolve o ambiente depois dela."""
+        if node is None:
+            return env
+        method = getattr(self, f'visit_{node.type}', None)
+        if method:
+            return method(node, env)
+        # Chamadas e instruções sem efeito nas variáveis inteiras
+        if has_calls(node):
+            env = self._kill_calls(env, node)
+        self.mark(node, env)
+        return env
+
+    def visit_CompoundStatement(self, node, env):
+        for child in node.children:
+            env = self.statement(child, env)
+        return env
+
+    def visit_AssignmentStatement(self, node, env):
+        if has_calls(node):
+            env = self._kill_calls(env, node)
+        target, expr = node.children
+        self.mark(node, env)
+        env = dict(env)
+        value = self.value(expr, env)
+        self._forget(env, target.leaf)
+        if target.type == 'VariableAccess' and self._tracked(target.leaf):
+            env[target.leaf] = value
+        return env
+
+    def visit_ReadStatement(self, node, env):
+        self.mark(node, env)
+        env = dict(env)
+        for var in node.children:
+            if var.type == 'VariableAccess':
+                self._forget(env, var.leaf)
+        return env
+
+    def visit_IfStatement(self, node, env):
+        cond = node.children[0]
+        if has_calls(cond):
+            env = self._kill_calls(env, cond)
+        self.mark(cond, env)
+        then_env = self.statement(node.children[1], self.refine(env, cond, True))
+        else_env = self.refine(env, cond, False)
+        if len(node.children) > 2:
+            else_env = self.statement(node.children[2], else_env)
+        return self._join(then_env, else_env)
+
+    def visit_CaseStatement(self, node, env):
+        selector = node.children[0]
+        if has_calls(selector):
+            env = self._kill_calls(env, selector)
+        self.mark(selector, env)
+        refine = selector.type == 'VariableAccess' and self._tracked(selector.leaf)
+
+        outcomes = [] if case_has_else(node) else [env]
+        for branch in node.children[1:]:
+            branch_env = env
+            if refine and branch.type == 'CaseBranch':
+                # Dentro do ramo, o seletor está entre o menor e o maior rótulo
+                intervals = case_intervals(branch)
+                branch_env = dict(env)
+                self._restrict(branch_env, selector.leaf, '=',
+                               (min(lo for lo, _ in intervals), max(hi for _, hi in intervals)))
+            outcomes.append(self.statement(branch.children[-1], branch_env))
+
+        result = outcomes[0]
+        for other in outcomes[1:]:
+            result = self._join(result, other)
+        return result
+
+    def visit_WhileStatement(self, node, env):
+        cond, body = node.children
+        head = self._loop_head(node, env, lambda state: self.refine(state, cond, True), body)
+        self.mark(cond, head)
+        self.statement(body, self.refine(head, cond, True))
+        return self.refine(head, cond, False)
+
+    def visit_ForStatement(self, node, env):
+        var_node, start, limit, body = node.children
+        var = var_node.leaf
+        if has_calls(start) or has_calls(limit):
+            env = self._kill_calls(env, node)
+        self.mark(start, env)
+        self.mark(limit, env)
+        first, last = self.value(start, env), self.value(limit, env)
+        if node.leaf == 'to':
+            control, final = (first[0], last[1]), interval_join(first, interval_add(last, (1, 1)))
+        else:
+            control, final = (last[0], first[1]), interval_join(first, interval_sub(last, (1, 1)))
+        # Sem intervalo fixo se o corpo pode escrever a variável de controlo:
+        # atribuição directa, subprograma que a altera ou argumento 'var'
+        written = assigned_vars(body) | reference_args(body)
+        free = bool(self.scope.aliases({var}) & written) or not self._tracked(var) \
+            or (has_calls(body) and not self._stable(var))
+
+        def enter(state):
+            state = dict(state)
+            self._forget(state, var)
+            if not free:
+                state[var] = control
+            return state
+
+        head = self._loop_head(node, env, enter, body)
+        self.statement(body, enter(head))
+        result = dict(head)
+        self._forget(result, var)
+        if not free:
+            result[var] = final
+        return result
+
+    def _loop_head(self, node, env, enter, body):
+        """
+        Ambiente no início de cada iteração (ponto fixo com alargamento). Durante
+        a iteração não se marca nada: só o ambiente estável conta.
+        """
+        if has_calls(node):
+            env = self._kill_calls(env, node)
+        marking, self.marking = self.marking, False
+        head = env
+        for iteration in range(2 * WIDEN_AFTER + len(env) + 2):
+            out = self.statement(body, enter(head))
+            new_head = self._join(env, out)
+            if iteration >= WIDEN_AFTER:
+                new_head = self._widen(head, new_head)
+            if new_head == head:
+                break
+            head = new_head
+        else:
+            head = {}
+        self.marking = marking
+        return head
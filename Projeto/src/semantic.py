@@ -1,3 +1,7 @@
+from parser import Node
+from astutils import walk, case_label_value, constant_value, eval_binary, make_constant
+
+
 class SymbolTable:
     """
     Tabela de Símbolos com suporte a escopos hierárquicos (Pai -> Filho).
@@ -45,8 +49,11 @@ class SemanticAnalyzer:
     1. Verificação de Tipos (Type Checking)
     2. Gestão de Escopos e Declarações
     3. Verificação de Inicialização de Variáveis
+    4. Cálculo das Constantes (cada uso é substituído pelo literal na AST)
+    5. Linearização dos arrays multidimensionais (um só índice sobre a memória contígua)
     """
-    def __init__(self):
+    def __init__(self, bounds_check=False):
+        self.bounds_check = bounds_check # Verificar cada índice de um array multidimensional (IndexCheck)
         self.global_scope = SymbolTable()
         self.current_scope = self.global_scope
         self.errors = []
@@ -61,6 +68,7 @@ class SemanticAnalyzer:
         if ast:
             try:
                 self.visit(ast)
+                self._flatten_array_types(ast)
             except Exception as e:
                 import traceback
                 traceback.print_exc() # Debug útil para o desenvolvedor
@@ -129,11 +137,54 @@ class SemanticAnalyzer:
         if funcs: self.visit(funcs)
         if body: self.visit(body)
 
-    # Declarações de Variáveis
+    # Declarações de Constantes e Variáveis
     def visit_Declarations(self, node):
         for child in node.children:
             if child and child.type != 'Empty': self.visit(child)
 
+    def visit_ConstDeclaration(self, node):
+        const_name = node.leaf
+        expr = node.children[0]
+        const_type = self.visit(expr) # Substitui as constantes anteriores usadas na expressão
+        if const_type == 'error':
+            return
+
+        value = self._constant_value(expr)
+        if value is None:
+            self.add_error(f"O valor da constante '{const_name}' não pode ser calculado em tempo de compilação.", node)
+        elif self.current_scope.lookup_current_scope(const_name):
+            self.add_error(f"Identificador '{const_name}' já declarado neste escopo.", node)
+        else:
+            node.children = [self._literal(value, node.lineno)]
+            self.current_scope.add(const_name, {'kind': 'constant', 'type': const_type, 'value': value, 'initialized': True})
+
+    def _constant_value(self, node):
+        """Valor Python de uma expressão só com literais (None se depender de variáveis ou chamadas)."""
+        if node.type == 'StringConstant':
+            return node.leaf
+        if node.type in ('IntegerConstant', 'BooleanConstant'):
+            return constant_value(node)
+        if node.type == 'UnaryOp':
+            value = self._constant_value(node.children[0])
+            if value is None: return None
+            return (not value) if node.leaf == 'NOT' else -value
+        if node.type == 'BinaryOp':
+            left = self._constant_value(node.children[0])
+            right = self._constant_value(node.children[1])
+            if left is None or right is None: return None
+            return eval_binary(node.leaf, left, right)
+        return None
+
+    def _literal(self, value, lineno=None):
+        if isinstance(value, str):
+            return Node('StringConstant', [], value, lineno=lineno)
+        return make_constant(value, lineno)
+
+    def _substitute_constant(self, node, info):
+        """Transforma o acesso a uma constante no literal correspondente (no próprio nó)."""
+        literal = self._literal(info['value'], node.lineno)
+        node.type, node.leaf, node.children = literal.type, literal.leaf, []
+
     def visit_Declaration(self, node):
         id_list = node.children[0]
         type_node = node.children[1]
@@ -159,12 +210,32 @@ class SemanticAnalyzer:
         if type_node.type == 'BasicType': return type_node.leaf 
         elif type_node.type == 'Type': return type_node.leaf
         elif type_node.type == 'ArrayType':
+            self._resolve_array_bounds(type_node)
             range_tuple = type_node.leaf
             # Recursivo para arrays de arrays (se suportado)
             elem_type = self.get_type_info(type_node.children[0])
             return {'kind': 'array', 'range': range_tuple, 'elem_type': elem_type}
         return 'unknown'
 
+    def _resolve_array_bounds(self, type_node):
+        """Calcula os limites dados por expressões constantes (ex: array[1..MAX] of integer)."""
+        bounds = []
+        valid = True
+        for bound in type_node.leaf:
+            if isinstance(bound, Node):
+                bound_type = self.visit(bound)
+                value = self._constant_value(bound) if bound_type == 'integer' else None
+                if value is None:
+                    if bound_type != 'error':
+                        self.add_error("Os limites de um array devem ser constantes inteiras.", type_node)
+                    valid = False
+                    value = 0
+                bound = value
+            bounds.append(bound)
+        if valid and bounds[0] > bounds[1]:
+            self.add_error(f"Intervalo vazio na declaração do array ({bounds[0]}..{bounds[1]}).", type_node)
+        type_node.leaf = tuple(bounds)
+
     # Subprogramas
     def visit_FunctionDeclarations(self, node):
         for child in node.children: self.visit(child)
@@ -176,7 +247,7 @@ class SemanticAnalyzer:
         else:
             # Extrai assinatura para validar chamadas depois
             params_info = self._extract_params(node.children[0])
-            proc_info = {'kind': 'procedure', 'params': params_info}
+            proc_info = {'kind': 'procedure', 'params': params_info, 'by_ref': self._reference_flags(node.children[0])}
             self.current_scope.add(proc_name, proc_info)
 
         # Cria novo escopo para os parâmetros e variáveis locais
@@ -195,12 +266,13 @@ class SemanticAnalyzer:
             self.add_error(f"Função '{func_name}' já declarada.", node)
         else:
             params_info = self._extract_params(node.children[0])
-            func_info = {'kind': 'function', 'params': params_info, 'return_type': return_type}
+            func_info = {'kind': 'function', 'params': params_info, 'return_type': return_type,
+                         'by_ref': self._reference_flags(node.children[0])}
             self.current_scope.add(func_name, func_info)
 
         self.enter_scope()
         # Em Pascal, o nome da função age como uma variável local para o retorno
-        self.current_scope.add(func_name, {'kind': 'variable', 'type': return_type, 'initialized': False})
+        self.current_scope.add(func_name, {'kind': 'variable', 'type': return_type, 'initialized': False, 'is_return': True})
         self._register_params_in_scope(node.children[0])
 
         if len(node.children) > 2:
@@ -220,6 +292,15 @@ class SemanticAnalyzer:
                     params.append(p_type)
         return params
 
+    def _reference_flags(self, params_node):
+        """Para cada parâmetro (pela ordem da assinatura), se é passado por referência ('var')"""
+        flags = []
+        for param in params_node.children:
+            p_ids = param.children[0]
+            ids = p_ids.children if p_ids.type == 'IDList' else [p_ids]
+            flags += [param.leaf == 'var'] * len(ids)
+        return flags
+
     def _register_params_in_scope(self, params_node):
         """Regista os parâmetros como variáveis locais inicializadas"""
         if params_node.type == 'FormalParameters':
@@ -227,8 +308,13 @@ class SemanticAnalyzer:
                 p_ids = param.children[0]
                 ids = p_ids.children if p_ids.type == 'IDList' else [p_ids]
                 p_type = self.get_type_info(param.children[1])
+                by_ref = param.leaf == 'var'
                 for p_id in ids:
-                    self.current_scope.add(p_id.leaf, {'kind': 'variable', 'type': p_type, 'initialized': True})
+                    if isinstance(p_type, dict) and not by_ref:
+                        # Um array não cabe no slot de um parâmetro: passa-se o endereço
+                        self.add_error(f"O parâmetro '{p_id.leaf}' é um array e tem de ser declarado 'var'.", param)
+                    self.current_scope.add(p_id.leaf, {'kind': 'variable', 'type': p_type, 'initialized': True,
+                                                       'by_ref': by_ref})
 
     # Comandos
     def visit_CompoundStatement(self, node):
@@ -270,6 +356,55 @@ class SemanticAnalyzer:
         self.visit(node.children[1]) # Then
         if len(node.children) > 2: self.visit(node.children[2]) # Else (Opcional)
 
+    def visit_CaseStatement(self, node):
+        # O seletor tem de ser ordinal: inteiro, booleano ou um carácter de uma string (s[i])
+        selector = node.children[0]
+        sel_type = self.visit(selector)
+        ordinal = sel_type in ('integer', 'boolean') or (sel_type == 'string' and selector.type == 'ArrayAccess')
+        if not ordinal and sel_type != 'error':
+            self.add_error(f"O seletor do 'case' deve ser inteiro, booleano ou um carácter, recebeu '{sel_type}'.", selector)
+            sel_type = 'error'
+
+        used = [] # Intervalos (lo, hi) já cobertos por rótulos anteriores
+        for branch in node.children[1:]:
+            if branch.type == 'CaseBranch':
+                for label in branch.children[0].children:
+                    self._check_case_label(label, sel_type, used)
+            self.visit(branch.children[-1])
+
+    def _check_case_label(self, label, sel_type, used):
+        """Rótulos constantes, do tipo do seletor e sem valores repetidos."""
+        bounds = label.children if label.type == 'CaseRange' else [label]
+        for bound in bounds:
+            label_type = self.visit(bound) # Um nome de constante passa a ser o seu literal
+            if label_type == 'error':
+                return
+            if bound.type == 'VariableAccess':
+                self.add_error(f"Rótulo '{bound.leaf}' do 'case' não é uma constante.", label)
+                return
+            if bound.type == 'StringConstant' and len(bound.leaf) != 1:
+                self.add_error(f"Rótulo '{bound.leaf}' do 'case' deve ter um só carácter.", label)
+                return
+            if sel_type != 'error' and label_type != sel_type:
+                self.add_error(f"Rótulo do 'case' do tipo '{label_type}' não corresponde ao seletor ('{sel_type}').", label)
+                return
+
+        lo, hi = case_label_value(bounds[0]), case_label_value(bounds[-1])
+        if lo > hi:
+            self.add_error(f"Intervalo vazio no rótulo do 'case' ({lo}..{hi}).", label)
+            return
+        for other_lo, other_hi in used:
+            if lo <= other_hi and other_lo <= hi:
+                value = max(lo, other_lo)
+                shown = value
+                if bounds[0].type == 'StringConstant':
+                    shown = f"'{chr(value)}'"
+                elif bounds[0].type == 'BooleanConstant':
+                    shown = 'true' if value else 'false'
+                self.add_error(f"Valor {shown} repetido nos rótulos do 'case'.", label)
+                return
+        used.append((lo, hi))
+
     def visit_WhileStatement(self, node):
         cond_type = self.visit(node.children[0])
         if cond_type != 'boolean' and cond_type != 'error':
@@ -281,6 +416,10 @@ class SemanticAnalyzer:
         var_info = self.current_scope.lookup(var_name)
         if not var_info:
             self.add_error(f"Variável de controle '{var_name}' não declarada.", node)
+        elif var_info['kind'] == 'constant':
+            self.add_error(f"A constante '{var_name}' não pode ser a variável de controle do 'for'.", node)
+        elif var_info.get('by_ref'):
+            self.add_error(f"O parâmetro 'var' '{var_name}' não pode ser a variável de controle do 'for'.", node)
         else:
             var_info['initialized'] = True # Variável do for é inicializada automaticamente
 
@@ -300,6 +439,13 @@ class SemanticAnalyzer:
         if not info:
             self.add_error(f"Identificador '{name}' não declarado.", node)
             return 'error' 
+
+        if info['kind'] == 'constant':
+            if self.in_lhs_of_assignment:
+                self.add_error(f"Não é possível alterar a constante '{name}'.", node)
+                return 'error'
+            self._substitute_constant(node, info)
+            return info['type']
         
         # Aviso opcional se usarmos uma variável não inicializada (apenas no lado direito)
         if not self.in_lhs_of_assignment and not info.get('initialized', False):
@@ -315,6 +461,9 @@ class SemanticAnalyzer:
         if not info:
             self.add_error(f"Array '{name}' não declarado.", node)
             return 'error'
+        if info['kind'] == 'constant':
+            self.add_error(f"A constante '{name}' não é indexável.", node)
+            return 'error'
 
         type_info = info['type']
         is_array = isinstance(type_info, dict) and type_info.get('kind') == 'array'
@@ -324,14 +473,87 @@ class SemanticAnalyzer:
             self.add_error(f"Variável '{name}' não é indexável (não é array nem string).", node)
             return 'error'
 
-        # Validação do Índice
-        index_type = self.visit(node.children[0])
-        if index_type != 'integer' and index_type != 'error':
-            self.add_error(f"Índice de array deve ser inteiro.", node.children[0])
+        # Validação dos Índices (são sempre lidos, mesmo em a[i] := ...)
+        in_lhs = self.in_lhs_of_assignment
+        self.in_lhs_of_assignment = False
+        for index in node.children:
+            index_type = self.visit(index)
+            if index_type != 'integer' and index_type != 'error':
+                self.add_error(f"Índice de array deve ser inteiro.", index)
+        self.in_lhs_of_assignment = in_lhs
+
+        dims = self._array_dims(type_info) if is_array else [None]
+        given = len(node.children)
+        if given > len(dims):
+            self.add_error(f"Demasiados índices para '{name}' (no máximo {len(dims)}, recebeu {given}).", node)
+            return 'error'
 
         if is_string: return 'string' # Em Pascal retornaria char, mas simplificamos
+        if len(dims) > 1:
+            self._linearize_index(node, dims)
+        for _ in range(given - 1):
+            type_info = type_info['elem_type']
+        # Com menos índices do que dimensões o resultado é uma linha (ex: passada a um parâmetro 'var')
         return type_info['elem_type']
 
+    # Arrays Multidimensionais (disposição por linhas: o último índice é contíguo)
+    def _array_dims(self, type_info):
+        """Intervalos (lo, hi) de cada dimensão de um array, incluindo os arrays de arrays."""
+        dims = []
+        while isinstance(type_info, dict) and type_info.get('kind') == 'array':
+            dims.append(type_info['range'])
+            type_info = type_info['elem_type']
+        return dims
+
+    def _strides(self, dims):
+        """Distância (em elementos) entre dois valores seguidos do índice de cada dimensão."""
+        strides = [1]
+        for lo, hi in reversed(dims[1:]):
+            strides.insert(0, strides[0] * (hi - lo + 1))
+        return strides
+
+    def _linearize_index(self, node, dims):
+        """
+        Troca os índices de m[i, j, ...] pela posição na memória contígua,
+        i*s1 + j*s2 + ... (um multiplicar-somar por dimensão). O limite inferior
+        combinado fica no tipo linearizado e o gerador subtrai-o como o de um
+        array simples, por isso as parcelas ficam à vista das otimizações.
+        Com menos índices, as dimensões em falta começam no seu limite inferior.
+        Com verificação de limites, cada índice fica dentro de um IndexCheck com
+        o intervalo da sua dimensão: a posição combinada sozinha deixaria passar
+        m[1, 5] num array[1..3, 1..3] (cai dentro de m[2, 2]).
+        """
+        lineno = node.lineno
+        terms = []
+        for k, stride in enumerate(self._strides(dims)):
+            index = node.children[k] if k < len(node.children) else make_constant(dims[k][0] * stride, lineno)
+            if self.bounds_check and k < len(node.children):
+                index = Node('IndexCheck', [index], dims[k], lineno=lineno)
+            if stride != 1 and k < len(node.children):
+                index = Node('BinaryOp', [index, make_constant(stride, lineno)], '*', lineno=lineno)
+            terms.append(index)
+        linear = terms[0]
+        for term in terms[1:]:
+            linear = Node('BinaryOp', [linear, term], '+', lineno=lineno)
+        node.children = [linear]
+
+    def visit_IndexCheck(self, node):
+        return self.visit(node.children[0])
+
+    def _flatten_array_types(self, ast):
+        """Depois da análise, os arrays multidimensionais passam a um só intervalo (lo, hi) linearizado."""
+        for n in walk(ast):
+            if n.type != 'ArrayType' or n.children[0].type != 'ArrayType':
+                continue
+            dims, elem = [], n
+            while elem.type == 'ArrayType':
+                dims.append(elem.leaf)
+                elem = elem.children[0]
+            strides = self._strides(dims)
+            n.leaf = (sum(lo * s for (lo, _), s in zip(dims, strides)),
+                      sum(hi * s for (_, hi), s in zip(dims, strides)))
+            n.children = [elem]
+
     def visit_BinaryOp(self, node):
         left_t = self.visit(node.children[0])
         right_t = self.visit(node.children[1])
@@ -383,6 +605,10 @@ class SemanticAnalyzer:
             return expr_t
         return expr_t
 
+    def visit_VarArgument(self, node):
+        # Argumento já reconhecido como 'var' (variável inteira ou elemento de array)
+        return self.visit_ArrayAccess(node) if node.children else self.visit_VariableAccess(node)
+
     # Literais
     def visit_IntegerConstant(self, node): return 'integer'
     def visit_RealConstant(self, node): return 'real'
@@ -394,8 +620,14 @@ class SemanticAnalyzer:
     def visit_FunctionCall(self, node):
         func_name = node.leaf
         info = self.current_scope.lookup(func_name)
+        if info and info.get('is_return') and self.current_scope.parent:
+            # Dentro da própria função o nome é a variável de retorno; a chamada é recursiva
+            info = self.current_scope.parent.lookup(func_name)
         if not info:
-            if func_name == 'length': return 'integer' # Built-in 'length'
+            if func_name == 'length': # Built-in 'length'
+                for arg in (node.children[0].children if node.children else []):
+                    self.visit(arg)
+                return 'integer'
             self.add_error(f"Função '{func_name}' não declarada.", node)
             return 'error'
         
@@ -404,7 +636,7 @@ class SemanticAnalyzer:
             return 'error'
 
         # Validação de Argumentos
-        self._check_args(node, info['params'], func_name)
+        self._check_args(node, info, func_name)
         return info['return_type']
 
     def visit_ProcedureCall(self, node):
@@ -423,18 +655,17 @@ class SemanticAnalyzer:
             self.add_error(f"'{proc_name}' não é um procedimento.", node)
             return
 
-        self._check_args(node, info['params'], proc_name)
+        self._check_args(node, info, proc_name)
 
-    def _check_args(self, node, expected_params, name):
+    def _check_args(self, node, info, name):
         """Verifica se o número e tipo dos argumentos correspondem à declaração"""
+        expected_params = info['params']
+        by_ref = info.get('by_ref', [False] * len(expected_params))
         args_node = node.children[0] if node.children else None
-        given_args = []
+        args = args_node.children if args_node and args_node.type == 'ArgList' else []
         
         # Coleta tipos dos argumentos passados
-        if args_node and args_node.type == 'ArgList':
-            for arg in args_node.children:
-                t = self.visit(arg)
-                given_args.append(t)
+        given_args = [self.visit(arg) for arg in args]
         
         # Verifica quantidade
         if len(given_args) != len(expected_params):
@@ -443,9 +674,28 @@ class SemanticAnalyzer:
 
         # Verifica tipos individualmente
         for i, (expected, given) in enumerate(zip(expected_params, given_args)):
-            if not self.check_type_compatibility(expected, given):
+            if by_ref[i]:
+                self._check_reference_arg(args[i], expected, given, f"Argumento {i+1} de '{name}'")
+            elif not self.check_type_compatibility(expected, given):
                 self.add_error(f"Argumento {i+1} de '{name}': esperava '{expected}', recebeu '{given}'.", node)
 
+    def _check_reference_arg(self, arg, expected, given, label):
+        """Um argumento 'var' tem de ser uma variável (ou elemento de array) do tipo exato do parâmetro"""
+        if given == 'error':
+            return
+        info = self.current_scope.lookup(arg.leaf) if arg.type in ('VariableAccess', 'ArrayAccess', 'VarArgument') else None
+        element = arg.type != 'VariableAccess' and bool(arg.children)
+        if not info or (element and not isinstance(info['type'], dict)):
+            # Expressões, constantes (já substituídas) e caracteres de strings não têm endereço
+            self.add_error(f"{label} é 'var': tem de ser uma variável ou um elemento de array.", arg)
+            return
+        if given != expected:
+            self.add_error(f"{label} é 'var': esperava uma variável do tipo '{expected}', recebeu '{given}'.", arg)
+            return
+        # O gerador passa o endereço; as otimizações sabem que a chamada pode escrever nele
+        arg.type = 'VarArgument'
+        info['initialized'] = True
+
     # Operações de I/O
     def visit_ReadStatement(self, node):
         for var in node.children:
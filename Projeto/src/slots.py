@@ -0,0 +1,174 @@
+from parser import Node
+from astutils import ProgramInfo, walk, is_scalar, case_bodies
+from liveness import Liveness
+
+
+class InterferenceGraph:
+    """
+    Grafo de interferência de um escopo, construído a partir da liveness:
+    duas variáveis interferem se estão vivas ao mesmo tempo em algum ponto
+    do corpo. Uma escrita conta como viva no ponto a seguir (mesmo que o
+    valor não volte a ser lido), para não ser feita no slot de outra variável.
+    """
+    def __init__(self, scope, info, candidates):
+        self.liveness = Liveness(scope, info)
+        self.candidates = candidates
+        self.edges = {name: set() for name in candidates}
+        self.entry_live = self.walk(scope.body, self.liveness.exit_live())
+        self._clique(self.entry_live)
+
+    def interferes(self, a, b):
+        return b in self.edges.get(a, ())
+
+    def _clique(self, live):
+        names = [name for name in live if name in self.candidates]
+        for name in names:
+            self.edges[name].update(other for other in names if other != name)
+
+    def _defined(self, target):
+        return {target.leaf} if target.type == 'VariableAccess' else set()
+
+    def walk(self, node, live_out):
+        """Percorre o corpo para trás, registando cada conjunto vivo. Devolve o conjunto à entrada."""
+        liveness = self.liveness
+        if node is None:
+            return set(live_out)
+        if node.type == 'CompoundStatement':
+            live = set(live_out)
+            for child in reversed(node.children):
+                live = self.walk(child, live)
+            return live
+        if node.type == 'AssignmentStatement':
+            self._clique(live_out | self._defined(node.children[0]))
+        elif node.type == 'ReadStatement':
+            defined = set()
+            for var in node.children:
+                defined |= self._defined(var)
+            self._clique(live_out | defined)
+        elif node.type == 'IfStatement':
+            self.walk(node.children[1], live_out)
+            if len(node.children) > 2:
+                self.walk(node.children[2], live_out)
+        elif node.type == 'CaseStatement':
+            for body in case_bodies(node):
+                self.walk(body, live_out)
+        elif node.type == 'WhileStatement':
+            head = liveness.loop_head(node, live_out)
+            self.walk(node.children[1], head)
+            self._clique(head)
+        elif node.type == 'ForStatement':
+            head = liveness.loop_head(node, live_out)
+            after_init = head | {node.children[0].leaf}
+            self.walk(node.children[3], liveness.body_live_out(node, head))
+            self._clique(after_init)
+        self._clique(live_out)
+        live_in = liveness.live_in(node, live_out)
+        self._clique(live_in)
+        return live_in
+
+
+class SlotAllocator:
+    """
+    Partilha de slots entre variáveis com tempos de vida disjuntos
+    (coloração do grafo de interferência).
+    Candidatas: escalares locais e temporárias do compilador de cada
+    subprograma e, no programa principal, as globais que nenhum subprograma
+    usa. Ficam de fora os parâmetros, a variável de retorno e as variáveis
+    lidas antes de escritas (dependem do zero inicial do PUSHN).
+    A coloração é gulosa, pela ordem das declarações: cada variável junta-se
+    ao primeiro grupo do mesmo tipo com que não interfere e passa a usar o
+    nome (e o slot) do primeiro membro. As cópias 'x := x' que resultam
+    disto desaparecem.
+    """
+    def __init__(self):
+        self.frames = [] # (escopo, slots antes, slots depois)
+        self.merged = 0 # Variáveis que deixaram de ter slot próprio
+
+    def run(self, ast):
+        """Executa a passagem sobre todo o programa. Devolve True se algo mudou."""
+        before = self.merged
+        info = ProgramInfo(ast)
+        used_by_subprograms = set()
+        for sub in info.subprograms.values():
+            used_by_subprograms |= {n.leaf for n in walk(sub.body)
+                                    if n.type in ('VariableAccess', 'ArrayAccess', 'VarArgument')
+                                    and n.leaf not in sub.variables}
+
+        for scope in info.scopes():
+            excluded = set(scope.params) | {scope.name}
+            if scope.is_global:
+                excluded |= used_by_subprograms
+            candidates = [name for name, var_type in scope.variables.items()
+                          if is_scalar(var_type) and name not in excluded]
+            slots_before = self._frame_size(scope)
+            if len(candidates) > 1:
+                graph = InterferenceGraph(scope, info, set(candidates))
+                candidates = [name for name in candidates if name not in graph.entry_live]
+                renames = self._color(scope, candidates, graph)
+                if renames:
+                    self._apply(scope, renames)
+            self.frames.append((scope.name, slots_before, self._frame_size(scope)))
+        return self.merged != before
+
+    def _frame_size(self, scope):
+        size = 0
+        for decl in scope.declarations.children:
+            if decl.type != 'Declaration':
+                continue
+            id_list, type_node = decl.children
+            count = len(id_list.children) if id_list.type == 'IDList' else 1
+            if type_node.type == 'ArrayType':
+                lo, hi = type_node.leaf
+                count *= hi - lo + 1
+            size += count
+        return size
+
+    # Coloração
+    def _color(self, scope, candidates, graph):
+        groups = [] # (tipo, [membros]); o primeiro membro dá o nome
+        renames = {}
+        for name in candidates:
+            var_type = scope.variables[name]
+            for group_type, members in groups:
+                if group_type == var_type and not any(graph.interferes(name, m) for m in members):
+                    members.append(name)
+                    renames[name] = members[0]
+                    break
+            else:
+                groups.append((var_type, [name]))
+        return renames
+
+    # Reescrita
+    def _apply(self, scope, renames):
+        for n in walk(scope.body):
+            if n.type in ('VariableAccess', 'VarArgument') and n.leaf in renames:
+                n.leaf = renames[n.leaf]
+        scope.block.children[2] = self._drop_self_copies(scope.body)
+
+        for decl in list(scope.declarations.children):
+            if decl.type != 'Declaration' or decl.children[0].type != 'IDList':
+                continue
+            id_list = decl.children[0]
+            id_list.children = [id_node for id_node in id_list.children if id_node.leaf not in renames]
+            if not id_list.children:
+                scope.declarations.children.remove(decl)
+        self.merged += len(renames)
+
+    def _drop_self_copies(self, node):
+        if node.type == 'CompoundStatement':
+            node.children = [self._drop_self_copies(child) for child in node.children
+                             if not self._is_self_copy(child)]
+            return node
+        for i, child in enumerate(node.children):
+            if isinstance(child, Node):
+                if self._is_self_copy(child):
+                    node.children[i] = Node('Empty', [], None, lineno=child.lineno)
+                else:
+                    node.children[i] = self._drop_self_copies(child)
+        return node
+
+    def _is_self_copy(self, node):
+        if node.type != 'AssignmentStatement':
+            return False
+        target, expr = node.children
+        return target.type == 'VariableAccess' and expr.type == 'VariableAccess' and target.leaf == expr.leaf
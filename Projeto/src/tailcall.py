@@ -0,0 +1,255 @@
+from parser import Node
+from astutils import walk, has_calls, used_vars, make_int, make_bool, case_bodies, case_has_else
+from callgraph import CallGraph
+from liveness import Liveness
+
+# Operações associativas e comutativas aceites na recursão com acumulador (e o seu neutro)
+ACCUMULATOR_OPS = {'+': 0, '*': 1}
+
+
+class TailCallEliminator:
+    """
+    Eliminação de chamadas recursivas em cauda.
+    Um subprograma cujas auto-chamadas estão em posição de cauda é reescrito como
+
+        $cont := true;
+        while $cont do begin
+            $cont := false;
+            <corpo, com cada chamada em cauda trocada por
+             'parâmetros := argumentos; $cont := true'>
+        end
+
+    e passa a usar uma única frame. Nas funções aceita-se também a recursão com
+    acumulador (f := e + f(...), f := f(...) * e, ...) quando todos os caminhos
+    terminam numa atribuição ao nome da função: o valor de 'e' junta-se a
+    '$acc' e os casos base passam a 'f := $acc op base'.
+    """
+    def __init__(self):
+        self.count = 0 # Chamadas em cauda eliminadas
+        self.converted = [] # Subprogramas transformados em ciclo
+
+    def run(self, ast):
+        """Executa a passagem sobre todos os subprogramas. Devolve True se algo mudou."""
+        before = self.count
+        graph = CallGraph(ast)
+        for scope in graph.info.subprograms.values():
+            if scope.name in graph.callees(scope.name):
+                self.graph = graph
+                self.scope = scope
+                self.transform(scope)
+        return self.count != before
+
+    # Deteção
+    def _is_self_call(self, node):
+        return node is not None and node.type in ('FunctionCall', 'ProcedureCall') \
+            and self.graph.resolve(node.leaf) == self.scope.name
+
+    def _self_calls(self, node):
+        return [n for n in walk(node) if self._is_self_call(n)]
+
+    def _tail_leaves(self, node, leaves):
+        """
+        Junta as instruções em posição de cauda (depois delas o corpo termina).
+        Devolve False se algum caminho termina sem nenhuma instrução.
+        """
+        if node is None or node.type == 'Empty':
+            return False
+        if node.type == 'CompoundStatement':
+            children = [c for c in node.children if c.type != 'Empty']
+            return bool(children) and self._tail_leaves(children[-1], leaves)
+        if node.type == 'IfStatement':
+            complete = self._tail_leaves(node.children[1], leaves)
+            if len(node.children) > 2:
+                return self._tail_leaves(node.children[2], leaves) and complete
+            return False
+        if node.type == 'CaseStatement':
+            complete = [self._tail_leaves(body, leaves) for body in case_bodies(node)]
+            return all(complete) and case_has_else(node)
+        leaves.append(node)
+        return True
+
+    def _classify(self, stmt):
+        """
+        Tipo de uma instrução em cauda:
+          ('tail', chamada)        p(...) ou f := f(...)
+          ('acc', chamada, op, e)  f := e op f(...) ou f := f(...) op e
+          ('base', expr)           f := expr (sem auto-chamadas)
+          None                     qualquer outra
+        """
+        name = self.scope.name
+        if stmt.type == 'ProcedureCall' and self._is_self_call(stmt):
+            return ('tail', stmt)
+        if stmt.type != 'AssignmentStatement':
+            return None
+        target, expr = stmt.children
+        if target.type != 'VariableAccess' or target.leaf != name:
+            return None
+        if self._is_self_call(expr):
+            return ('tail', expr)
+        if not self._self_calls(expr):
+            return ('base', expr)
+        if expr.type == 'BinaryOp' and expr.leaf in ACCUMULATOR_OPS:
+            left, right = expr.children
+            call, other = (right, left) if self._is_self_call(right) else (left, right)
+            if self._is_self_call(call) and self._accumulable(other):
+                return ('acc', call, expr.leaf, other)
+        return None
+
+    def _accumulable(self, expr):
+        """
+        A parte que se acumula tem de dar o mesmo valor antes ou depois da
+        chamada recursiva: sem chamadas e só com parâmetros/locais desta frame
+        (um parâmetro 'var' pode ser alterado pela própria chamada).
+        """
+        own = set(self.scope.variables) - self.scope.references - {self.scope.name}
+        return not has_calls(expr) and used_vars(expr) <= own
+
+    # Transformação
+    def transform(self, scope):
+        if any(isinstance(t, dict) for name, t in scope.variables.items() if name not in scope.references):
+            return # Locais array não se reatribuem
+        body = scope.body
+        leaves = []
+        complete = self._tail_leaves(body, leaves)
+        kinds = [self._classify(leaf) for leaf in leaves]
+        if not all(self._same_references(kind[1]) for kind in kinds if kind and kind[0] in ('tail', 'acc')):
+            return # Um parâmetro 'var' não se pode reapontar sem mudar de frame
+        tails = [(leaf, kind) for leaf, kind in zip(leaves, kinds) if kind and kind[0] == 'tail']
+        accs = [(leaf, kind) for leaf, kind in zip(leaves, kinds) if kind and kind[0] == 'acc']
+
+        acc_op = None
+        if accs and self._accumulator_ok(body, leaves, kinds, complete):
+            acc_op = accs[0][1][2]
+        else:
+            accs = []
+        if not tails and not accs:
+            return
+
+        # Reescreve cada folha; as restantes ficam iguais (ou usam o acumulador, nos casos base)
+        replacements = {}
+        for leaf, kind in tails + accs:
+            replacements[id(leaf)] = self._jump_back(leaf, kind, acc_op)
+        if acc_op:
+            for leaf, kind in zip(leaves, kinds):
+                if kind[0] == 'base':
+                    self._use_accumulator(leaf, acc_op)
+        body = self._replace(body, replacements)
+
+        # Se todos os caminhos acabam a atribuir o resultado, a última iteração escreve-o sempre
+        result_written = complete and all(kind is not None for kind in kinds)
+
+        self.count += len(tails) + len(accs)
+        self.converted.append(scope.name)
+        scope.block.children[2] = self._loop(scope, body, acc_op, result_written)
+
+    def _accumulator_ok(self, body, leaves, kinds, complete):
+        """Todos os caminhos acabam em f := ..., com uma só operação e f não é usado noutro lado."""
+        if not complete or any(kind is None for kind in kinds):
+            return False
+        ops = {kind[2] for kind in kinds if kind[0] == 'acc'}
+        if len(ops) != 1:
+            return False
+        leaf_ids = {id(leaf) for leaf in leaves}
+        name = self.scope.name
+        for n in walk(body):
+            if n.type == 'AssignmentStatement' and n.children[0].leaf == name and id(n) not in leaf_ids:
+                return False
+            if self._is_self_call(n) and not any(n is kind[1] for kind in kinds if kind[0] != 'base'):
+                return False # Há recursão fora da cauda
+        for leaf, kind in zip(leaves, kinds):
+            if name in used_vars(kind[-1] if kind[0] != 'tail' else kind[1]):
+                return False
+        return True
+
+    def _same_references(self, call):
+        """Cada parâmetro 'var' recebe, na chamada em cauda, a própria variável."""
+        args = call.children[0].children if call.children else []
+        return all(arg.type == 'VarArgument' and arg.leaf == param and not arg.children
+                   for param, arg in zip(self.scope.params, args) if param in self.scope.references)
+
+    def _jump_back(self, leaf, kind, acc_op):
+        """Instruções que substituem uma chamada em cauda."""
+        lineno = leaf.lineno
+        call = kind[1]
+        stmts = []
+        if kind[0] == 'acc':
+            acc = Node('VariableAccess', [], '$acc', lineno=lineno)
+            value = Node('BinaryOp', [Node('VariableAccess', [], '$acc', lineno=lineno), kind[3]], acc_op, lineno=lineno)
+            stmts.append(Node('AssignmentStatement', [acc, value], lineno=lineno))
+        stmts += self._reassign_params(call, lineno)
+        stmts.append(Node('AssignmentStatement',
+                          [Node('VariableAccess', [], '$cont', lineno=lineno), make_bool(True, lineno)],
+                          lineno=lineno))
+        return Node('CompoundStatement', stmts, lineno=lineno)
+
+    def _reassign_params(self, call, lineno):
+        """
+        Atribui os argumentos aos parâmetros. Um argumento que leia um parâmetro
+        já reatribuído antes dele passa por uma temporária avaliada primeiro.
+        """
+        params = self.scope.params
+        args = call.children[0].children if call.children else []
+        all_temps = any(has_calls(arg) for arg in args)
+
+        temps, direct = [], []
+        for i, (param, arg) in enumerate(zip(params, args)):
+            if param in self.scope.references or (arg.type == 'VariableAccess' and arg.leaf == param):
+                continue # p := p (os parâmetros 'var' já apontam para o mesmo sítio)
+            earlier = set(params[:i])
+            if all_temps or used_vars(arg) & earlier:
+                temp = f'$arg_{param}'
+                if temp not in self.scope.variables:
+                    self.scope.declare(temp, self.scope.type_nodes[param])
+                temps.append(Node('AssignmentStatement',
+                                  [Node('VariableAccess', [], temp, lineno=lineno), arg], lineno=lineno))
+                arg = Node('VariableAccess', [], temp, lineno=lineno)
+            direct.append(Node('AssignmentStatement',
+                               [Node('VariableAccess', [], param, lineno=lineno), arg], lineno=lineno))
+        return temps + direct
+
+    def _use_accumulator(self, leaf, acc_op):
+        lineno = leaf.lineno
+        leaf.children[1] = Node('BinaryOp', [Node('VariableAccess', [], '$acc', lineno=lineno), leaf.children[1]],
+                                acc_op, lineno=lineno)
+
+    def _replace(self, node, replacements):
+        if id(node) in replacements:
+            return replacements[id(node)]
+        for i, child in enumerate(node.children):
+            if isinstance(child, Node):
+                node.children[i] = self._replace(child, replacements)
+        return node
+
+    def _loop(self, scope, body, acc_op, result_written):
+        """Envolve o corpo no ciclo 'while $cont'."""
+        lineno = body.lineno
+        bool_type = Node('BasicType', [], 'boolean')
+        scope.declare('$cont', bool_type)
+
+        prologue = []
+        if acc_op:
+            scope.declare('$acc', scope.type_nodes[scope.name])
+            prologue.append(Node('AssignmentStatement',
+                                 [Node('VariableAccess', [], '$acc', lineno=lineno),
+                                  make_int(ACCUMULATOR_OPS[acc_op], lineno)], lineno=lineno))
+        prologue.append(Node('AssignmentStatement',
+                             [Node('VariableAccess', [], '$cont', lineno=lineno), make_bool(True, lineno)],
+                             lineno=lineno))
+
+        # Cada iteração corresponde a uma frame nova: locais lidos antes de escritos voltam a zero
+        liveness = Liveness(scope)
+        live_entry = liveness.live_in(body, set() if result_written else liveness.exit_live())
+        resets = []
+        for name in scope.variables:
+            if name in scope.params or name.startswith('$') or name not in live_entry:
+                continue
+            zero = make_bool(False, lineno) if scope.variables[name] == 'boolean' else make_int(0, lineno)
+            resets.append(Node('AssignmentStatement', [Node('VariableAccess', [], name, lineno=lineno), zero],
+                               lineno=lineno))
+
+        loop_body = Node('CompoundStatement',
+                         [Node('AssignmentStatement',
+                               [Node('VariableAccess', [], '$cont', lineno=lineno), make_bool(False, lineno)],
+                               lineno=lineno)] + resets + [body], lineno=lineno)
+        loop = Node('WhileStatement', [Node('VariableAccess', [], '$cont', lineno=lineno), loop_body], lineno=lineno)
+        return Node('CompoundStatement', prologue + [loop], lineno=lineno)
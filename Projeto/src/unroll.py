@@ -0,0 +1,176 @@
+import copy
+from parser import Node
+from astutils import ProgramInfo, walk, has_calls, assigned_vars, used_vars, reference_args, is_int, make_int
+
+# Ciclos com até este número de iterações são desenrolados por completo
+FULL_UNROLL_TRIPS = 8
+# Fator por omissão do desenrolamento parcial
+DEFAULT_UNROLL_FACTOR = 4
+# Limite de crescimento: nós da AST do código desenrolado
+MAX_UNROLLED_SIZE = 240
+
+
+class LoopUnroller:
+    """
+    Desenrolamento de ciclos FOR com limites constantes.
+      * Poucas iterações: o ciclo é substituído por uma cópia do corpo por
+        iteração, com a variável de controlo trocada pela constante, para que
+        a dobragem e a propagação atuem em cada cópia.
+      * Mais iterações: o corpo é repetido 'factor' vezes dentro de um WHILE
+        (a cópia k usa 'i + k' e a variável avança uma vez por bloco), e as
+        iterações que sobram são desenroladas a seguir com constantes.
+    No fim a variável de controlo fica com o mesmo valor que o ciclo original
+    deixaria (limite + 1 ou limite - 1). O crescimento do código é limitado
+    por MAX_UNROLLED_SIZE.
+    """
+    def __init__(self, factor=DEFAULT_UNROLL_FACTOR):
+        self.factor = factor
+        self.unrolled = [] # (linha, variável, iterações, descrição)
+
+    @property
+    def count(self):
+        return len(self.unrolled)
+
+    def run(self, ast):
+        """Executa a passagem sobre todo o programa. Devolve True se algo mudou."""
+        before = self.count
+        info = ProgramInfo(ast)
+        self.call_reads = self._globals_read_by_calls(info)
+        self.call_writes = info.globals_written()
+        for scope in info.scopes():
+            self.scope = scope
+            scope.block.children[2] = self.statement(scope.body)
+        return self.count != before
+
+    def _globals_read_by_calls(self, info):
+        names = set()
+        for sub in info.subprograms.values():
+            names |= {n.leaf for n in walk(sub.body)
+                      if n.type in ('VariableAccess', 'ArrayAccess', 'VarArgument') and n.leaf not in sub.variables}
+        return names
+
+    def _writes(self, body):
+        """Variáveis que o corpo pode alterar: atribuições, argumentos 'var' e chamadas."""
+        written = self.scope.aliases(assigned_vars(body) | reference_args(body))
+        if has_calls(body):
+            written |= self.scope.call_clobbered(self.call_writes)
+        return written
+
+    def _size(self, node):
+        return sum(1 for _ in walk(node))
+
+    # Percurso (ciclos interiores primeiro)
+    def statement(self, node):
+        if node is None:
+            return node
+        for i, child in enumerate(node.children):
+            if isinstance(child, Node):
+                node.children[i] = self.statement(child)
+        if node.type == 'ForStatement':
+            return self.unroll(node)
+        return node
+
+    def unroll(self, node):
+        var_node, start, limit, body = node.children
+        if not (is_int(start) and is_int(limit)):
+            return node
+        var = var_node.leaf
+        if var in self._writes(body):
+            return node # O corpo mexe na variável de controlo
+
+        step = 1 if node.leaf == 'to' else -1
+        trips = (limit.leaf - start.leaf) * step + 1
+        if trips <= 0:
+            return node
+        # Se alguma chamada no corpo (ou um parâmetro 'var' que partilhe a memória) pode
+        # ler a variável, ela tem de estar sempre atualizada
+        aliases = self.scope.aliases({var})
+        visible = (has_calls(body) and not self.scope.is_local(var) and bool(aliases & self.call_reads)) or \
+            bool((aliases - {var}) & used_vars(body))
+
+        body_size = self._size(body)
+        if trips <= FULL_UNROLL_TRIPS and trips * body_size <= MAX_UNROLLED_SIZE:
+            return self._full(node, trips, step, visible)
+        if self.factor > 1 and trips >= 2 * self.factor and self.factor * body_size <= MAX_UNROLLED_SIZE:
+            return self._partial(node, trips, step, visible)
+        return node
+
+    # Construção das Cópias
+    def _assign(self, var, value, lineno):
+        return Node('AssignmentStatement', [Node('VariableAccess', [], var, lineno=lineno), value], lineno=lineno)
+
+    def _copy_with(self, body, var, replacement):
+        """Cópia do corpo com cada leitura da variável de controlo trocada por 'replacement'."""
+        clone = copy.deepcopy(body)
+        return self._substitute(clone, var, replacement)
+
+    def _substitute(self, node, var, replacement):
+        if node.type == 'VariableAccess' and node.leaf == var:
+            result = copy.deepcopy(replacement)
+            result.lineno = node.lineno
+            return result
+        for i, child in enumerate(node.children):
+            if isinstance(child, Node):
+                node.children[i] = self._substitute(child, var, replacement)
+        return node
+
+    def _constant_copies(self, body, var, first, count, step, visible, lineno):
+        stmts = []
+        for k in range(count):
+            value = first + k * step
+            if visible:
+                stmts.append(self._assign(var, make_int(value, lineno), lineno))
+                stmts.append(copy.deepcopy(body))
+            else:
+                stmts.append(self._copy_with(body, var, make_int(value, lineno)))
+        return stmts
+
+    def _full(self, node, trips, step, visible):
+        var_node, start, limit, body = node.children
+        lineno = node.lineno
+        stmts = self._constant_copies(body, var_node.leaf, start.leaf, trips, step, visible, lineno)
+        stmts.append(self._assign(var_node.leaf, make_int(limit.leaf + step, lineno), lineno))
+        self.unrolled.append((lineno, var_node.leaf, trips, 'total'))
+        return Node('CompoundStatement', stmts, lineno=lineno)
+
+    def _partial(self, node, trips, step, visible):
+        var_node, start, limit, body = node.children
+        var = var_node.leaf
+        lineno = node.lineno
+        factor = self.factor
+        blocks, rest = divmod(trips, factor)
+        op = '+' if step > 0 else '-'
+
+        def var_access():
+            return Node('VariableAccess', [], var, lineno=lineno)
+
+        def advance(amount):
+            return self._assign(var, Node('BinaryOp', [var_access(), make_int(amount, lineno)], op, lineno=lineno),
+                                lineno)
+
+        # Bloco com 'factor' cópias do corpo
+        block = []
+        for k in range(factor):
+            if visible:
+                block.append(copy.deepcopy(body))
+                block.append(advance(1))
+            else:
+                offset = var_access() if k == 0 else \
+                    Node('BinaryOp', [var_access(), make_int(k, lineno)], op, lineno=lineno)
+                block.append(self._copy_with(body, var, offset))
+        if not visible:
+            block.append(advance(factor))
+
+        # O último bloco completo começa em start + (blocks - 1) * factor
+        last_block = start.leaf + (blocks - 1) * factor * step
+        cond = Node('BinaryOp', [var_access(), make_int(last_block, lineno)], '<=' if step > 0 else '>=',
+                    lineno=lineno)
+        loop = Node('WhileStatement', [cond, Node('CompoundStatement', block, lineno=lineno)], lineno=lineno)
+
+        stmts = [self._assign(var, make_int(start.leaf, lineno), lineno), loop]
+        remainder_start = start.leaf + blocks * factor * step
+        stmts += self._constant_copies(body, var, remainder_start, rest, step, visible, lineno)
+        if rest or visible:
+            stmts.append(self._assign(var, make_int(limit.leaf + step, lineno), lineno))
+        self.unrolled.append((lineno, var, trips, f'parcial x{factor}' + (f' + {rest}' if rest else '')))
+        return Node('CompoundStatement', stmts, lineno=lineno)
@@ -0,0 +1,54 @@
+program Menu;
+{ Teste da instrução case. Os rótulos de 'executa' são densos (0..7) e o
+  despacho usa uma tabela de saltos; os de 'custo' são esparsos e geram uma
+  pesquisa binária. Também há rótulos com intervalos, um seletor de
+  carácter e um ramo else. }
+var
+    op, saldo: integer;
+    comando: string;
+
+function custo(codigo: integer): integer;
+begin
+    case codigo of
+        1, 2, 3: custo := 5;
+        10..19: custo := 20;
+        100: custo := 50;
+        250: custo := 75;
+        1000: custo := 200
+    else
+        custo := 0
+    end
+end;
+
+procedure executa(op: integer);
+var
+    i: integer;
+begin
+    case op of
+        0: saldo := 0;
+        1: saldo := saldo + 10;
+        2: saldo := saldo - 5;
+        3: saldo := saldo * 2;
+        4: for i := 1 to 3 do saldo := saldo + i;
+        5: saldo := saldo + custo(100);
+        6, 7: saldo := saldo - op
+    else
+        writeln('Opção inválida: ', op)
+    end
+end;
+
+begin
+    saldo := 0;
+    for op := 0 to 8 do
+        executa(op);
+    writeln('Saldo: ', saldo);
+    writeln('Custos: ', custo(2) + custo(15) + custo(250) + custo(1000) + custo(7));
+    comando := 'a9+';
+    for op := 1 to length(comando) do
+        case comando[op] of
+            'a'..'z': write('letra ');
+            '0'..'9': write('dígito ');
+            '+', '-': write('sinal ')
+        end;
+    writeln('')
+end.
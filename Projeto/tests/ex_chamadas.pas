@@ -0,0 +1,35 @@
+program Chamadas;
+{ Teste de carga da convenção de chamada: um milhão de chamadas num ciclo.
+  O chamador retira os argumentos e o subprograma os seus locais, por isso
+  a pilha da VM tem a mesma altura no fim de cada iteração. }
+var
+    i, total: integer;
+
+procedure acumula(k: integer);
+var
+    resto: integer;
+begin
+    resto := k mod 3;
+    if k < 0 then
+        begin
+            acumula(-k);
+            resto := 0
+        end;
+    total := total + resto
+end;
+
+function digito(k: integer): integer;
+begin
+    if k < 0 then
+        digito := digito(-k)
+    else
+        digito := k mod 10
+end;
+
+begin
+    total := 0;
+    for i := 1 to 1000000 do
+        acumula(i);
+    writeln('Total: ', total);
+    writeln('Dígito: ', digito(total) + digito(-7))
+end.
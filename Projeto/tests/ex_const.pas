@@ -0,0 +1,40 @@
+program Constantes;
+{ Teste das declarações const. Os valores são calculados na compilação e
+  cada uso é trocado pelo literal: as constantes não ocupam memória na VM,
+  servem de limites de arrays e de rótulos de um case. }
+const
+    N = 8;
+    MEIO = N div 2;
+    MINIMO = -MEIO;
+    TITULO = 'Tabela';
+    MOSTRAR = N > MEIO;
+var
+    quadrados: array[1..N] of integer;
+    desvios: array[MINIMO..MEIO] of integer;
+    i, total: integer;
+
+function escala(k: integer): integer;
+const
+    FATOR = 3;
+begin
+    escala := k * FATOR + N
+end;
+
+begin
+    total := 0;
+    for i := 1 to N do
+    begin
+        quadrados[i] := i * i;
+        total := total + quadrados[i]
+    end;
+    for i := MINIMO to MEIO do
+        desvios[i] := escala(i);
+    if MOSTRAR then
+        writeln(TITULO, ': ', total, ' ', desvios[MINIMO], ' ', desvios[MEIO]);
+    case total mod N of
+        0: writeln('múltiplo de ', N);
+        1..MEIO: writeln('resto pequeno')
+    else
+        writeln('resto grande')
+    end
+end.
@@ -0,0 +1,47 @@
+program CurtoCircuito;
+{ Teste da avaliação em curto-circuito do AND/OR. O operando da direita só
+  corre quando o da esquerda não decide o resultado: a divisão protegida
+  por (d <> 0) nunca divide por zero e as chamadas com efeitos colaterais
+  à direita só contam quando são avaliadas. O mesmo vale para um AND/OR
+  usado como valor, numa atribuição ou no resultado de uma função. Com
+  d = 0 escreve 7, 2, 2, 'protegido' e 'sem divisao' duas vezes. }
+var
+    d, r, chamadas: integer;
+    ok: boolean;
+
+function quociente(a, b: integer): integer;
+begin
+    quociente := a div b
+end;
+
+function divide_bem(d: integer): boolean;
+begin
+    divide_bem := (d <> 0) and (10 div d > 1)
+end;
+
+function positivo(x: integer): boolean;
+begin
+    chamadas := chamadas + 1;
+    positivo := x > 0
+end;
+
+begin
+    readln(d);
+    r := 7;
+    if (d <> 0) and (quociente(10, d) > 1) then
+        r := quociente(10, d);
+    writeln('Resultado: ', r);
+    chamadas := 0;
+    ok := positivo(1) and positivo(-1) and positivo(2);
+    writeln('Chamadas (and): ', chamadas);
+    chamadas := 0;
+    ok := positivo(-1) or positivo(1) or positivo(2);
+    writeln('Chamadas (or): ', chamadas);
+    if (d = 0) or (quociente(20, d) < 5) then
+        writeln('protegido');
+    ok := (d <> 0) and (r div d > 1);
+    if not ok then
+        writeln('sem divisao');
+    if not divide_bem(d) then
+        writeln('sem divisao')
+end.
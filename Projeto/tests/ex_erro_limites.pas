@@ -0,0 +1,29 @@
+program Limites;
+{ Teste do --bounds-check com a variável de controlo alterada por um
+  subprograma. 'recua' escreve g durante o ciclo, por isso o intervalo
+  1..5 de g deixa de valer e o acesso a[g] mantém a verificação: na
+  segunda iteração g vale -1 e a execução pára com índice fora dos
+  limites. }
+var
+    a: array[1..5] of integer;
+    g, s, x: integer;
+
+procedure recua;
+begin
+    g := g - 3
+end;
+
+begin
+    for g := 1 to 5 do
+        a[g] := g;
+    s := 0;
+    x := 0;
+    for g := 1 to 5 do
+    begin
+        s := s + a[g];
+        x := x + 1;
+        if x < 4 then
+            recua()
+    end;
+    writeln('Soma: ', s)
+end.
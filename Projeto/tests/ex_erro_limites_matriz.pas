@@ -0,0 +1,16 @@
+program LimitesMatriz;
+{ Teste do --bounds-check num array multidimensional. Cada índice é
+  verificado no intervalo da sua dimensão antes de ser multiplicado pelo
+  passo: m[1, 5] tem posição combinada 1*3 + 5 = 8, dentro de 4..12 (é o
+  lugar de m[2, 2]), mas 5 não cabe em 1..3 e a execução pára em vez de
+  escrever por cima de m[2, 2]. Com i = 1 e j = 5 não escreve nada. }
+var
+    m: array[1..3, 1..3] of integer;
+    i, j: integer;
+
+begin
+    read(i);
+    read(j);
+    m[i, j] := 99;
+    writeln('m[2, 2] = ', m[2, 2])
+end.
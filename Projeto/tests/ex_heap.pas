@@ -0,0 +1,56 @@
+program Heap;
+{ Teste dos arrays no heap. Compilar com um limite pequeno, por exemplo
+  --heap-threshold 8: os arrays com mais de 8 elementos ficam num bloco
+  do heap (ALLOC) e o slot guarda só o endereço; os mais pequenos ficam na
+  pilha. Cada chamada de 'profundidade' aloca o seu próprio bloco e
+  liberta-o (FREE) à saída, por isso os valores de cada nível sobrevivem à
+  chamada recursiva. O array global no heap é passado a parâmetros 'var'
+  pelo endereço. Com n = 5 escreve 420, 10 e 15. }
+var
+    v: array[1..20] of integer;
+    pequeno: array[1..4] of integer;
+    i, n, total: integer;
+
+procedure preenche(var a: array[1..20] of integer; passo: integer);
+var
+    i: integer;
+begin
+    for i := 1 to 20 do
+        a[i] := i * passo
+end;
+
+function soma(var a: array[1..20] of integer): integer;
+var
+    i: integer;
+begin
+    soma := 0;
+    for i := 1 to 20 do
+        soma := soma + a[i]
+end;
+
+function profundidade(n: integer): integer;
+var
+    local: array[1..10] of integer;
+    i: integer;
+begin
+    for i := 1 to 10 do
+        local[i] := n;
+    if n > 0 then
+        profundidade := profundidade(n - 1) + local[10]
+    else
+        profundidade := local[1]
+end;
+
+begin
+    readln(n);
+    preenche(v, 2);
+    writeln('Soma: ', soma(v));
+    total := 0;
+    for i := 1 to 4 do
+    begin
+        pequeno[i] := i;
+        total := total + pequeno[i]
+    end;
+    writeln('Pilha: ', total);
+    writeln('Recursão: ', profundidade(n))
+end.
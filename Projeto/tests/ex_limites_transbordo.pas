@@ -0,0 +1,36 @@
+program Transbordo;
+{ Teste da análise de intervalos do --bounds-check com valores enormes. O
+  ramo do IF eleva x ao quadrado doze vezes e soma n (lido): os limites
+  calculados saem dos inteiros da VM e passam a infinito em vez de
+  crescerem sem fim. Os ciclos sobre 'a' continuam provados e a compilação
+  não falha. Com n = 1 o ramo não corre e escreve 65. }
+var
+    a: array[1..10] of integer;
+    x, n, i, s: integer;
+
+begin
+    read(n);
+    x := 10;
+    if n > 100 then
+    begin
+        x := x * x;
+        x := x * x;
+        x := x * x;
+        x := x * x;
+        x := x * x;
+        x := x * x;
+        x := x * x;
+        x := x * x;
+        x := x * x;
+        x := x * x;
+        x := x * x;
+        x := x * x;
+        x := x + n
+    end;
+    for i := 1 to 10 do
+        a[i] := i;
+    s := 0;
+    for i := 1 to 10 do
+        s := s + a[i];
+    writeln('Soma: ', s + x)
+end.
@@ -0,0 +1,46 @@
+program Matrizes;
+{ Teste dos arrays multidimensionais. m[i, j] e m[i][j] são o mesmo acesso;
+  os elementos ficam por linhas e o índice é calculado como i*5 + j, com
+  o limite inferior combinado subtraído em compilação. Uma linha pode ser
+  passada a um parâmetro 'var' como um array simples. }
+const
+    L = 3;
+    C = 5;
+var
+    m: array[1..L, 1..C] of integer;
+    cubo: array[0..1] of array[0..1, 0..1] of integer;
+    i, j, k, total: integer;
+
+procedure preenche_linha(var linha: array[1..C] of integer; valor: integer);
+var
+    j: integer;
+begin
+    for j := 1 to C do
+        linha[j] := valor * j
+end;
+
+function soma(var mat: array[1..L, 1..C] of integer): integer;
+var
+    i, j: integer;
+begin
+    soma := 0;
+    for i := 1 to L do
+        for j := 1 to C do
+            soma := soma + mat[i, j]
+end;
+
+begin
+    for i := 1 to L do
+        preenche_linha(m[i], i);
+    m[2][3] := 0;
+    writeln('Soma: ', soma(m), ' canto: ', m[L, C]);
+    total := 0;
+    for i := 0 to 1 do
+        for j := 0 to 1 do
+            for k := 0 to 1 do
+            begin
+                cubo[i, j, k] := i * 4 + j * 2 + k;
+                total := total + cubo[i][j][k] * k
+            end;
+    writeln('Cubo: ', total, ' ', cubo[1, 1, 0])
+end.
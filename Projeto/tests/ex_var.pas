@@ -0,0 +1,55 @@
+program Referencias;
+{ Teste dos parâmetros 'var'. O chamador passa o endereço da variável (ou
+  do elemento) e o subprograma lê e escreve através dele; um array inteiro
+  passa apenas o endereço base, sem cópia. }
+var
+    a, b, total: integer;
+    valores: array[1..5] of integer;
+
+procedure troca(var x, y: integer);
+var
+    t: integer;
+begin
+    t := x;
+    x := y;
+    y := t
+end;
+
+procedure preenche(var v: array[1..5] of integer; passo: integer);
+var
+    i: integer;
+begin
+    for i := 1 to 5 do
+        v[i] := i * passo
+end;
+
+function soma(var v: array[1..5] of integer): integer;
+var
+    i: integer;
+begin
+    soma := 0;
+    for i := 1 to 5 do
+        soma := soma + v[i]
+end;
+
+procedure acumula(var v: array[1..5] of integer; n: integer; var acc: integer);
+begin
+    if n > 0 then
+    begin
+        acc := acc + v[n];
+        acumula(v, n - 1, acc)
+    end
+end;
+
+begin
+    a := 1;
+    b := 2;
+    troca(a, b);
+    writeln('Troca: ', a, ' ', b);
+    preenche(valores, 3);
+    troca(valores[1], valores[5]);
+    writeln('Soma: ', soma(valores), ' primeiro: ', valores[1]);
+    total := 0;
+    acumula(valores, 5, total);
+    writeln('Acumulado: ', total)
+end.